@@ -7,12 +7,12 @@ import json
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import uuid4
 
 from core.domain import PredictionOutcome, PredictionStage
 from core.domain.value_objects import ArtifactRef
-from core.interfaces import IArtifactStorage, IFileStorage
+from core.interfaces import IArtifactStorage, IFileStorage, IResultCodec
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,7 @@ class ArtifactPersistence:
     file_storage: IFileStorage
     artifact_storage: IArtifactStorage
     policy: ArtifactPolicy = field(default_factory=ArtifactPolicy)
+    codec: Optional[IResultCodec] = None
 
     @staticmethod
     def _slugify_segment(segment: str) -> str:
@@ -83,6 +84,21 @@ class ArtifactPersistence:
         case_id: Optional[str] = None,
     ) -> PredictionOutcome:
         """Augment outcome with persisted artifact references."""
+        outcome, _ = await self.handle_and_encode(outcome, case_id=case_id)
+        return outcome
+
+    async def handle_and_encode(
+        self,
+        outcome: PredictionOutcome,
+        *,
+        case_id: Optional[str] = None,
+    ) -> Tuple[PredictionOutcome, Optional[bytes]]:
+        """
+        Persist artifacts like ``handle_outcome`` and return the encoded final result as well.
+
+        The result is encoded once, after every step that adds artifact URIs to it; the same
+        payload is written as the result artifact and can be stored by the repository as is.
+        """
         base_dir = Path(self.policy.target_directory)
         if case_id:
             base_dir = base_dir / self._slugify_segment(str(case_id))
@@ -99,9 +115,9 @@ class ArtifactPersistence:
             if source_artifact:
                 artifacts.append(source_artifact)
             outcome.artifacts = tuple(artifacts)  # type: ignore[attr-defined]
-            return outcome
+            return outcome, self._encode_result(outcome.result)
 
-        logger.info(
+        logger.debug(
             "Persisting artifacts for stage=%s prediction_id=%s",
             outcome.stage,
             outcome.prediction_id,
@@ -119,17 +135,18 @@ class ArtifactPersistence:
         if summary_artifact:
             artifacts.append(summary_artifact)
 
-        if self.policy.save_result_json:
-            result_artifact = await self._store_result(outcome, base_dir)
-            if result_artifact:
-                artifacts.append(result_artifact)
-
         source_artifact = await self._store_source_image(outcome, base_dir)
         if source_artifact:
             artifacts.append(source_artifact)
 
+        payload = self._encode_result(outcome.result)
+        if self.policy.save_result_json:
+            result_artifact = await self._store_result(outcome, base_dir, payload)
+            if result_artifact:
+                artifacts.append(result_artifact)
+
         outcome.artifacts = tuple(artifacts)  # type: ignore[attr-defined]
-        return outcome
+        return outcome, payload
 
     async def _store_preview(self, outcome: PredictionOutcome, base_dir: Path) -> Optional[ArtifactRef]:
         if not isinstance(outcome.result, dict):
@@ -150,7 +167,7 @@ class ArtifactPersistence:
             kind=mime,
         )
         await self.artifact_storage.store(artifact=artifact, payload=preview_bytes)
-        logger.info("Stored preview artifact at %s", artifact.uri)
+        logger.debug("Stored preview artifact at %s", artifact.uri)
         outcome.result.pop("preview_bytes", None)
         outcome.result["preview_uri"] = artifact.uri
         return artifact
@@ -174,7 +191,7 @@ class ArtifactPersistence:
             kind=mime,
         )
         await self.artifact_storage.store(artifact=artifact, payload=overlay_bytes)
-        logger.info("Stored detection overlay artifact at %s", artifact.uri)
+        logger.debug("Stored detection overlay artifact at %s", artifact.uri)
         outcome.result.pop("detection_overlay_bytes", None)
         outcome.result.pop("detection_overlay_filename", None)
         outcome.result["detection_overlay_uri"] = artifact.uri
@@ -218,7 +235,7 @@ class ArtifactPersistence:
             return None
 
         await self.artifact_storage.store(artifact=artifact, payload=payload)
-        logger.info("Stored source artifact at %s", artifact.uri)
+        logger.debug("Stored source artifact at %s", artifact.uri)
         outcome.result.setdefault("source_artifact_uri", artifact.uri)
         return artifact
 
@@ -231,7 +248,7 @@ class ArtifactPersistence:
         if not summary:
             return None
         try:
-            payload = json.dumps(summary, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+            payload = json.dumps(summary, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
         except TypeError:
             logger.warning("Evaluation summary contains non-serializable data; skipping accuracy summary artifact.")
             return None
@@ -243,26 +260,29 @@ class ArtifactPersistence:
         artifact = ArtifactRef(uri=str(base_dir / filename), kind="application/json")
         await self.artifact_storage.store(artifact=artifact, payload=payload)
         outcome.result["accuracy_summary_uri"] = artifact.uri
-        logger.info("Stored accuracy summary artifact at %s", artifact.uri)
+        logger.debug("Stored accuracy summary artifact at %s", artifact.uri)
         return artifact
 
-    async def _store_result(self, outcome: PredictionOutcome, base_dir: Path) -> Optional[ArtifactRef]:
-        payload = self._encode_result(outcome.result)
+    async def _store_result(
+        self, outcome: PredictionOutcome, base_dir: Path, payload: Optional[bytes]
+    ) -> Optional[ArtifactRef]:
         if payload is None:
             logger.debug("Skipping result artifact for stage=%s: result is empty.", outcome.stage)
             return None
+        extension = self.codec.file_extension if self.codec is not None else ".json"
         artifact = ArtifactRef(
-            uri=str(base_dir / f"{outcome.stage.value}_result_{uuid4().hex}.json"),
-            kind="application/json",
+            uri=str(base_dir / f"{outcome.stage.value}_result_{uuid4().hex}{extension}"),
+            kind=self.codec.media_type if self.codec is not None else "application/json",
         )
         await self.artifact_storage.store(artifact=artifact, payload=payload)
-        logger.info("Stored result artifact at %s", artifact.uri)
+        logger.debug("Stored result artifact at %s", artifact.uri)
         return artifact
 
-    @staticmethod
-    def _encode_result(result: object) -> Optional[bytes]:
+    def _encode_result(self, result: object) -> Optional[bytes]:
         if result is None:
             return None
+        if self.codec is not None:
+            return self.codec.encode(result)
         try:
             return json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
         except TypeError:
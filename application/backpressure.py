@@ -0,0 +1,143 @@
+"""Bounded buffering with overflow policies between a stream handler and its orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Deque, Dict, Optional
+
+from pydantic import BaseModel, Field, PositiveInt
+
+from core.domain import FrameBatch, OverflowPolicy
+
+
+class BackpressureConfig(BaseModel):
+    """Overflow handling on the handler-to-orchestrator boundary."""
+
+    policy: OverflowPolicy = OverflowPolicy.BLOCK
+    capacity: PositiveInt = Field(default=1, description="Maximum number of batches waiting for the orchestrator.")
+    decimate_every: PositiveInt = Field(
+        default=2,
+        description="With the decimate policy, forward one batch out of every N produced by the handler.",
+    )
+
+
+@dataclass
+class BufferStats:
+    received: int = 0
+    dropped: int = 0
+    decimated: int = 0
+
+
+@dataclass(frozen=True)
+class BufferedBatch:
+    """Batch handed to the orchestrator together with its ingest metrics."""
+
+    batch: FrameBatch
+    metrics: Dict[str, float]
+    enqueued_ns: int = 0
+    dequeued_ns: int = 0
+
+
+@dataclass
+class _Entry:
+    batch: FrameBatch
+    enqueued_ns: int
+
+
+class FrameBuffer:
+    """
+    Reads a stream handler in a background task and buffers its batches.
+
+    ``block`` suspends the handler while the buffer is full, ``drop_oldest`` evicts the
+    oldest waiting batch, ``drop_newest`` discards the incoming one, ``keep_latest`` only
+    ever keeps the most recent batch and ``decimate`` forwards one batch out of every
+    ``decimate_every`` (blocking when full). Every yielded batch carries cumulative drop
+    counters and the time it spent in the buffer.
+    """
+
+    def __init__(self, source: AsyncIterable[FrameBatch], config: BackpressureConfig) -> None:
+        self.source = source
+        self.config = config
+        self.stats = BufferStats()
+        capacity = 1 if config.policy is OverflowPolicy.KEEP_LATEST else config.capacity
+        self._capacity = capacity
+        self._items: Deque[_Entry] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._exhausted = False
+        self._error: Optional[BaseException] = None
+        self._pump_task: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    async def __aenter__(self) -> "FrameBuffer":
+        self._pump_task = asyncio.create_task(self._pump(), name="frame-buffer-pump")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._pump_task is None:
+            return
+        self._pump_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._pump_task
+        self._pump_task = None
+
+    async def __aiter__(self) -> AsyncIterator[BufferedBatch]:
+        while True:
+            while not self._items:
+                if self._exhausted:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+            entry = self._items.popleft()
+            self._not_full.set()
+            dequeued_ns = time.perf_counter_ns()
+            yield BufferedBatch(
+                batch=entry.batch,
+                metrics={
+                    "queue_age_ms": (dequeued_ns - entry.enqueued_ns) / 1_000_000,
+                    "queue_depth": len(self._items),
+                    "batches_dropped": self.stats.dropped,
+                    "batches_decimated": self.stats.decimated,
+                },
+                enqueued_ns=entry.enqueued_ns,
+                dequeued_ns=dequeued_ns,
+            )
+
+    async def _pump(self) -> None:
+        try:
+            async for batch in self.source:
+                self.stats.received += 1
+                if self.config.policy is OverflowPolicy.DECIMATE and (self.stats.received - 1) % self.config.decimate_every:
+                    self.stats.decimated += 1
+                    continue
+                await self._offer(batch)
+        except Exception as exc:  # noqa: BLE001
+            self._error = exc
+        finally:
+            self._exhausted = True
+            self._not_empty.set()
+
+    async def _offer(self, batch: FrameBatch) -> None:
+        policy = self.config.policy
+        while len(self._items) >= self._capacity:
+            if policy in (OverflowPolicy.DROP_OLDEST, OverflowPolicy.KEEP_LATEST):
+                self._items.popleft()
+                self.stats.dropped += 1
+            elif policy is OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                return
+            else:
+                self._not_full.clear()
+                await self._not_full.wait()
+        self._items.append(_Entry(batch=batch, enqueued_ns=time.perf_counter_ns()))
+        self._not_empty.set()
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from core.domain import CaseConfigurationError, CaseId
 from application.cases.catalog import CaseCatalog
 from application.cases.registry import CaseFactory, OrchestratorFactory
+from application.persistence.measurement_config import MeasurementRegistry, register_measurements
 
 CaseBuilderResult = OrchestratorFactory | Awaitable[OrchestratorFactory]
 CaseBuilderFn = Callable[[BaseModel], CaseBuilderResult]
@@ -32,6 +33,7 @@ class CaseBootstrapper:
 
     case_factory: CaseFactory
     catalog: CaseCatalog = field(default_factory=CaseCatalog)
+    measurements: MeasurementRegistry = field(default_factory=MeasurementRegistry)
     _blueprints: Dict[str, CaseBlueprint] = field(default_factory=dict)
 
     def register_blueprint(self, blueprint: CaseBlueprint) -> None:
@@ -77,6 +79,7 @@ class CaseBootstrapper:
             case_id = CaseId(case_id_value)
 
             self.case_factory.register(case_id, factory)
+            register_measurements(self.measurements, case_id, getattr(manifest, "measurements", ()))
             registered.append(case_id)
 
         return tuple(registered)
@@ -7,7 +7,7 @@ from importlib import import_module
 from typing import Mapping, Optional
 
 from core.domain import CaseId, DomainEvent
-from core.interfaces import IEventBus, IRepositoryDB, IFileStorage
+from core.interfaces import IEventBus, IFileStorage, IFrameStore, IRepositoryDB
 from application.cases.bootstrap import CaseBlueprint, CaseBootstrapper
 
 
@@ -20,6 +20,7 @@ class CaseBuildContext:
     device_serials: Mapping[str, str] = field(default_factory=dict)
     metadata: Mapping[str, Mapping[str, object]] = field(default_factory=dict)
     file_storage: IFileStorage | None = None
+    frame_store: IFrameStore | None = None
 
     def device_serial_for(self, slug: str) -> Optional[str]:
         return self.device_serials.get(slug)
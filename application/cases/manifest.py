@@ -0,0 +1,24 @@
+"""Framework-level manifest sections shared by all cases."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from application.backpressure import BackpressureConfig
+from application.persistence.measurement_config import MeasurementTableModel
+from application.pipeline import PipelineConfig
+from application.scheduling import SchedulingConfig
+from application.services.config import StageConfig
+from core.domain import PredictionStage
+
+
+class BaseCaseManifest(BaseModel):
+    """Base manifest model; case manifests extend it with handler and predictor sections."""
+
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
+    backpressure: BackpressureConfig = Field(default_factory=BackpressureConfig)
+    stages: Dict[PredictionStage, StageConfig] = Field(default_factory=dict)
+    scheduling: SchedulingConfig = Field(default_factory=SchedulingConfig)
+    measurements: List[MeasurementTableModel] = Field(default_factory=list)
@@ -11,6 +11,7 @@ from application.cases.registry import CaseFactory
 
 if TYPE_CHECKING:
     from application.orchestrator import CaseOrchestrator
+    from application.scheduling import FairScheduler
 
 
 @dataclass
@@ -20,6 +21,7 @@ class CaseManager:
     case_factory: CaseFactory
     event_bus: IEventBus[DomainEvent]
     active_cases: Dict[CaseId, "CaseOrchestrator"] = field(default_factory=dict)
+    scheduler: Optional["FairScheduler"] = None
 
     async def activate(self, case_id: CaseId) -> None:
         if case_id in self.active_cases:
@@ -30,15 +32,19 @@ class CaseManager:
             raise CaseConfigurationError(f"Case {case_id} is not registered.")
 
         orchestrator = await provider()
+        if self.scheduler is not None:
+            orchestrator.attach_scheduler(self.scheduler)
         await orchestrator.start()
         self.active_cases[case_id] = orchestrator
-        await self.event_bus.publish(CaseActivated(case_id=case_id))
+        await self.event_bus.publish(CaseActivated(case_id=case_id, stages=tuple(orchestrator.predictor.predictors)))
 
     async def deactivate(self, case_id: CaseId) -> None:
         orchestrator = self.active_cases.pop(case_id, None)
         if orchestrator is None:
             return
         await orchestrator.stop()
+        if self.scheduler is not None:
+            self.scheduler.unregister(case_id)
 
     async def deactivate_all(self) -> None:
         """Deactivate all currently active cases."""
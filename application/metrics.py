@@ -0,0 +1,156 @@
+"""Low-overhead in-process metrics: counters, gauges and fixed-bucket histograms."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DEFAULT_SIZE_BUCKETS: Tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _series_name(name: str, labels: LabelKey) -> str:
+    if not labels:
+        return name
+    rendered = ",".join(f"{key}={value}" for key, value in labels)
+    return f"{name}{{{rendered}}}"
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Histogram:
+    """Histogram with fixed upper bounds; the last bucket collects everything above them."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (``max`` for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+            "buckets": dict(zip((*map(str, self.bounds), "+inf"), self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """
+    Get-or-create registry of metric series keyed by name and labels.
+
+    Lookups allocate a label key, so hot paths should keep the returned metric objects
+    and only call ``inc``/``set``/``observe`` on them.
+    """
+
+    def __init__(self) -> None:
+        self._counters: Dict[Tuple[str, LabelKey], Counter] = {}
+        self._gauges: Dict[Tuple[str, LabelKey], Gauge] = {}
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Mapping[str, object]) -> Tuple[str, LabelKey]:
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def counter(self, name: str, **labels: object) -> Counter:
+        key = self._key(name, labels)
+        metric = self._counters.get(key)
+        if metric is None:
+            metric = self._counters[key] = Counter()
+        return metric
+
+    def gauge(self, name: str, **labels: object) -> Gauge:
+        key = self._key(name, labels)
+        metric = self._gauges.get(key)
+        if metric is None:
+            metric = self._gauges[key] = Gauge()
+        return metric
+
+    def histogram(self, name: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS, **labels: object) -> Histogram:
+        key = self._key(name, labels)
+        metric = self._histograms.get(key)
+        if metric is None:
+            metric = self._histograms[key] = Histogram(buckets)
+        return metric
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "counters": {_series_name(name, labels): metric.value for (name, labels), metric in self._counters.items()},
+            "gauges": {_series_name(name, labels): metric.value for (name, labels), metric in self._gauges.items()},
+            "histograms": {
+                _series_name(name, labels): metric.summary() for (name, labels), metric in self._histograms.items()
+            },
+        }
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._gauges.clear()
+        self._histograms.clear()
+
+
+def format_summary(snapshot: Mapping[str, Mapping[str, Any]]) -> str:
+    """Render a snapshot as a compact multi-line summary for periodic logging."""
+    lines = [f"{name}={value}" for name, value in sorted(snapshot.get("counters", {}).items())]
+    lines.extend(f"{name}={value:.3f}" for name, value in sorted(snapshot.get("gauges", {}).items()))
+    for name, summary in sorted(snapshot.get("histograms", {}).items()):
+        lines.append(
+            f"{name} count={summary['count']} mean={summary['mean']:.2f} "
+            f"p50<={summary['p50']} p95<={summary['p95']} p99<={summary['p99']} max={summary['max']:.2f}"
+        )
+    return "\n".join(lines)
+
+
+metrics = MetricsRegistry()
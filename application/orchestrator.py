@@ -5,8 +5,9 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
+import time
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 from core.domain import (
     CaseId,
@@ -14,14 +15,26 @@ from core.domain import (
     FrameBatchReceived,
     PredictionCompleted,
     PredictionFailed,
+    PredictionInput,
+    PredictionOutcome,
+    PredictionStage,
     DomainEvent,
     SessionFailed,
+    SessionPredicted,
     SessionId,
 )
+from application.backpressure import BackpressureConfig, BufferedBatch, FrameBuffer
+from application.metrics import Counter, metrics
+from application.pipeline import PipelineConfig, PipelineMode, StageWorkers
+from application.scheduling import SchedulingConfig
+from application.tracing import tracer
 from application.services.collector import CollectorService
 from application.services.predictor import PredictorService
 from core.interfaces import BaseStreamHandler, IEventBus
 
+if TYPE_CHECKING:
+    from application.scheduling import FairScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,15 +47,32 @@ class CaseOrchestrator:
     predictor: PredictorService
     event_bus: IEventBus[DomainEvent]
     stream_handler: BaseStreamHandler
+    pipeline: PipelineConfig = field(default_factory=PipelineConfig)
+    backpressure: BackpressureConfig = field(default_factory=BackpressureConfig)
+    scheduling: SchedulingConfig = field(default_factory=SchedulingConfig)
     running: bool = False
     _task: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _outcome_counters: Dict[Tuple[PredictionStage, bool], Counter] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._batches = metrics.counter("orchestrator_batches_total", case=self.case_id)
+        self._frames = metrics.counter("orchestrator_frames_total", case=self.case_id)
+        self._queue_age = metrics.histogram("orchestrator_queue_age_ms", case=self.case_id)
+
+    def attach_scheduler(self, scheduler: "FairScheduler") -> None:
+        """Route this case's predictions through the shared runtime scheduler."""
+        scheduler.register(self.case_id, self.scheduling)
+        self.predictor.scheduler = scheduler
 
     async def start(self) -> None:
         if self.running:
             return
         await self.stream_handler.start()
         self.running = True
-        self._task = asyncio.create_task(self._run_loop())
+        if self.pipeline.mode is PipelineMode.PIPELINED:
+            self._task = asyncio.create_task(self._run_pipeline())
+        else:
+            self._task = asyncio.create_task(self._run_loop())
         logger.info("Orchestrator %s started stream handler %s", self.case_id, type(self.stream_handler).__name__)
 
     async def stop(self) -> None:
@@ -55,69 +85,167 @@ class CaseOrchestrator:
                 await self._task
         logger.info("Orchestrator %s stopping stream handler", self.case_id)
         await self.stream_handler.stop()
+        await self.predictor.close()
 
     async def _run_loop(self) -> None:
         try:
-            async for batch in self.stream_handler:
-                logger.info(
-                    "Orchestrator %s received batch session=%s frames=%d",
-                    self.case_id,
-                    batch.session_id,
-                    len(batch.frames),
-                )
-                await self.event_bus.publish(FrameBatchReceived(case_id=self.case_id, batch=batch))
-                prediction_inputs = await self.collector.handle_batch(self.case_id, batch)
-                logger.info(
-                    "Orchestrator %s prepared %d prediction inputs for session=%s",
-                    self.case_id,
-                    len(prediction_inputs),
-                    batch.session_id,
-                )
-                for prediction_input in prediction_inputs:
-                    logger.info(
-                        "Orchestrator %s running stage=%s for session=%s",
-                        self.case_id,
-                        prediction_input.stage,
-                        prediction_input.data.session_id,
-                    )
-                    outcome = await self.predictor.run(prediction_input)
-                    logger.info(
-                        "Orchestrator %s stage=%s success=%s duration=%.2fms session=%s",
-                        self.case_id,
-                        outcome.stage,
-                        outcome.success,
-                        outcome.duration_ms or -1.0,
-                        prediction_input.data.session_id,
-                    )
-                    if outcome.success:
-                        await self.event_bus.publish(
-                            PredictionCompleted(case_id=self.case_id, session_id=prediction_input.data.session_id, outcome=outcome)
-                        )
-                        logger.debug(
-                            "Orchestrator %s published PredictionCompleted for stage=%s session=%s",
-                            self.case_id,
-                            outcome.stage,
-                            prediction_input.data.session_id,
-                        )
-                    else:
-                        await self.event_bus.publish(
-                            PredictionFailed(
-                                case_id=self.case_id,
-                                session_id=prediction_input.data.session_id,
-                                stage=prediction_input.stage,
-                                errors=outcome.errors or ("unknown error",),
-                            )
-                        )
-                        logger.warning(
-                            "Orchestrator %s published PredictionFailed for stage=%s session=%s errors=%s",
-                            self.case_id,
-                            prediction_input.stage,
-                            prediction_input.data.session_id,
-                            outcome.errors,
+            async with FrameBuffer(self.stream_handler, self.backpressure) as buffer:
+                async for buffered in buffer:
+                    try:
+                        await self._process_batch(buffered)
+                    except Exception as exc:  # noqa: BLE001
+                        logger.exception(
+                            "Orchestrator %s aborted session=%s: %s", self.case_id, buffered.batch.session_id, exc
                         )
+                        await self._publish_session_failure(buffered.batch.session_id, exc)
         except Exception as exc:  # noqa: BLE001
             logger.exception("Orchestrator %s encountered error: %s", self.case_id, exc)
-            await self.event_bus.publish(
-                SessionFailed(case_id=self.case_id, session_id=SessionId("unknown"), reason=str(exc))
+            await self._publish_session_failure(SessionId("unknown"), exc)
+            raise
+
+    async def _process_batch(self, buffered: BufferedBatch) -> None:
+        batch = buffered.batch
+        self._record_batch(buffered)
+        await self.event_bus.publish(FrameBatchReceived(case_id=self.case_id, batch=batch))
+        prediction_inputs = await self._collect(batch)
+        stages: List[PredictionStage] = []
+        async for prediction_input, outcome in self.predictor.run_graph(prediction_inputs):
+            outcome.metrics.update(buffered.metrics)
+            stages.append(outcome.stage)
+            await self._publish_outcome(prediction_input, outcome)
+        await self._publish_session_predicted(batch.session_id, stages)
+
+    def _record_batch(self, buffered: BufferedBatch) -> None:
+        batch = buffered.batch
+        self._batches.inc()
+        self._frames.inc(len(batch.frames))
+        queue_age_ms = buffered.metrics.get("queue_age_ms")
+        if queue_age_ms is not None:
+            self._queue_age.observe(queue_age_ms)
+        if tracer.enabled:
+            tracer.begin_session(self.case_id, batch.session_id, batch.created_ns)
+            if buffered.enqueued_ns:
+                tracer.record("ingest", self.case_id, batch.session_id, batch.created_ns, buffered.enqueued_ns)
+                tracer.record("buffer", self.case_id, batch.session_id, buffered.enqueued_ns, buffered.dequeued_ns)
+
+    async def _collect(self, batch: FrameBatch) -> Sequence[PredictionInput]:
+        start_ns = time.perf_counter_ns()
+        prediction_inputs = await self.collector.handle_batch(self.case_id, batch)
+        tracer.record("collect", self.case_id, batch.session_id, start_ns, inputs=len(prediction_inputs))
+        return prediction_inputs
+
+    def _outcome_counter(self, stage: PredictionStage, success: bool) -> Counter:
+        counter = self._outcome_counters.get((stage, success))
+        if counter is None:
+            counter = metrics.counter(
+                "orchestrator_outcomes_total",
+                case=self.case_id,
+                stage=stage.value,
+                status="success" if success else "failure",
             )
+            self._outcome_counters[(stage, success)] = counter
+        return counter
+
+    async def _run_pipeline(self) -> None:
+        """Run ingest, collect, predict and publish as separate workers joined by bounded queues."""
+        config = self.pipeline
+        ordered = config.preserve_session_order
+
+        async def publish_item(item: Tuple[PredictionInput, PredictionOutcome]) -> None:
+            await self._publish_outcome(*item)
+
+        async def predict_item(item: Tuple[BufferedBatch, Sequence[PredictionInput]]) -> None:
+            buffered, prediction_inputs = item
+            stages: List[PredictionStage] = []
+            async for prediction_input, outcome in self.predictor.run_graph(prediction_inputs):
+                outcome.metrics.update(buffered.metrics)
+                stages.append(outcome.stage)
+                await publish.submit(buffered.batch.session_id, (prediction_input, outcome))
+            await self._publish_session_predicted(buffered.batch.session_id, stages)
+
+        async def collect_item(buffered: BufferedBatch) -> None:
+            prediction_inputs = await self._collect(buffered.batch)
+            await predict.submit(buffered.batch.session_id, (buffered, prediction_inputs))
+
+        async def collect_failed(buffered: BufferedBatch, exc: BaseException) -> None:
+            await self._publish_session_failure(buffered.batch.session_id, exc)
+
+        async def predict_failed(item: Tuple[BufferedBatch, Sequence[PredictionInput]], exc: BaseException) -> None:
+            await self._publish_session_failure(item[0].batch.session_id, exc)
+
+        async def publish_failed(item: Tuple[PredictionInput, PredictionOutcome], exc: BaseException) -> None:
+            await self._publish_session_failure(item[0].data.session_id, exc)
+
+        publish: StageWorkers[Tuple[PredictionInput, PredictionOutcome]] = StageWorkers(
+            f"{self.case_id}-publish", publish_item, config.publish, ordered=ordered, on_error=publish_failed
+        )
+        predict: StageWorkers[Tuple[BufferedBatch, Sequence[PredictionInput]]] = StageWorkers(
+            f"{self.case_id}-predict", predict_item, config.predict, ordered=ordered, on_error=predict_failed
+        )
+        collect: StageWorkers[BufferedBatch] = StageWorkers(
+            f"{self.case_id}-collect", collect_item, config.collect, ordered=ordered, on_error=collect_failed
+        )
+        stages = (collect, predict, publish)
+        for stage in stages:
+            stage.start()
+        try:
+            async with FrameBuffer(self.stream_handler, self.backpressure) as buffer:
+                async for buffered in buffer:
+                    self._record_batch(buffered)
+                    await self.event_bus.publish(FrameBatchReceived(case_id=self.case_id, batch=buffered.batch))
+                    await collect.submit(buffered.batch.session_id, buffered)
+            for stage in stages:
+                await stage.join()
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Orchestrator %s encountered error: %s", self.case_id, exc)
+            await self._publish_session_failure(SessionId("unknown"), exc)
             raise
+        finally:
+            for stage in stages:
+                await stage.stop()
+
+    async def _publish_outcome(self, prediction_input: PredictionInput, outcome: PredictionOutcome) -> None:
+        self._outcome_counter(outcome.stage, outcome.success).inc()
+        start_ns = time.perf_counter_ns()
+        try:
+            await self._publish_event(prediction_input, outcome)
+        finally:
+            tracer.record(
+                "publish", self.case_id, prediction_input.data.session_id, start_ns, stage=outcome.stage.value
+            )
+
+    async def _publish_event(self, prediction_input: PredictionInput, outcome: PredictionOutcome) -> None:
+        if outcome.success:
+            await self.event_bus.publish(
+                PredictionCompleted(case_id=self.case_id, session_id=prediction_input.data.session_id, outcome=outcome)
+            )
+            logger.debug(
+                "Orchestrator %s published PredictionCompleted for stage=%s session=%s",
+                self.case_id,
+                outcome.stage,
+                prediction_input.data.session_id,
+            )
+        else:
+            await self.event_bus.publish(
+                PredictionFailed(
+                    case_id=self.case_id,
+                    session_id=prediction_input.data.session_id,
+                    stage=prediction_input.stage,
+                    errors=outcome.errors or ("unknown error",),
+                )
+            )
+            logger.warning(
+                "Orchestrator %s published PredictionFailed for stage=%s session=%s errors=%s",
+                self.case_id,
+                prediction_input.stage,
+                prediction_input.data.session_id,
+                outcome.errors,
+            )
+
+    async def _publish_session_predicted(self, session_id: SessionId, stages: Sequence[PredictionStage]) -> None:
+        await self.event_bus.publish(
+            SessionPredicted(case_id=self.case_id, session_id=session_id, stages=tuple(stages))
+        )
+
+    async def _publish_session_failure(self, session_id: SessionId, exc: BaseException) -> None:
+        await self.event_bus.publish(SessionFailed(case_id=self.case_id, session_id=session_id, reason=str(exc)))
@@ -0,0 +1,25 @@
+"""Outcome persistence: the bulk writer, session aggregation and case-declared measurement tables."""
+
+from application.persistence.measurement_config import (
+    MeasurementColumn,
+    MeasurementColumnModel,
+    MeasurementRegistry,
+    MeasurementTable,
+    MeasurementTableModel,
+    build_measurement_table,
+    register_measurements,
+)
+from application.persistence.sessions import SessionAggregator
+from application.persistence.writer import BulkOutcomeWriter
+
+__all__ = [
+    "BulkOutcomeWriter",
+    "MeasurementColumn",
+    "MeasurementColumnModel",
+    "MeasurementRegistry",
+    "MeasurementTable",
+    "MeasurementTableModel",
+    "SessionAggregator",
+    "build_measurement_table",
+    "register_measurements",
+]
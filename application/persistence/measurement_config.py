@@ -2,16 +2,34 @@
 
 from __future__ import annotations
 
+import math
 import re
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
-from core.domain import CaseId
+from core.domain import CaseConfigurationError, CaseId, PredictionStage
+from core.interfaces import MeasurementRows, MeasurementSchema, OutcomeItem
 
 _IDENTIFIER_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
+# Columns every measurement table carries in front of the declared ones.
+RESERVED_COLUMNS = ("id", "prediction_id", "case_id", "session_id", "created_at")
+_RESERVED_TABLES = ("measurement_tables", "session_records")
+
+_COLUMN_TYPES = {
+    "integer": "integer",
+    "int": "integer",
+    "real": "real",
+    "float": "real",
+    "text": "text",
+    "str": "text",
+    "boolean": "boolean",
+    "bool": "boolean",
+}
+_SQL_TYPES = {"integer": "INTEGER", "real": "REAL", "text": "TEXT", "boolean": "INTEGER"}
+
 
 class MeasurementColumnModel(BaseModel):
     """Pydantic model describing a measurement table column."""
@@ -19,19 +37,42 @@ class MeasurementColumnModel(BaseModel):
     name: str
     type: str
     nullable: bool = True
+    source: Optional[str] = Field(
+        default=None,
+        description="Dotted path into the outcome result (or the 'each' entry); defaults to the column name.",
+    )
+    index: bool = False
 
     @field_validator("name")
     @classmethod
     def _validate_name(cls, value: str) -> str:
         if not _IDENTIFIER_RE.match(value):
             raise ValueError(f"Invalid column name '{value}'. Only letters, numbers and underscores are allowed.")
+        if value in RESERVED_COLUMNS:
+            raise ValueError(f"Column name '{value}' is reserved for built-in measurement columns.")
         return value
 
+    @field_validator("type")
+    @classmethod
+    def _validate_type(cls, value: str) -> str:
+        normalized = _COLUMN_TYPES.get(value.lower())
+        if normalized is None:
+            raise ValueError(f"Unsupported column type '{value}'. Expected integer, real, text or boolean.")
+        return normalized
+
 
 class MeasurementTableModel(BaseModel):
     """Pydantic model describing a measurement table."""
 
     table_name: str = Field(..., alias="name")
+    stage: PredictionStage
+    each: Optional[str] = Field(
+        default=None,
+        description="Dotted path to a mapping or list in the result; one row is written per entry.",
+    )
+    key: Optional[str] = Field(
+        default=None, description="Text column receiving the mapping key (or list index) of each 'each' entry."
+    )
     columns: Tuple[MeasurementColumnModel, ...]
 
     @field_validator("table_name")
@@ -39,39 +80,187 @@ class MeasurementTableModel(BaseModel):
     def _validate_table_name(cls, value: str) -> str:
         if not _IDENTIFIER_RE.match(value):
             raise ValueError(f"Invalid table name '{value}'. Only letters, numbers and underscores are allowed.")
+        lowered = value.lower()
+        if lowered in _RESERVED_TABLES or lowered.startswith(("sqlite_", "prediction_outcomes")):
+            raise ValueError(f"Table name '{value}' is reserved.")
         return value
 
+    @model_validator(mode="after")
+    def _validate_columns(self) -> "MeasurementTableModel":
+        if not self.columns:
+            raise ValueError(f"Measurement table '{self.table_name}' declares no columns.")
+        names = [column.name for column in self.columns]
+        if self.key is not None:
+            if self.each is None:
+                raise ValueError("'key' requires 'each'.")
+            if not _IDENTIFIER_RE.match(self.key) or self.key in RESERVED_COLUMNS:
+                raise ValueError(f"Invalid key column name '{self.key}'.")
+            names.append(self.key)
+        if len(set(names)) != len(names):
+            raise ValueError(f"Measurement table '{self.table_name}' declares a column twice.")
+        return self
+
 
 @dataclass(frozen=True)
 class MeasurementColumn:
     name: str
     type: str
     nullable: bool = True
+    source: Tuple[str, ...] = ()
+    index: bool = False
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Convert an extracted value to the column type, or ``None`` when it does not fit.
+
+        NaN and infinities count as missing: SQLite would store NaN as NULL anyway.
+        """
+        if value is None:
+            return None
+        try:
+            if self.type == "text":
+                return value if isinstance(value, str) else str(value)
+            if isinstance(value, (str, Mapping, list, tuple)):
+                return None
+            if self.type == "boolean":
+                return int(bool(value))
+            if self.type == "integer":
+                return int(value)
+            number = float(value)
+            return number if math.isfinite(number) else None
+        except (TypeError, ValueError, OverflowError):
+            return None
 
 
 @dataclass(frozen=True)
 class MeasurementTable:
     table_name: str
     columns: Tuple[MeasurementColumn, ...]
+    stage: PredictionStage = PredictionStage.ANALYTICS
+    each: Tuple[str, ...] = ()
+    key: Optional[str] = None
+
+    @property
+    def schema(self) -> MeasurementSchema:
+        columns = [
+            (column.name, _SQL_TYPES[column.type] + ("" if column.nullable else " NOT NULL"))
+            for column in self.columns
+        ]
+        if self.key is not None:
+            columns.insert(0, (self.key, "TEXT NOT NULL"))
+        indexed = tuple(column.name for column in self.columns if column.index)
+        return MeasurementSchema(table=self.table_name, columns=tuple(columns), indexed=indexed)
+
+    def rows(self, result: Any) -> List[Tuple[Any, ...]]:
+        """
+        Column values (key column first, if any) extracted from an outcome result.
+
+        Entries whose non-nullable columns cannot be filled are skipped rather than failing
+        the whole batch.
+        """
+        if not self.each:
+            entries: Iterable[Tuple[Any, Any]] = [(None, result)]
+        else:
+            nested = _lookup(result, self.each)
+            if isinstance(nested, Mapping):
+                entries = nested.items()
+            elif isinstance(nested, (list, tuple)):
+                entries = enumerate(nested)
+            else:
+                return []
+        rows = []
+        for entry_key, entry in entries:
+            values = tuple(column.coerce(_lookup(entry, column.source)) for column in self.columns)
+            if any(value is None and not column.nullable for column, value in zip(self.columns, values)):
+                continue
+            rows.append((str(entry_key), *values) if self.key is not None else values)
+        return rows
+
+
+def _lookup(value: Any, path: Sequence[str]) -> Any:
+    for part in path:
+        if isinstance(value, Mapping):
+            value = value.get(part)
+        elif isinstance(value, (list, tuple)) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def _path(value: Optional[str]) -> Tuple[str, ...]:
+    return tuple(value.split(".")) if value else ()
 
 
 def build_measurement_table(model: MeasurementTableModel) -> MeasurementTable:
     """Convert pydantic model to runtime configuration."""
-    columns = tuple(MeasurementColumn(name=col.name, type=col.type, nullable=col.nullable) for col in model.columns)
-    return MeasurementTable(table_name=model.table_name, columns=columns)
+    columns = tuple(
+        MeasurementColumn(
+            name=col.name,
+            type=col.type,
+            nullable=col.nullable,
+            source=_path(col.source or col.name),
+            index=col.index,
+        )
+        for col in model.columns
+    )
+    return MeasurementTable(
+        table_name=model.table_name, columns=columns, stage=model.stage, each=_path(model.each), key=model.key
+    )
 
 
 @dataclass
 class MeasurementRegistry:
     """Runtime registry that keeps measurement table definitions per case."""
 
-    _tables: Dict[CaseId, MeasurementTable] = field(default_factory=dict)
+    _tables: Dict[CaseId, Tuple[MeasurementTable, ...]] = field(default_factory=dict)
 
     def register(self, case_id: CaseId, table: MeasurementTable) -> None:
-        self._tables[case_id] = table
+        """Add ``table`` to the case, replacing a table of the same name."""
+        others = tuple(item for item in self._tables.get(case_id, ()) if item.table_name != table.table_name)
+        self._tables[case_id] = (*others, table)
 
-    def get(self, case_id: CaseId) -> Optional[MeasurementTable]:
-        return self._tables.get(case_id)
+    def get(self, case_id: CaseId) -> Tuple[MeasurementTable, ...]:
+        return self._tables.get(case_id, ())
 
     def registered_cases(self) -> Iterable[CaseId]:
         return tuple(self._tables.keys())
+
+    def __bool__(self) -> bool:
+        return bool(self._tables)
+
+    def schemas(self) -> Tuple[MeasurementSchema, ...]:
+        """Schemas of every registered table; cases may share a table if they declare it alike."""
+        schemas: Dict[str, Tuple[MeasurementSchema, CaseId]] = {}
+        for case_id, tables in self._tables.items():
+            for table in tables:
+                schema, declared_by = schemas.setdefault(table.table_name, (table.schema, case_id))
+                if schema != table.schema:
+                    raise CaseConfigurationError(
+                        f"Measurement table '{table.table_name}' is declared differently by cases"
+                        f" '{declared_by}' and '{case_id}'."
+                    )
+        return tuple(schema for schema, _ in schemas.values())
+
+    def extract(self, items: Sequence[OutcomeItem]) -> List[MeasurementRows]:
+        """Measurement rows of successful ``items`` grouped per table, tagged with the item index."""
+        grouped: Dict[Tuple[CaseId, str], Tuple[MeasurementSchema, List[Tuple[int, Tuple[Any, ...]]]]] = {}
+        for index, (_, outcome, *case_id) in enumerate(items):
+            if not case_id or case_id[0] is None or not outcome.success:
+                continue
+            for table in self._tables.get(case_id[0], ()):
+                if table.stage is not outcome.stage:
+                    continue
+                rows = table.rows(outcome.result)
+                if rows:
+                    batch = grouped.setdefault((case_id[0], table.table_name), (table.schema, []))
+                    batch[1].extend((index, row) for row in rows)
+        return [MeasurementRows(schema=schema, rows=rows) for schema, rows in grouped.values()]
+
+
+def register_measurements(
+    registry: MeasurementRegistry, case_id: CaseId, models: Iterable[MeasurementTableModel]
+) -> None:
+    """Register every table declared by a case manifest."""
+    for model in models:
+        registry.register(case_id, build_measurement_table(model))
@@ -0,0 +1,254 @@
+"""Session aggregation: the outcomes of a session are written together with one combined record."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.domain import CaseId, DomainEvent, PredictionStage, SessionCompleted, SessionId
+from core.domain.value_objects import PredictionId
+from core.interfaces import IEventBus, OutcomeItem, SessionRecord
+from application.metrics import metrics
+from application.persistence.writer import BulkOutcomeWriter, OutcomeItems
+
+logger = logging.getLogger(__name__)
+
+# Sessions remembered after their record is written, so that late outcomes are stored on their own.
+_CLOSED_SESSIONS = 4096
+
+# Session ids are only unique within a case.
+_SessionKey = Tuple[Optional[CaseId], SessionId]
+
+
+@dataclass
+class _OpenSession:
+    opened: float
+    items: List[OutcomeItem] = field(default_factory=list)
+    failed: List[PredictionStage] = field(default_factory=list)
+    # ``(item count, future)`` per ``submit`` call, in submission order.
+    waiters: List[Tuple[int, "asyncio.Future[List[PredictionId]]"]] = field(default_factory=list)
+    # Outcomes per stage the pipeline produced for the session, once ``predicted`` reported them.
+    predicted: "Optional[Counter[PredictionStage]]" = None
+
+    def reported(self) -> "Counter[PredictionStage]":
+        return Counter(item[1].stage for item in self.items) + Counter(self.failed)
+
+
+class SessionAggregator:
+    """
+    Holds the outcomes of each session until every stage of its case has reported.
+
+    Takes the place of ``BulkOutcomeWriter`` with the same ``submit`` contract. A session is
+    written once every outcome reported for it through ``predicted`` has arrived, as stored
+    outcomes or ``fail`` reports; until then, once each stage announced for its case through
+    ``expect`` has reported. A session is also written when ``abort`` reports that its
+    pipeline failed, or ``timeout`` seconds after it was first seen. Its outcomes and a
+    ``SessionRecord`` are submitted to the writer together, so they share one transaction,
+    and ``SessionCompleted`` is published once they are committed. Outcomes of a session
+    that arrive after its record was written are stored on their own.
+    """
+
+    def __init__(
+        self,
+        writer: BulkOutcomeWriter,
+        event_bus: Optional[IEventBus[DomainEvent]] = None,
+        *,
+        timeout: float = 5.0,
+    ) -> None:
+        if timeout <= 0:
+            raise ValueError("timeout must be positive.")
+        self.writer = writer
+        self.event_bus = event_bus
+        self.timeout = timeout
+        self._stages: Dict[CaseId, Tuple[PredictionStage, ...]] = {}
+        self._open: Dict[_SessionKey, _OpenSession] = {}
+        self._closed: "OrderedDict[_SessionKey, None]" = OrderedDict()
+        self._announcements: Set[asyncio.Task] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._completed = metrics.counter("sessions_completed_total")
+        self._timed_out = metrics.counter("sessions_timed_out_total")
+
+    @property
+    def open_sessions(self) -> int:
+        return len(self._open)
+
+    async def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep(), name="session_aggregator")
+
+    async def stop(self) -> None:
+        """Write every open session as timed out and wait for their ``SessionCompleted`` events."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+        for key in list(self._open):
+            await self._close(key, timed_out=True)
+        if self._announcements:
+            await asyncio.gather(*self._announcements, return_exceptions=True)
+
+    async def expect(self, case_id: CaseId, stages: Iterable[PredictionStage]) -> None:
+        """Declare the stages every session of ``case_id`` reports."""
+        self._stages[case_id] = tuple(stages)
+        for key in [key for key in self._open if key[0] == case_id]:
+            await self._close_if_complete(key)
+
+    async def submit(self, items: OutcomeItems) -> "asyncio.Future[List[PredictionId]]":
+        """
+        Hold ``items``, which belong to one session, and return a future of their ids.
+
+        The future resolves once the session has been committed.
+        """
+        if not items:
+            return await self.writer.submit(items)
+        key = _key(items[0])
+        if any(_key(item) != key for item in items):
+            raise ValueError("Items submitted together must belong to one session.")
+        if key in self._closed:
+            return await self.writer.submit(items)
+        session = self._session(key)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        session.waiters.append((len(items), future))
+        session.items.extend(items)
+        await self._close_if_complete(key)
+        return future
+
+    async def fail(self, case_id: CaseId, session_id: SessionId, stage: PredictionStage) -> None:
+        """Count a failed stage as reported; failed stages store no outcome."""
+        key = (case_id, session_id)
+        if key in self._closed:
+            return
+        self._session(key).failed.append(stage)
+        await self._close_if_complete(key)
+
+    async def predicted(self, case_id: CaseId, session_id: SessionId, stages: Iterable[PredictionStage]) -> None:
+        """Declare the stage of every outcome produced for a session, skipped stages included."""
+        key = (case_id, session_id)
+        if key in self._closed:
+            return
+        session = self._session(key)
+        session.predicted = (session.predicted or Counter()) + Counter(stages)
+        await self._close_if_complete(key)
+
+    async def abort(self, case_id: CaseId, session_id: SessionId) -> None:
+        """Write a session whose pipeline failed with the outcomes it has; later ones are stored on their own."""
+        key = (case_id, session_id)
+        if key in self._open:
+            await self._close(key, timed_out=False)
+        elif key not in self._closed:
+            self._remember_closed(key)
+
+    def _session(self, key: _SessionKey) -> _OpenSession:
+        session = self._open.get(key)
+        if session is None:
+            session = self._open[key] = _OpenSession(opened=asyncio.get_running_loop().time())
+        return session
+
+    def _expected(self, key: _SessionKey, session: _OpenSession) -> "Counter[PredictionStage]":
+        if session.predicted is not None:
+            return session.predicted
+        return Counter(self._stages.get(key[0], ()))
+
+    async def _close_if_complete(self, key: _SessionKey) -> None:
+        session = self._open.get(key)
+        if session is None:
+            return
+        expected = self._expected(key, session)
+        if not expected and session.predicted is None:
+            return  # Nothing is known yet about what the session reports.
+        reported = session.reported()
+        if all(reported[stage] >= count for stage, count in expected.items()):
+            await self._close(key, timed_out=False)
+
+    def _remember_closed(self, key: _SessionKey) -> None:
+        self._closed[key] = None
+        if len(self._closed) > _CLOSED_SESSIONS:
+            self._closed.popitem(last=False)
+
+    async def _close(self, key: _SessionKey, *, timed_out: bool) -> None:
+        session = self._open.pop(key)
+        self._remember_closed(key)
+        (self._timed_out if timed_out else self._completed).inc()
+        case_id, session_id = key
+        completed = tuple(item[1].stage for item in session.items)
+        reported = session.reported()
+        record = SessionRecord(
+            case_id=case_id,
+            session_id=session_id,
+            completed=completed,
+            failed=tuple(dict.fromkeys(session.failed)),
+            missing=tuple(
+                stage for stage, count in self._expected(key, session).items() if reported[stage] < count
+            ),
+            items=tuple(range(len(session.items))),
+            timed_out=timed_out,
+        )
+        try:
+            written = await self.writer.submit(session.items, session=record)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Failed to submit session %s: %s", session_id, exc)
+            for _, waiter in session.waiters:
+                waiter.set_exception(exc)
+                # Already logged above; do not warn again if the submitter never awaits it.
+                waiter.exception()
+            return
+        written.add_done_callback(partial(_resolve_waiters, session.waiters))
+        if self.event_bus is not None:
+            task = asyncio.create_task(self._announce(record, written), name=f"session_completed-{session_id}")
+            self._announcements.add(task)
+            task.add_done_callback(self._announcements.discard)
+
+    async def _announce(self, record: SessionRecord, written: "asyncio.Future[List[PredictionId]]") -> None:
+        try:
+            ids = await written
+        except Exception:  # noqa: BLE001
+            return  # The writer has logged the failure.
+        assert self.event_bus is not None
+        await self.event_bus.publish(
+            SessionCompleted(
+                case_id=record.case_id,
+                session_id=record.session_id,
+                completed=record.completed,
+                failed=record.failed,
+                missing=record.missing,
+                prediction_ids=tuple(ids),
+                timed_out=record.timed_out,
+            )
+        )
+
+    async def _sweep(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.timeout / 4)
+            deadline = loop.time() - self.timeout
+            for key in [key for key, session in self._open.items() if session.opened <= deadline]:
+                if key in self._open:
+                    await self._close(key, timed_out=True)
+
+
+def _key(item: OutcomeItem) -> _SessionKey:
+    session_id, _, *keys = item
+    return (keys[0] if keys else None, session_id)
+
+
+def _resolve_waiters(
+    waiters: List[Tuple[int, "asyncio.Future[List[PredictionId]]"]],
+    written: "asyncio.Future[List[PredictionId]]",
+) -> None:
+    position = 0
+    for count, waiter in waiters:
+        if not waiter.done():
+            if written.cancelled():
+                waiter.cancel()
+            elif written.exception() is not None:
+                waiter.set_exception(written.exception())
+                waiter.exception()
+            else:
+                waiter.set_result(written.result()[position : position + count])
+        position += count
@@ -0,0 +1,193 @@
+"""Group-commit writer for prediction outcomes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from core.domain.value_objects import PredictionId
+from core.interfaces import IRepositoryDB, OutcomeItem, SessionRecord
+from application.metrics import DEFAULT_SIZE_BUCKETS, metrics
+from application.persistence.measurement_config import MeasurementRegistry
+
+logger = logging.getLogger(__name__)
+
+OutcomeItems = Sequence[OutcomeItem]
+_Pending = Tuple[OutcomeItems, Optional[SessionRecord], asyncio.Future]
+
+
+class BulkOutcomeWriter:
+    """
+    Background writer that batches outcomes from every session and case into one transaction.
+
+    ``submit`` buffers outcomes and returns a future that resolves to their ids once they are
+    committed. The buffer is flushed through ``IRepositoryDB.save_prediction_outcomes`` as soon
+    as ``max_batch`` outcomes are pending, or ``flush_interval`` seconds after the first one
+    arrived. At most ``max_pending`` outcomes are buffered; further submits wait for a flush.
+    ``stop`` writes whatever is still buffered before returning. When ``measurements`` is
+    given, the rows its tables extract from a batch are committed with that batch. A
+    ``session`` record submitted with its outcomes is committed in the same transaction.
+    A failed commit, such as a transient ``database is locked``, is retried up to
+    ``max_attempts`` times in all, pausing ``backoff_s`` and then twice as long each time,
+    before the batch's futures fail.
+    """
+
+    def __init__(
+        self,
+        repository: IRepositoryDB,
+        *,
+        max_batch: int = 256,
+        flush_interval: float = 0.05,
+        max_pending: int = 4096,
+        measurements: Optional[MeasurementRegistry] = None,
+        max_attempts: int = 3,
+        backoff_s: float = 0.05,
+    ) -> None:
+        if max_batch < 1 or max_pending < max_batch:
+            raise ValueError("max_batch must be at least 1 and no larger than max_pending.")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.repository = repository
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.measurements = measurements
+        self.max_attempts = max_attempts
+        self.backoff_s = backoff_s
+        self._pending: List[_Pending] = []
+        self._pending_count = 0
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._flush_sizes = metrics.histogram("outcome_writer_flush_size", DEFAULT_SIZE_BUCKETS)
+        self._flush_durations = metrics.histogram("outcome_writer_flush_ms")
+        self._failures = metrics.counter("outcome_writer_failures_total")
+        self._retries = metrics.counter("outcome_writer_retries_total")
+
+    @property
+    def pending(self) -> int:
+        return self._pending_count
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="bulk_outcome_writer")
+
+    async def stop(self) -> None:
+        """Stop the background task and flush every buffered outcome."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._full.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+
+    async def submit(
+        self, items: OutcomeItems, *, session: Optional[SessionRecord] = None
+    ) -> "asyncio.Future[List[PredictionId]]":
+        """
+        Buffer ``items`` and return a future of their ids, resolved after the commit.
+
+        ``session.items`` index into ``items``.
+        """
+        if self._task is None or self._closing:
+            raise RuntimeError("Outcome writer is not running.")
+        async with self._space:
+            await self._space.wait_for(
+                lambda: not self._pending_count or self._pending_count + len(items) <= self.max_pending
+            )
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        if not items and session is None:
+            future.set_result([])
+            return future
+        self._pending.append((items, session, future))
+        self._pending_count += len(items)
+        if self._pending_count >= self.max_batch:
+            self._full.set()
+        self._wakeup.set()
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if self._pending_count < self.max_batch and not self._closing:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            await self._flush()
+            if self._closing and not self._pending:
+                return
+
+    async def _flush(self) -> None:
+        pending, self._pending, self._pending_count = self._pending, [], 0
+        self._wakeup.clear()
+        self._full.clear()
+        if not pending:
+            return
+        rows = [item for items, _, _ in pending for item in items]
+        started_ns = time.perf_counter_ns()
+        try:
+            # Inside the try, so that rows failing extraction fail only this batch.
+            options: Dict[str, Any] = {}
+            if self.measurements:
+                options["measurements"] = self.measurements.extract(rows)
+            sessions = _rebase_sessions(pending)
+            if sessions:
+                options["sessions"] = sessions
+            ids = await self._save(rows, options)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Failed to write %d prediction outcomes: %s", len(rows), exc)
+            self._failures.inc(len(rows))
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+                    # Already logged above; do not warn again if the submitter never awaits it.
+                    future.exception()
+        else:
+            self._flush_durations.observe((time.perf_counter_ns() - started_ns) / 1_000_000)
+            self._flush_sizes.observe(len(rows))
+            position = 0
+            for items, _, future in pending:
+                if not future.done():
+                    future.set_result(ids[position : position + len(items)])
+                position += len(items)
+        async with self._space:
+            self._space.notify_all()
+
+    async def _save(self, rows: List[OutcomeItem], options: Dict[str, Any]) -> List[PredictionId]:
+        delay = self.backoff_s
+        for attempt in range(1, self.max_attempts):
+            try:
+                return await self.repository.save_prediction_outcomes(rows, **options)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "Writing %d prediction outcomes failed (attempt %d of %d), retrying: %s",
+                    len(rows),
+                    attempt,
+                    self.max_attempts,
+                    exc,
+                )
+                self._retries.inc()
+                await asyncio.sleep(delay)
+                delay *= 2
+        return await self.repository.save_prediction_outcomes(rows, **options)
+
+
+def _rebase_sessions(pending: Sequence[_Pending]) -> List[SessionRecord]:
+    """Session records with item indexes shifted to the position of their outcomes in the flushed batch."""
+    sessions = []
+    position = 0
+    for items, session, _ in pending:
+        if session is not None:
+            sessions.append(replace(session, items=tuple(position + index for index in session.items)))
+        position += len(items)
+    return sessions
@@ -0,0 +1,123 @@
+"""Bounded worker stages used by the pipelined case orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import zlib
+from enum import Enum
+from typing import Awaitable, Callable, Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, Field, PositiveInt
+
+logger = logging.getLogger(__name__)
+
+TItem = TypeVar("TItem")
+
+StageHandler = Callable[[TItem], Awaitable[None]]
+StageErrorHandler = Callable[[TItem, BaseException], Awaitable[None]]
+
+
+class PipelineMode(str, Enum):
+    SEQUENTIAL = "sequential"
+    PIPELINED = "pipelined"
+
+
+class StageWorkersConfig(BaseModel):
+    """Concurrency and queue depth of a single pipeline stage."""
+
+    concurrency: PositiveInt = Field(default=1, description="Number of asyncio workers serving the stage.")
+    queue_size: PositiveInt = Field(default=8, description="Maximum number of items waiting in front of a worker.")
+
+
+class PipelineConfig(BaseModel):
+    """Orchestrator execution mode declared in the case manifest."""
+
+    mode: PipelineMode = PipelineMode.SEQUENTIAL
+    preserve_session_order: bool = Field(
+        default=True,
+        description="Route items of one session to the same worker so they are processed in arrival order.",
+    )
+    collect: StageWorkersConfig = Field(default_factory=StageWorkersConfig)
+    predict: StageWorkersConfig = Field(default_factory=StageWorkersConfig)
+    publish: StageWorkersConfig = Field(default_factory=StageWorkersConfig)
+
+
+class StageWorkers(Generic[TItem]):
+    """
+    Pool of asyncio workers draining bounded queues.
+
+    In ordered mode every worker owns a queue and items are routed by a stable hash of
+    their key, so items sharing a key are handled one after another. Otherwise all
+    workers share one queue.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: StageHandler[TItem],
+        config: StageWorkersConfig,
+        *,
+        ordered: bool = True,
+        on_error: Optional[StageErrorHandler[TItem]] = None,
+    ) -> None:
+        self.name = name
+        self._handler = handler
+        self._on_error = on_error
+        self._concurrency = config.concurrency
+        queue_count = config.concurrency if ordered else 1
+        self._queues: List[asyncio.Queue[TItem]] = [asyncio.Queue(maxsize=config.queue_size) for _ in range(queue_count)]
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        """Number of items currently waiting in the stage queues."""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        for index in range(self._concurrency):
+            queue = self._queues[index % len(self._queues)]
+            self._tasks.append(asyncio.create_task(self._worker(queue), name=f"{self.name}-worker-{index}"))
+
+    def _route(self, key: str) -> asyncio.Queue[TItem]:
+        if len(self._queues) == 1:
+            return self._queues[0]
+        return self._queues[zlib.crc32(key.encode("utf-8")) % len(self._queues)]
+
+    async def submit(self, key: str, item: TItem) -> None:
+        """Enqueue an item, waiting while the target queue is full."""
+        await self._route(key).put(item)
+
+    async def join(self) -> None:
+        """Wait until every submitted item has been handled."""
+        for queue in self._queues:
+            await queue.join()
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+
+    async def _worker(self, queue: asyncio.Queue[TItem]) -> None:
+        while True:
+            item = await queue.get()
+            try:
+                await self._handler(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Stage %s failed to handle item: %s", self.name, exc)
+                if self._on_error is not None:
+                    try:
+                        await self._on_error(item, exc)
+                    except Exception as error:  # noqa: BLE001
+                        # The worker must survive, or the items routed to it are never handled.
+                        logger.exception("Stage %s error handler failed: %s", self.name, error)
+            finally:
+                queue.task_done()
@@ -4,15 +4,31 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from contextlib import suppress
+import time
+from functools import partial
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Mapping, MutableSequence, Optional, Sequence
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, MutableSequence, Optional, Sequence, Tuple, Union
 
 from configs.settings import settings
-from core.domain import CaseConfigurationError, CaseId, DomainEvent, PredictionCompleted
+from core.domain import (
+    CaseActivated,
+    CaseConfigurationError,
+    CaseId,
+    DomainEvent,
+    PredictionCompleted,
+    PredictionId,
+    PredictionFailed,
+    PredictionOutcome,
+    SessionFailed,
+    SessionId,
+    SessionPredicted,
+)
 from core.interfaces import IEventBus
-from infrastructure.events.memory_bus import InMemoryEventBus
+from infrastructure.codecs import create_result_codec
+from infrastructure.events import EventBroker, EventJournal, InMemoryEventBus, JournaledEventBus, SocketEventBus
+from infrastructure.frames import FrameStore
 from infrastructure.repositories.sqlite.facade import SqliteRepositoryFacade
 from infrastructure.storage.local_fs.file_storage import LocalArtifactStorage, LocalFileStorage
 from application.artifacts import ArtifactPersistence
@@ -20,18 +36,271 @@ from application.cases.bootstrap import CaseBootstrapper
 from application.cases.factories import CaseBuildContext, register_default_case_blueprints
 from application.cases.registry import CaseFactory
 from application.manager import CaseManager
+from application.metrics import DEFAULT_SIZE_BUCKETS, Histogram, MetricsRegistry, format_summary, metrics
+from application.persistence import BulkOutcomeWriter, SessionAggregator
+from application.pipeline import StageWorkers, StageWorkersConfig
+from application.scheduling import FairScheduler
+from application.tracing import Tracer, tracer
+
+
+_PERSISTENCE_CONSUMER = "prediction_outcomes"
+# How long ``stop`` waits for the last journal offsets to be committed.
+_COMMIT_TIMEOUT_S = 5.0
+
+# Completed predictions of one session from one read batch, and a future resolved once they are committed.
+_PersistItem = Tuple[List[PredictionCompleted], Optional["asyncio.Future[None]"]]
+# Journal offset to commit once every future read before it is resolved; ``None`` ends the committer.
+_OffsetCommit = Optional[Tuple[int, List["asyncio.Future[None]"]]]
+# Where stored outcomes are submitted: straight to the bulk writer, or held per session first.
+_OutcomeSink = Union[BulkOutcomeWriter, SessionAggregator]
+
+
+async def _completed_batches(
+    event_bus: IEventBus[DomainEvent],
+    journal: Optional[EventJournal],
+    max_items: int,
+    max_wait: float,
+    until: Optional[asyncio.Event],
+    ready: Optional[asyncio.Event],
+) -> AsyncIterator[Tuple[List[PredictionCompleted], Optional[int]]]:
+    """Yield batches of completed predictions with the journal offset to commit after them."""
+    if journal is None:
+        async for events in event_bus.subscribe_batch(
+            PredictionCompleted, max_items=max_items, max_wait=max_wait, until=until, ready=ready
+        ):
+            yield events, None
+        return
+    if ready is not None:
+        ready.set()
+    async for records in journal.tail(
+        journal.committed_offset(_PERSISTENCE_CONSUMER), max_records=max_items, until=until
+    ):
+        events = [record.event for record in records if isinstance(record.event, PredictionCompleted)]
+        yield events, records[-1].next_offset
 
 
 async def _prediction_completed_consumer(
     event_bus: IEventBus[DomainEvent],
+    workers: "StageWorkers[_PersistItem]",
+    *,
+    max_items: int = 64,
+    max_wait: float = 0.05,
+    journal: Optional[EventJournal] = None,
+    commits: "Optional[asyncio.Queue[_OffsetCommit]]" = None,
+    until: Optional[asyncio.Event] = None,
+    ready: Optional[asyncio.Event] = None,
+) -> None:
+    """
+    Split batches of completed predictions per session and hand them to the persistence pool.
+
+    With a journal, offsets are queued on ``commits`` for ``_commit_offsets``, which commits
+    each once every outcome read before it is stored, so reading runs ahead of the database.
+    Once ``until`` is set, the events already received are handed over and the consumer returns.
+    ``ready`` is set once the consumer reads from the bus or the journal.
+    """
+    loop = asyncio.get_running_loop()
+    async for events, offset in _completed_batches(event_bus, journal, max_items, max_wait, until, ready):
+        stored: List["asyncio.Future[None]"] = []
+        for (_, session_id), session_events in _by_session(events).items():
+            done = loop.create_future() if commits is not None else None
+            await workers.submit(session_id, (session_events, done))
+            if done is not None:
+                stored.append(done)
+        if commits is not None and offset is not None:
+            await commits.put((offset, stored))
+
+
+async def _commit_offsets(journal: EventJournal, commits: "asyncio.Queue[_OffsetCommit]") -> None:
+    """
+    Commit queued journal offsets in order until ``None`` is queued.
+
+    An offset whose outcomes failed to store is skipped rather than ending the committer,
+    which would leave the consumer blocked on a full queue; committing a later offset
+    then moves past those outcomes, so they are not replayed.
+    """
+    while True:
+        commit = await commits.get()
+        if commit is None:
+            return
+        offset, stored = commit
+        try:
+            await asyncio.gather(*stored)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("Skipping %s offset %d, its outcomes were not stored: %s", _PERSISTENCE_CONSUMER, offset, exc)
+            continue
+        # Outcomes are committed only once stored, so a crash replays them (at least once).
+        journal.commit_offset(_PERSISTENCE_CONSUMER, offset)
+        journal.compact(offset)
+
+
+def _by_session(events: List[PredictionCompleted]) -> Dict[Tuple[CaseId, SessionId], List[PredictionCompleted]]:
+    grouped: Dict[Tuple[CaseId, SessionId], List[PredictionCompleted]] = {}
+    for event in events:
+        grouped.setdefault((event.case_id, event.session_id), []).append(event)
+    return grouped
+
+
+def _persistence_workers(
+    artifact_persistence: ArtifactPersistence, writer: _OutcomeSink, config: StageWorkersConfig
+) -> "StageWorkers[_PersistItem]":
+    """
+    Pool persisting completed predictions, routed by session.
+
+    A worker stores the artifacts of one session's events and submits them to ``writer``
+    before taking the next item, so outcomes of a session reach the database in order
+    while different sessions are handled concurrently.
+    """
+    persisted = metrics.counter("persistence_outcomes_total")
+    artifacts = metrics.counter("persistence_artifacts_total")
+    batch_sizes = metrics.histogram("persistence_batch_size", DEFAULT_SIZE_BUCKETS)
+    duration = metrics.histogram("persistence_duration_ms")
+    frame_ages: Dict[CaseId, Histogram] = {}
+
+    async def persist(item: _PersistItem) -> None:
+        events, done = item
+        started_ns = time.perf_counter_ns()
+        outcomes, written = await _persist_batch(events, artifact_persistence, writer, frame_ages)
+        duration.observe((time.perf_counter_ns() - started_ns) / 1_000_000)
+        artifacts.inc(sum(len(outcome.artifacts) for outcome in outcomes))
+        batch_sizes.observe(len(events))
+        persisted.inc(len(events))
+        if done is not None:
+            written.add_done_callback(partial(_resolve_stored, done))
+
+    async def failed(item: _PersistItem, exc: BaseException) -> None:
+        done = item[1]
+        if done is not None and not done.done():
+            done.set_exception(exc)
+
+    return StageWorkers("persistence", persist, config, ordered=True, on_error=failed)
+
+
+def _resolve_stored(done: "asyncio.Future[None]", written: "asyncio.Future[List[PredictionId]]") -> None:
+    if done.done():
+        return
+    if written.cancelled():
+        done.cancel()
+    elif written.exception() is not None:
+        done.set_exception(written.exception())
+    else:
+        done.set_result(None)
+
+
+async def _persist_batch(
+    events: List[PredictionCompleted],
     artifact_persistence: ArtifactPersistence,
-    repository: SqliteRepositoryFacade,
+    writer: _OutcomeSink,
+    frame_ages: Dict[CaseId, Histogram],
+) -> Tuple[List[PredictionOutcome], "asyncio.Future[List[PredictionId]]"]:
+    """Store artifacts and hand the outcomes to the writer; the future resolves once committed."""
+    received_ns = time.perf_counter_ns()
+    handled = await asyncio.gather(
+        *(artifact_persistence.handle_and_encode(event.outcome, case_id=str(event.case_id)) for event in events)
+    )
+    stored_ns = time.perf_counter_ns()
+    outcomes = [outcome for outcome, _ in handled]
+    written = await writer.submit(
+        [(event.session_id, outcome, event.case_id, payload) for event, (outcome, payload) in zip(events, handled)]
+    )
+    if tracer.enabled:
+        written.add_done_callback(partial(_trace_batch, events, outcomes, received_ns, stored_ns, frame_ages))
+    return outcomes, written
+
+
+def _trace_batch(
+    events: List[PredictionCompleted],
+    outcomes: List[PredictionOutcome],
+    received_ns: int,
+    stored_ns: int,
+    frame_ages: Dict[CaseId, Histogram],
+    written: "asyncio.Future[List[PredictionId]]",
+) -> None:
+    if written.cancelled() or written.exception() is not None:
+        return
+    written_ns = time.perf_counter_ns()
+    for event, outcome in zip(events, outcomes):
+        stage = outcome.stage.value
+        if event.local:
+            tracer.record("bus", event.case_id, event.session_id, event.occurred_ns, received_ns, stage=stage)
+        tracer.record("artifacts", event.case_id, event.session_id, received_ns, stored_ns, stage=stage)
+        tracer.record(
+            "repository", event.case_id, event.session_id, stored_ns, written_ns, stage=stage, batch=len(events)
+        )
+        age_ns = tracer.frame_age_ns(event.session_id, written_ns)
+        if age_ns is not None:
+            histogram = frame_ages.get(event.case_id)
+            if histogram is None:
+                histogram = frame_ages[event.case_id] = metrics.histogram("frame_age_ms", case=event.case_id)
+            histogram.observe(age_ns / 1_000_000)
+            tracer.record("frame", event.case_id, event.session_id, written_ns - age_ns, written_ns, stage=stage)
+
+
+async def _session_updates(
+    event_bus: IEventBus[DomainEvent],
+    aggregator: SessionAggregator,
+    event_type: type[DomainEvent],
+    ready: Optional[asyncio.Event] = None,
 ) -> None:
-    async for event in event_bus.subscribe(PredictionCompleted):
-        logger.info("PredictionCompleted received: case=%s stage=%s", event.case_id, event.outcome.stage)
-        outcome = await artifact_persistence.handle_outcome(event.outcome, case_id=str(event.case_id))
-        logger.info("Outcome artifacts after persistence: %s", [a.uri for a in outcome.artifacts])
-        await repository.save_prediction_outcome(event.session_id, outcome)
+    """Feed case stages and the progress and failures of sessions to the session aggregator."""
+    async for event in event_bus.subscribe(event_type, ready=ready):
+        if isinstance(event, CaseActivated):
+            await aggregator.expect(event.case_id, event.stages)
+        elif isinstance(event, PredictionFailed):
+            await aggregator.fail(event.case_id, event.session_id, event.stage)
+        elif isinstance(event, SessionPredicted):
+            await aggregator.predicted(event.case_id, event.session_id, event.stages)
+        elif isinstance(event, SessionFailed):
+            await aggregator.abort(event.case_id, event.session_id)
+
+
+async def _subscribed(task: "asyncio.Task[None]", ready: asyncio.Event) -> None:
+    """Wait until ``task`` has registered its subscription, or has already ended."""
+    waiter = asyncio.ensure_future(ready.wait())
+    try:
+        await asyncio.wait({waiter, task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+
+async def _metrics_reporter(runtime: "RuntimeEnvironment", interval_s: float) -> None:
+    while True:
+        await asyncio.sleep(interval_s)
+        summary = format_summary(runtime.metrics_snapshot())
+        if summary:
+            logger.info("Runtime metrics:\n%s", summary)
+
+
+async def _storage_maintenance(runtime: "RuntimeEnvironment", retention_days: int, interval_s: float) -> None:
+    dropped_total = runtime.metrics.counter("storage_partitions_dropped_total")
+    while True:
+        before = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        try:
+            dropped = await runtime.repository.apply_retention(before)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Storage maintenance failed: %s", exc)
+        else:
+            if dropped:
+                dropped_total.inc(dropped)
+                logger.info("Dropped %d outcome partitions older than %s", dropped, before.date())
+        await asyncio.sleep(interval_s)
+
+
+async def _settle(task: asyncio.Task) -> None:
+    """Await a finished or cancelled background task, logging its failure instead of raising it."""
+    try:
+        await task
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Background task %s failed: %s", task.get_name(), exc)
+
+
+async def _shutdown_step(name: str, step: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await step()
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Failed to stop %s: %s", name, exc)
 
 
 logger = logging.getLogger(__name__)
@@ -48,31 +317,171 @@ class RuntimeEnvironment:
     artifact_persistence: ArtifactPersistence
     repository: SqliteRepositoryFacade
     registered_cases: Sequence[CaseId]
+    scheduler: FairScheduler
+    broker: Optional[EventBroker] = None
+    journal: Optional[EventJournal] = None
+    frame_store: Optional[FrameStore] = None
+    outcome_writer: Optional[BulkOutcomeWriter] = None
+    session_aggregator: Optional[SessionAggregator] = None
+    metrics: MetricsRegistry = field(default=metrics)
+    metrics_log_interval_s: float = 0.0
+    persistence_batch_size: int = 64
+    persistence_batch_wait_s: float = 0.05
+    persistence_concurrency: int = 4
+    persistence_queue_size: int = 16
+    persistence_workers: Optional["StageWorkers[_PersistItem]"] = None
+    retention_days: int = 0
+    maintenance_interval_s: float = 3600.0
+    tracer: Tracer = field(default=tracer)
+    trace_path: Optional[Path] = None
     background_tasks: MutableSequence[asyncio.Task] = field(default_factory=list)
+    _stopping: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+    _consumer: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
+    _commits: "Optional[asyncio.Queue[_OffsetCommit]]" = field(default=None, init=False, repr=False)
+    _committer: Optional[asyncio.Task] = field(default=None, init=False, repr=False)
 
     async def start(self) -> None:
         """Start background consumers if not already running."""
         if self.background_tasks:
             return
-        task = asyncio.create_task(
-            _prediction_completed_consumer(self.event_bus, self.artifact_persistence, self.repository),
+        if self.outcome_writer is None:
+            self.outcome_writer = BulkOutcomeWriter(self.repository)
+        await self.outcome_writer.start()
+        sink: _OutcomeSink = self.outcome_writer
+        subscribed: List[Tuple[asyncio.Task, asyncio.Event]] = []
+        if self.session_aggregator is not None:
+            await self.session_aggregator.start()
+            sink = self.session_aggregator
+            for event_type in (CaseActivated, PredictionFailed, SessionPredicted, SessionFailed):
+                ready = asyncio.Event()
+                task = asyncio.create_task(
+                    _session_updates(self.event_bus, self.session_aggregator, event_type, ready),
+                    name=f"session_updates_{event_type.__name__}",
+                )
+                self.background_tasks.append(task)
+                subscribed.append((task, ready))
+        self.persistence_workers = _persistence_workers(
+            self.artifact_persistence,
+            sink,
+            StageWorkersConfig(concurrency=self.persistence_concurrency, queue_size=self.persistence_queue_size),
+        )
+        self.persistence_workers.start()
+        self._stopping = asyncio.Event()
+        if self.journal is not None:
+            self._commits = asyncio.Queue(maxsize=self.persistence_concurrency * self.persistence_queue_size)
+            self._committer = asyncio.create_task(
+                _commit_offsets(self.journal, self._commits), name="prediction_outcomes_committer"
+            )
+        ready = asyncio.Event()
+        self._consumer = asyncio.create_task(
+            _prediction_completed_consumer(
+                self.event_bus,
+                self.persistence_workers,
+                max_items=self.persistence_batch_size,
+                max_wait=self.persistence_batch_wait_s,
+                journal=self.journal,
+                commits=self._commits,
+                until=self._stopping,
+                ready=ready,
+            ),
             name="prediction_completed_consumer",
         )
-        self.background_tasks.append(task)
+        self.background_tasks.append(self._consumer)
+        subscribed.append((self._consumer, ready))
+        if self.metrics_log_interval_s > 0:
+            self.background_tasks.append(
+                asyncio.create_task(_metrics_reporter(self, self.metrics_log_interval_s), name="metrics_reporter")
+            )
+        if self.retention_days > 0:
+            self.background_tasks.append(
+                asyncio.create_task(
+                    _storage_maintenance(self, self.retention_days, self.maintenance_interval_s),
+                    name="storage_maintenance",
+                )
+            )
+        # Return only once the consumers are subscribed, so that no CaseActivated or
+        # PredictionCompleted the caller publishes next is missed by them.
+        for task, ready in subscribed:
+            await _subscribed(task, ready)
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters, gauges and histogram summaries, including scheduler, event-bus and storage state."""
+        for case_id, stats in self.scheduler.snapshot().items():
+            self.metrics.gauge("scheduler_waiting", case=case_id).set(stats.waiting)
+            self.metrics.gauge("scheduler_in_flight", case=case_id).set(stats.in_flight)
+        depths: Dict[str, int] = {}
+        dropped: Dict[str, int] = {}
+        for subscription in self.event_bus.subscription_stats():
+            depths[subscription.event_type] = depths.get(subscription.event_type, 0) + subscription.depth
+            dropped[subscription.event_type] = dropped.get(subscription.event_type, 0) + subscription.dropped
+        for event_type, depth in depths.items():
+            self.metrics.gauge("event_bus_queue_depth", event=event_type).set(depth)
+            self.metrics.gauge("event_bus_dropped", event=event_type).set(dropped[event_type])
+        if self.outcome_writer is not None:
+            self.metrics.gauge("outcome_writer_pending").set(self.outcome_writer.pending)
+        if self.persistence_workers is not None:
+            self.metrics.gauge("persistence_queue_depth").set(self.persistence_workers.depth)
+        if self.session_aggregator is not None:
+            self.metrics.gauge("sessions_open").set(self.session_aggregator.open_sessions)
+        if self.frame_store is not None:
+            frames = self.frame_store.stats()
+            self.metrics.gauge("frame_store_in_use").set(frames.in_use)
+            self.metrics.gauge("frame_store_fallbacks").set(frames.fallbacks)
+        return self.metrics.snapshot()
 
     async def stop(self) -> None:
-        """Cancel background consumers."""
+        """Drain the persistence consumer, cancel other background tasks and flush outcomes to the database."""
         await self.case_manager.deactivate_all()
+        # Completed predictions the consumer has received but not yet handed to the pool are
+        # drained into it rather than dropped with a cancelled subscription.
+        self._stopping.set()
+        if self._consumer is not None:
+            watched = {self._consumer} if self._committer is None else {self._consumer, self._committer}
+            await asyncio.wait(watched, return_when=asyncio.FIRST_COMPLETED)
+            if not self._consumer.done():
+                # The committer is gone, so the consumer may be blocked on its full queue.
+                self._consumer.cancel()
+            self._consumer = None
         for task in list(self.background_tasks):
             task.cancel()
         for task in list(self.background_tasks):
-            with suppress(asyncio.CancelledError):
-                await task
+            await _settle(task)
         self.background_tasks.clear()
+        # Each step runs even if an earlier one failed, so buffered outcomes still reach the database.
+        if self.persistence_workers is not None:
+            # Outcomes already routed to the pool are stored before the writer's final flush.
+            await _shutdown_step("persistence workers", self.persistence_workers.join)
+            await _shutdown_step("persistence workers", self.persistence_workers.stop)
+            self.persistence_workers = None
+        if self.session_aggregator is not None:
+            await _shutdown_step("session aggregator", self.session_aggregator.stop)
+        if self.outcome_writer is not None:
+            await _shutdown_step("outcome writer", self.outcome_writer.stop)
+        if self._committer is not None and self._commits is not None:
+            await self._finish_commits(self._committer, self._commits)
+            self._committer = self._commits = None
+        if self.tracer.enabled and self.trace_path is not None:
+            path = self.tracer.export_chrome_trace(self.trace_path)
+            logger.info("Wrote %d trace spans to %s", len(self.tracer.spans()), path)
+
+    async def _finish_commits(self, committer: asyncio.Task, commits: "asyncio.Queue[_OffsetCommit]") -> None:
+        """Let the committer commit the last read offsets, now that every outcome is stored."""
+        if not committer.done():
+            end = asyncio.create_task(commits.put(None))
+            await asyncio.wait({committer}, timeout=_COMMIT_TIMEOUT_S)
+            if not committer.done():
+                logger.error("Journal offsets were not committed within %.1f s", _COMMIT_TIMEOUT_S)
+                committer.cancel()
+            end.cancel()
+        await _settle(committer)
 
     async def shutdown(self) -> None:
-        """Convenience helper to deactivate cases and stop background tasks."""
+        """Convenience helper to deactivate cases, stop background tasks and close the event bus and database."""
         await self.stop()
+        await self.event_bus.close()
+        await self.repository.close()
+        if self.broker is not None:
+            await self.broker.stop()
 
     async def __aenter__(self) -> "RuntimeEnvironment":
         await self.start()
@@ -88,12 +497,15 @@ async def create_runtime(
     device_serials: Mapping[str, str] | None = None,
     metadata: Mapping[str, Mapping[str, object]] | None = None,
     overrides: Mapping[str, Mapping[str, object]] | None = None,
+    trace_path: Optional[Path] = None,
 ) -> RuntimeEnvironment:
     """
     Build application runtime with real event bus, storages and repository wiring.
 
     Parameters allow overriding database location, device serials, channel metadata
-    and manifest overrides.
+    and manifest overrides. ``MMLA_EVENT_JOURNAL_DIR`` makes completed predictions
+    durable across restarts. ``trace_path`` (or ``MMLA_TRACE_PATH``) enables session
+    tracing and is where the Chrome trace is written on shutdown.
     """
     cases_dir = settings.cases_dir
     if not cases_dir.exists():
@@ -110,26 +522,72 @@ async def create_runtime(
     db_path = (database_path or settings.database_file).resolve()
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    event_bus: IEventBus[DomainEvent] = InMemoryEventBus()
+    broker: Optional[EventBroker] = None
+    journal: Optional[EventJournal] = None
+    event_bus: IEventBus[DomainEvent]
+    if settings.event_broker is None:
+        event_bus = InMemoryEventBus(default_max_size=settings.event_queue_size)
+    else:
+        # Host the broker so that cases and predictors in other processes can publish to
+        # this runtime's consumers through their own SocketEventBus.
+        broker = EventBroker(settings.event_broker)
+        await broker.start()
+        event_bus = await SocketEventBus(settings.event_broker, default_max_size=settings.event_queue_size).connect()
+    if settings.event_journal_path is not None:
+        # Completed predictions are journaled before fan-out; persistence tails the journal
+        # from its committed offset instead of the bus, so a restart resumes where it stopped.
+        journal = await EventJournal(
+            settings.event_journal_path,
+            segment_bytes=settings.event_journal_segment_mb * 1024 * 1024,
+            fsync_interval=settings.event_journal_fsync_ms / 1000.0,
+        ).open()
+        event_bus = JournaledEventBus(event_bus, journal, journaled_types=(PredictionCompleted,))
     case_factory = CaseFactory()
     bootstrapper = CaseBootstrapper(case_factory=case_factory)
 
     file_storage = LocalFileStorage(settings.data_dir)
     artifact_storage = LocalArtifactStorage(settings.artifacts_dir)
-    artifact_persistence = ArtifactPersistence(file_storage=file_storage, artifact_storage=artifact_storage)
+    codec = create_result_codec(settings.result_codec)
+    artifact_persistence = ArtifactPersistence(
+        file_storage=file_storage, artifact_storage=artifact_storage, codec=codec
+    )
 
-    repository = SqliteRepositoryFacade(db_path=db_path)
+    repository = SqliteRepositoryFacade(
+        db_path=db_path,
+        readers=settings.database_readers,
+        synchronous=settings.database_synchronous,
+        vacuum_pages=settings.database_vacuum_pages,
+        codec=codec,
+    )
+    outcome_writer = BulkOutcomeWriter(
+        repository,
+        max_batch=settings.persistence_flush_size,
+        flush_interval=settings.persistence_flush_interval_ms / 1000.0,
+        max_pending=settings.persistence_max_pending,
+        measurements=bootstrapper.measurements,
+        max_attempts=settings.persistence_flush_attempts,
+        backoff_s=settings.persistence_flush_backoff_ms / 1000.0,
+    )
+    session_aggregator: Optional[SessionAggregator] = None
+    if settings.session_timeout_s > 0:
+        session_aggregator = SessionAggregator(outcome_writer, event_bus, timeout=settings.session_timeout_s)
+    frame_store: Optional[FrameStore] = None
+    if settings.frame_store_slots:
+        frame_store = FrameStore(slots=settings.frame_store_slots, slot_bytes=settings.frame_store_slot_kb * 1024)
     context = CaseBuildContext(
         event_bus=event_bus,
         repository=repository,
         device_serials=device_serials or {},
         metadata=metadata or {},
         file_storage=file_storage,
+        frame_store=frame_store,
     )
     register_default_case_blueprints(bootstrapper, context)
     registered_cases = await bootstrapper.bootstrap(overrides=overrides)
+    await repository.ensure_measurement_tables(bootstrapper.measurements.schemas())
 
-    case_manager = CaseManager(case_factory=case_factory, event_bus=event_bus)
+    scheduler = FairScheduler(slots=settings.scheduler_slots)
+    case_manager = CaseManager(case_factory=case_factory, event_bus=event_bus, scheduler=scheduler)
 
     runtime = RuntimeEnvironment(
         event_bus=event_bus,
@@ -139,7 +597,23 @@ async def create_runtime(
         artifact_persistence=artifact_persistence,
         repository=repository,
         registered_cases=registered_cases,
+        scheduler=scheduler,
+        broker=broker,
+        journal=journal,
+        frame_store=frame_store,
+        outcome_writer=outcome_writer,
+        session_aggregator=session_aggregator,
+        metrics_log_interval_s=settings.metrics_log_interval_s,
+        persistence_batch_size=settings.persistence_batch_size,
+        persistence_batch_wait_s=settings.persistence_batch_wait_ms / 1000.0,
+        persistence_concurrency=settings.persistence_concurrency,
+        persistence_queue_size=settings.persistence_queue_size,
+        retention_days=settings.database_retention_days,
+        maintenance_interval_s=settings.database_maintenance_interval_s,
+        trace_path=trace_path or settings.trace_file,
     )
+    if runtime.trace_path is not None:
+        runtime.tracer.enabled = True
 
     await runtime.start()
     return runtime
@@ -0,0 +1,188 @@
+"""Runtime-wide weighted-fair scheduling of prediction slots across active cases."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Deque, Dict, Mapping, Optional
+
+from pydantic import BaseModel, Field, PositiveFloat, PositiveInt
+
+from core.domain import CaseId
+
+
+class PriorityClass(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+_PRIORITY_RANK = {PriorityClass.HIGH: 0, PriorityClass.NORMAL: 1, PriorityClass.LOW: 2}
+
+
+class SchedulingConfig(BaseModel):
+    """Share of the runtime prediction slots a case is entitled to."""
+
+    priority: PriorityClass = Field(
+        default=PriorityClass.NORMAL,
+        description="Waiting requests of a higher class are always granted first.",
+    )
+    weight: PositiveFloat = Field(default=1.0, description="Relative share among cases of the same class.")
+    max_in_flight: PositiveInt = Field(default=4, description="Maximum predictions of the case running at once.")
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    start_tag: float
+    finish_tag: float
+    enqueued_at: float
+
+
+@dataclass
+class _CaseQueue:
+    config: SchedulingConfig
+    waiters: Deque[_Waiter] = field(default_factory=deque)
+    in_flight: int = 0
+    last_finish_tag: float = 0.0
+    granted: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+
+@dataclass(frozen=True)
+class CaseSchedulingStats:
+    waiting: int
+    in_flight: int
+    granted: int
+    mean_wait_ms: float
+    max_wait_ms: float
+
+
+class FairScheduler:
+    """
+    Shares a fixed number of prediction slots between cases.
+
+    Requests are tagged with start-time fair queuing finish tags (``1 / weight`` per
+    request), so backlogged cases receive slots in proportion to their weights, while
+    priority classes are served strictly in order and ``max_in_flight`` caps each case.
+    """
+
+    def __init__(self, slots: int) -> None:
+        if slots < 1:
+            raise ValueError("Scheduler needs at least one slot.")
+        self.slots = slots
+        self._free = slots
+        self._virtual_time = 0.0
+        self._cases: Dict[CaseId, _CaseQueue] = {}
+
+    def register(self, case_id: CaseId, config: SchedulingConfig) -> None:
+        queue = self._cases.get(case_id)
+        if queue is None:
+            self._cases[case_id] = _CaseQueue(config=config, last_finish_tag=self._virtual_time)
+        else:
+            queue.config = config
+
+    def unregister(self, case_id: CaseId) -> None:
+        queue = self._cases.get(case_id)
+        if queue is not None and not queue.waiters and not queue.in_flight:
+            del self._cases[case_id]
+
+    @asynccontextmanager
+    async def slot(self, case_id: CaseId) -> AsyncIterator[float]:
+        """Hold one prediction slot for the case; yields the time spent waiting in ms."""
+        wait_ms = await self._acquire(case_id)
+        try:
+            yield wait_ms
+        finally:
+            self._release(case_id)
+
+    def snapshot(self) -> Mapping[CaseId, CaseSchedulingStats]:
+        return {
+            case_id: CaseSchedulingStats(
+                waiting=len(queue.waiters),
+                in_flight=queue.in_flight,
+                granted=queue.granted,
+                mean_wait_ms=queue.total_wait_ms / queue.granted if queue.granted else 0.0,
+                max_wait_ms=queue.max_wait_ms,
+            )
+            for case_id, queue in self._cases.items()
+        }
+
+    def _queue_for(self, case_id: CaseId) -> _CaseQueue:
+        queue = self._cases.get(case_id)
+        if queue is None:
+            queue = _CaseQueue(config=SchedulingConfig(), last_finish_tag=self._virtual_time)
+            self._cases[case_id] = queue
+        return queue
+
+    async def _acquire(self, case_id: CaseId) -> float:
+        queue = self._queue_for(case_id)
+        start_tag = max(self._virtual_time, queue.last_finish_tag)
+        queue.last_finish_tag = start_tag + 1.0 / queue.config.weight
+        enqueued_at = time.perf_counter()
+        if self._free and queue.in_flight < queue.config.max_in_flight and not self._has_waiters():
+            self._grant(queue, start_tag, enqueued_at)
+            return 0.0
+
+        waiter = _Waiter(
+            future=asyncio.get_running_loop().create_future(),
+            start_tag=start_tag,
+            finish_tag=queue.last_finish_tag,
+            enqueued_at=enqueued_at,
+        )
+        queue.waiters.append(waiter)
+        self._dispatch()
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(case_id)
+            else:
+                queue.waiters.remove(waiter)
+            raise
+
+    def _release(self, case_id: CaseId) -> None:
+        queue = self._cases[case_id]
+        queue.in_flight -= 1
+        self._free += 1
+        self._dispatch()
+
+    def _has_waiters(self) -> bool:
+        return any(queue.waiters for queue in self._cases.values())
+
+    def _grant(self, queue: _CaseQueue, tag: float, enqueued_at: float) -> float:
+        wait_ms = (time.perf_counter() - enqueued_at) * 1000.0
+        self._free -= 1
+        queue.in_flight += 1
+        queue.granted += 1
+        queue.total_wait_ms += wait_ms
+        queue.max_wait_ms = max(queue.max_wait_ms, wait_ms)
+        self._virtual_time = max(self._virtual_time, tag)
+        return wait_ms
+
+    def _dispatch(self) -> None:
+        while self._free:
+            candidate: Optional[_CaseQueue] = None
+            for queue in self._cases.values():
+                if not queue.waiters or queue.in_flight >= queue.config.max_in_flight:
+                    continue
+                if candidate is None or self._precedes(queue, candidate):
+                    candidate = queue
+            if candidate is None:
+                return
+            waiter = candidate.waiters.popleft()
+            wait_ms = self._grant(candidate, waiter.start_tag, waiter.enqueued_at)
+            waiter.future.set_result(wait_ms)
+
+    @staticmethod
+    def _precedes(queue: _CaseQueue, other: _CaseQueue) -> bool:
+        rank = _PRIORITY_RANK[queue.config.priority]
+        other_rank = _PRIORITY_RANK[other.config.priority]
+        if rank != other_rank:
+            return rank < other_rank
+        return queue.waiters[0].finish_tag < other.waiters[0].finish_tag
@@ -1,6 +1,7 @@
 """Service layer components for the framework."""
 
 from application.services.collector import CollectorService
+from application.services.config import StageConfig
 from application.services.predictor import PredictorService
 
-__all__ = ["CollectorService", "PredictorService"]
+__all__ = ["CollectorService", "PredictorService", "StageConfig"]
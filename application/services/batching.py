@@ -0,0 +1,141 @@
+"""Micro-batching of prediction inputs across sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.domain import PredictionConsistencyError, PredictionInput, PredictionOutcome
+from application.metrics import DEFAULT_SIZE_BUCKETS, metrics
+from application.services.config import BatchingConfig
+from application.services.executors import PredictorExecutor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingPrediction:
+    request: PredictionInput
+    future: asyncio.Future
+    enqueued_at: float
+
+
+@dataclass
+class BatchingStats:
+    """Aggregated batch sizes and queue wait of a micro-batcher."""
+
+    batches: int = 0
+    items: int = 0
+    max_batch_size: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        return self.total_wait_ms / self.items if self.items else 0.0
+
+
+class MicroBatcher:
+    """
+    Coalesces pending inputs of one stage and dispatches them through ``predict_batch``.
+
+    A batch is flushed when it reaches ``max_batch_size`` or when its first input has
+    waited ``max_wait_ms``. Outcomes are scattered back to the awaiting callers and carry
+    ``batch_size`` and ``batch_wait_ms`` metrics.
+    """
+
+    def __init__(self, executor: PredictorExecutor, config: BatchingConfig) -> None:
+        self.executor = executor
+        self.config = config
+        self.stats = BatchingStats()
+        stage = executor.predictor.stage.value
+        self._size_histogram = metrics.histogram("batcher_batch_size", DEFAULT_SIZE_BUCKETS, stage=stage)
+        self._wait_histogram = metrics.histogram("batcher_wait_ms", stage=stage)
+        self._queue: asyncio.Queue[_PendingPrediction] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, request: PredictionInput) -> PredictionOutcome:
+        if self._task is None:
+            self._task = asyncio.create_task(self._dispatch_loop(), name=f"batcher-{request.stage.value}")
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingPrediction(request=request, future=future, enqueued_at=time.perf_counter()))
+        return await future
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        while not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.cancel()
+
+    async def _dispatch_loop(self) -> None:
+        max_wait = self.config.max_wait_ms / 1000.0
+        while True:
+            pending: List[_PendingPrediction] = [await self._queue.get()]
+            deadline = pending[0].enqueued_at + max_wait
+            while len(pending) < self.config.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    if self._queue.empty():
+                        break
+                    pending.append(self._queue.get_nowait())
+                    continue
+                try:
+                    pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._dispatch(pending)
+
+    async def _dispatch(self, pending: List[_PendingPrediction]) -> None:
+        pending = [item for item in pending if not item.future.done()]
+        if not pending:
+            return
+        dispatched_at = time.perf_counter()
+        try:
+            outcomes = await self.executor.predict_batch([item.request for item in pending])
+            if len(outcomes) != len(pending):
+                raise PredictionConsistencyError(
+                    f"{type(self.executor.predictor).__name__}.predict_batch returned {len(outcomes)} outcomes for {len(pending)} inputs"
+                )
+        except Exception as exc:  # noqa: BLE001
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+        elapsed_ms = (time.perf_counter() - dispatched_at) * 1000.0
+
+        batch_size = len(pending)
+        self.stats.batches += 1
+        self.stats.items += batch_size
+        self.stats.max_batch_size = max(self.stats.max_batch_size, batch_size)
+        self._size_histogram.observe(batch_size)
+        for item, outcome in zip(pending, outcomes):
+            wait_ms = (dispatched_at - item.enqueued_at) * 1000.0
+            self.stats.total_wait_ms += wait_ms
+            self.stats.max_wait_ms = max(self.stats.max_wait_ms, wait_ms)
+            self._wait_histogram.observe(wait_ms)
+            if outcome.duration_ms is None:
+                outcome.duration_ms = elapsed_ms
+            outcome.metrics["batch_size"] = batch_size
+            outcome.metrics["batch_wait_ms"] = wait_ms
+            if not item.future.done():
+                item.future.set_result(outcome)
+        logger.debug(
+            "Dispatched batch stage=%s size=%d duration=%.2fms",
+            pending[0].request.stage,
+            batch_size,
+            elapsed_ms,
+        )
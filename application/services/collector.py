@@ -3,28 +3,39 @@
 from __future__ import annotations
 
 import inspect
-import logging
-from dataclasses import dataclass
-from typing import Awaitable, Callable, Sequence
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Sequence, Tuple
 
 from core.domain import CaseId, FrameBatch, PredictionInput
+from application.metrics import Counter, Histogram, metrics
 
 PrepareCallable = Callable[[CaseId, FrameBatch], Awaitable[Sequence[PredictionInput]] | Sequence[PredictionInput]]
 
 
-logger = logging.getLogger(__name__)
-
-
 @dataclass
 class CollectorService:
     """Wraps a callable that builds prediction inputs from frame batches."""
 
     prepare_inputs: PrepareCallable
+    _series: Dict[CaseId, Tuple[Histogram, Counter]] = field(default_factory=dict, init=False, repr=False)
 
     async def handle_batch(self, case_id: CaseId, batch: FrameBatch) -> Sequence[PredictionInput]:
-        logger.info("Collector handling batch for case=%s with %d frames", case_id, len(batch.frames))
+        start = time.perf_counter()
         result = self.prepare_inputs(case_id, batch)
         if inspect.isawaitable(result):
             result = await result  # type: ignore[assignment]
-        logger.info("Collector produced %d prediction inputs", len(result))
+        duration, inputs = self._series_for(case_id)
+        duration.observe((time.perf_counter() - start) * 1000.0)
+        inputs.inc(len(result))
         return result
+
+    def _series_for(self, case_id: CaseId) -> Tuple[Histogram, Counter]:
+        series = self._series.get(case_id)
+        if series is None:
+            series = (
+                metrics.histogram("collector_duration_ms", case=case_id),
+                metrics.counter("collector_inputs_total", case=case_id),
+            )
+            self._series[case_id] = series
+        return series
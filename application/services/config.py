@@ -0,0 +1,83 @@
+"""Manifest-level configuration of prediction stages."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import Optional, Tuple
+
+from pydantic import BaseModel, Field, NonNegativeFloat, PositiveFloat, PositiveInt, model_validator
+
+from core.domain import FailureAction, PredictionStage, RetryStrategy, StagePolicy
+
+
+class ExecutorKind(str, Enum):
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ExecutorConfig(BaseModel):
+    """Where the stage predictor runs relative to the runtime event loop."""
+
+    kind: ExecutorKind = ExecutorKind.INLINE
+    workers: PositiveInt = Field(default=1, description="Threads or worker processes serving the stage.")
+
+
+class BatchingConfig(BaseModel):
+    """Cross-session micro-batching of stage inputs."""
+
+    max_batch_size: PositiveInt = Field(default=8, description="Maximum number of inputs passed to predict_batch.")
+    max_wait_ms: float = Field(default=5.0, ge=0.0, description="How long the first input may wait for companions.")
+
+
+class StagePolicyConfig(BaseModel):
+    """Deadline, retry and fallback rules of a stage."""
+
+    timeout_s: Optional[PositiveFloat] = Field(default=None, description="Deadline of a single predictor call.")
+    max_attempts: PositiveInt = 1
+    retry_strategy: RetryStrategy = RetryStrategy.NEVER
+    backoff_s: NonNegativeFloat = Field(default=0.0, description="Pause before the second attempt.")
+    backoff_multiplier: float = Field(default=2.0, ge=1.0)
+    failure_action: FailureAction = FailureAction.ABORT_SESSION
+    fallback_predictor: Optional[str] = Field(
+        default=None,
+        description="Name of a predictor registered with PredictorService.register_fallback.",
+    )
+
+    @model_validator(mode="after")
+    def _require_fallback_name(self) -> "StagePolicyConfig":
+        if self.failure_action is FailureAction.FALLBACK and not self.fallback_predictor:
+            raise ValueError("failure_action 'fallback' requires fallback_predictor.")
+        return self
+
+
+def build_stage_policy(config: StagePolicyConfig) -> StagePolicy:
+    """Convert manifest policy section to the domain policy."""
+    return StagePolicy(
+        max_attempts=config.max_attempts,
+        retry_strategy=config.retry_strategy,
+        failure_action=config.failure_action,
+        fallback_predictor=config.fallback_predictor,
+        timeout_s=config.timeout_s,
+        backoff_s=config.backoff_s,
+        backoff_multiplier=config.backoff_multiplier,
+    )
+
+
+class StageConfig(BaseModel):
+    """Per-stage execution options declared under ``stages`` in the case manifest."""
+
+    depends_on: Tuple[PredictionStage, ...] = Field(
+        default=(),
+        description="Stages of the same session that must finish before this stage starts.",
+    )
+    gating: bool = Field(
+        default=True,
+        description="Skip dependent stages of the session when this stage fails.",
+    )
+    batching: Optional[BatchingConfig] = Field(
+        default=None,
+        description="Coalesce inputs of concurrent sessions into predict_batch calls.",
+    )
+    executor: ExecutorConfig = Field(default_factory=ExecutorConfig)
+    policy: StagePolicyConfig = Field(default_factory=StagePolicyConfig)
@@ -0,0 +1,142 @@
+"""Execution backends that run stage predictors inline, on threads or in worker processes."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Sequence, Type
+
+from pydantic import BaseModel
+
+from core.domain import CaseConfigurationError, PredictionInput, PredictionOutcome
+from core.interfaces import BasePredictor
+from application.services.config import ExecutorConfig, ExecutorKind
+
+_worker_state = threading.local()
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_worker_state, "loop", None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _worker_state.loop = loop
+    return loop
+
+
+def _call_predict(predictor: BasePredictor, request: PredictionInput) -> PredictionOutcome:
+    return _worker_loop().run_until_complete(predictor.predict(request))
+
+
+def _call_predict_batch(predictor: BasePredictor, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+    return list(_worker_loop().run_until_complete(predictor.predict_batch(requests)))
+
+
+def _init_process_worker(
+    predictor_cls: Type[BasePredictor],
+    config_cls: Type[BaseModel],
+    config_payload: Dict[str, Any],
+) -> None:
+    _worker_state.predictor = predictor_cls(config_cls.model_validate(config_payload))  # type: ignore[call-arg]
+
+
+def _process_predict(request: PredictionInput) -> PredictionOutcome:
+    return _call_predict(_worker_state.predictor, request)
+
+
+def _process_predict_batch(requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+    return _call_predict_batch(_worker_state.predictor, requests)
+
+
+class PredictorExecutor(ABC):
+    """Runs a stage predictor on a particular execution backend."""
+
+    def __init__(self, predictor: BasePredictor) -> None:
+        self.predictor = predictor
+
+    @abstractmethod
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        ...
+
+    @abstractmethod
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        ...
+
+    async def close(self) -> None:
+        return None
+
+
+class InlineExecutor(PredictorExecutor):
+    """Awaits the predictor on the runtime event loop."""
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        return await self.predictor.predict(request)
+
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        return await self.predictor.predict_batch(requests)
+
+
+class _PoolExecutor(PredictorExecutor):
+    _pool: Executor
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._pool.shutdown, True, cancel_futures=True)
+
+
+class ThreadPoolPredictorExecutor(_PoolExecutor):
+    """Runs the shared predictor instance on a thread pool, one event loop per thread."""
+
+    def __init__(self, predictor: BasePredictor, workers: int) -> None:
+        super().__init__(predictor)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{type(predictor).__name__}-worker")
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _call_predict, self.predictor, request)
+
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _call_predict_batch, self.predictor, requests)
+
+
+class ProcessPoolPredictorExecutor(_PoolExecutor):
+    """
+    Dispatches predictions to persistent worker processes.
+
+    Each worker rebuilds the predictor once from its pydantic ``config`` and reuses it for
+    every call, so the predictor class must accept its config as the only constructor
+    argument. Inputs and outcomes are pickled across the process boundary.
+    """
+
+    def __init__(self, predictor: BasePredictor, workers: int) -> None:
+        super().__init__(predictor)
+        config = getattr(predictor, "config", None)
+        if not isinstance(config, BaseModel):
+            raise CaseConfigurationError(
+                f"{type(predictor).__name__} cannot run in a process pool: it has no pydantic 'config' attribute."
+            )
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_process_worker,
+            initargs=(type(predictor), type(config), config.model_dump()),
+        )
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _process_predict, request)
+
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, _process_predict_batch, list(requests))
+
+
+def build_executor(predictor: BasePredictor, config: ExecutorConfig) -> PredictorExecutor:
+    """Create the execution backend declared for a stage."""
+    if config.kind is ExecutorKind.THREAD:
+        return ThreadPoolPredictorExecutor(predictor, config.workers)
+    if config.kind is ExecutorKind.PROCESS:
+        return ProcessPoolPredictorExecutor(predictor, config.workers)
+    return InlineExecutor(predictor)
@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Mapping
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Set, Tuple
 
-from core.domain import PredictionInput, PredictionOutcome, PredictionStage, PredictionConsistencyError
+from core.domain import (
+    CaseConfigurationError,
+    FailureAction,
+    PredictionConsistencyError,
+    PredictionInput,
+    PredictionOutcome,
+    PredictionStage,
+    RetryStrategy,
+    StageDeadlineExceeded,
+    StagePolicy,
+)
 from core.interfaces import BasePredictor
+from application.metrics import Histogram, metrics
+from application.tracing import tracer
+from application.services.batching import MicroBatcher
+from application.services.config import StageConfig, build_stage_policy
+from application.services.executors import PredictorExecutor, build_executor
+
+if TYPE_CHECKING:
+    from application.scheduling import FairScheduler
 
 logger = logging.getLogger(__name__)
 
@@ -18,34 +37,293 @@ class PredictorService:
     """Delegates prediction inputs to stage-specific predictors."""
 
     predictors: Mapping[PredictionStage, BasePredictor] = field(default_factory=dict)
+    stages: Mapping[PredictionStage, StageConfig] = field(default_factory=dict)
+    fallbacks: Dict[str, BasePredictor] = field(default_factory=dict)
+    scheduler: Optional["FairScheduler"] = None
+    _executors: Dict[PredictionStage, PredictorExecutor] = field(default_factory=dict, init=False, repr=False)
+    _batchers: Dict[PredictionStage, MicroBatcher] = field(default_factory=dict, init=False, repr=False)
+    _durations: Dict[Tuple[str, PredictionStage], Histogram] = field(default_factory=dict, init=False, repr=False)
+    _scheduler_waits: Dict[str, Histogram] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._validate_graph()
+        self._policies: Dict[PredictionStage, StagePolicy] = {
+            stage: build_stage_policy(config.policy) for stage, config in self.stages.items()
+        }
 
     def register(self, stage: PredictionStage, predictor: BasePredictor) -> None:
         logger.info("Registered predictor for stage %s: %s", stage, type(predictor).__name__)
         self.predictors[stage] = predictor
+        self._executors.pop(stage, None)
+        self._batchers.pop(stage, None)
+
+    def register_fallback(self, name: str, predictor: BasePredictor) -> None:
+        """Register a predictor that stage policies can fall back to by name."""
+        logger.info("Registered fallback predictor %s: %s", name, type(predictor).__name__)
+        self.fallbacks[name] = predictor
+
+    def policy(self, stage: PredictionStage) -> StagePolicy:
+        return self._policies.get(stage) or StagePolicy()
+
+    def batchers(self) -> Mapping[PredictionStage, MicroBatcher]:
+        """Return micro-batchers created for stages with batching enabled."""
+        return dict(self._batchers)
+
+    async def close(self) -> None:
+        """Stop background batch dispatchers and shut down executor pools."""
+        for batcher in self._batchers.values():
+            await batcher.close()
+        self._batchers.clear()
+        for executor in self._executors.values():
+            await executor.close()
+        self._executors.clear()
+
+    def _executor_for(self, stage: PredictionStage, predictor: BasePredictor) -> PredictorExecutor:
+        executor = self._executors.get(stage)
+        if executor is None:
+            config = self.stages.get(stage) or StageConfig()
+            executor = build_executor(predictor, config.executor)
+            self._executors[stage] = executor
+        return executor
+
+    def _batcher_for(self, stage: PredictionStage, executor: PredictorExecutor) -> MicroBatcher | None:
+        config = self.stages.get(stage)
+        if config is None or config.batching is None:
+            return None
+        batcher = self._batchers.get(stage)
+        if batcher is None:
+            batcher = MicroBatcher(executor, config.batching)
+            self._batchers[stage] = batcher
+        return batcher
+
+    def dependencies(self, stage: PredictionStage) -> Tuple[PredictionStage, ...]:
+        config = self.stages.get(stage)
+        return config.depends_on if config is not None else ()
+
+    def _is_gating(self, stage: PredictionStage) -> bool:
+        config = self.stages.get(stage)
+        return config.gating if config is not None else True
+
+    def _validate_graph(self) -> None:
+        visiting: Set[PredictionStage] = set()
+        visited: Set[PredictionStage] = set()
+
+        def visit(stage: PredictionStage, path: Tuple[PredictionStage, ...]) -> None:
+            if stage in visited:
+                return
+            if stage in visiting:
+                cycle = " -> ".join(item.value for item in (*path, stage))
+                raise CaseConfigurationError(f"Stage dependencies form a cycle: {cycle}")
+            visiting.add(stage)
+            for dependency in self.dependencies(stage):
+                visit(dependency, (*path, stage))
+            visiting.discard(stage)
+            visited.add(stage)
+
+        for stage in self.stages:
+            visit(stage, ())
 
     async def run(self, prediction_input: PredictionInput) -> PredictionOutcome:
         predictor = self.predictors.get(prediction_input.stage)
         if predictor is None:
             raise PredictionConsistencyError(f"No predictor registered for stage {prediction_input.stage}")
-        logger.debug(
-            "Dispatching predictor stage=%s handler=%s session=%s",
-            prediction_input.stage,
-            type(predictor).__name__,
-            prediction_input.data.session_id,
-        )
-        start = time.time()
-        outcome = await predictor.predict(prediction_input)
-        elapsed_ms = (time.time() - start) * 1000.0
+        case_id = prediction_input.data.case_id
+        session_id = prediction_input.data.session_id
+        span_name = f"predict:{prediction_input.stage.value}"
+        if self.scheduler is None:
+            start_ns = time.perf_counter_ns()
+            outcome = await self._run_with_policy(prediction_input, predictor)
+            end_ns = time.perf_counter_ns()
+        else:
+            queued_ns = time.perf_counter_ns()
+            async with self.scheduler.slot(case_id) as wait_ms:
+                start_ns = time.perf_counter_ns()
+                outcome = await self._run_with_policy(prediction_input, predictor)
+                end_ns = time.perf_counter_ns()
+            outcome.metrics["scheduler_wait_ms"] = wait_ms
+            self._scheduler_wait_histogram(case_id).observe(wait_ms)
+            tracer.record("schedule", case_id, session_id, queued_ns, start_ns, stage=prediction_input.stage.value)
+        tracer.record(span_name, case_id, session_id, start_ns, end_ns, success=outcome.success)
+        elapsed_ms = (end_ns - start_ns) / 1_000_000
         if outcome.duration_ms is None:
             outcome.duration_ms = elapsed_ms
         outcome.metrics["duration_ms"] = outcome.duration_ms
         if isinstance(outcome.result, dict):
             outcome.result.setdefault("stage_duration_ms", outcome.duration_ms)
+        self._duration_histogram(case_id, prediction_input.stage).observe(outcome.duration_ms)
+        return outcome
+
+    def _duration_histogram(self, case_id: str, stage: PredictionStage) -> Histogram:
+        histogram = self._durations.get((case_id, stage))
+        if histogram is None:
+            histogram = metrics.histogram("predictor_duration_ms", case=case_id, stage=stage.value)
+            self._durations[(case_id, stage)] = histogram
+        return histogram
+
+    def _scheduler_wait_histogram(self, case_id: str) -> Histogram:
+        histogram = self._scheduler_waits.get(case_id)
+        if histogram is None:
+            histogram = metrics.histogram("scheduler_wait_ms", case=case_id)
+            self._scheduler_waits[case_id] = histogram
+        return histogram
+
+    async def _dispatch(self, prediction_input: PredictionInput, predictor: BasePredictor) -> PredictionOutcome:
+        executor = self._executor_for(prediction_input.stage, predictor)
+        batcher = self._batcher_for(prediction_input.stage, executor)
+        if batcher is not None:
+            return await batcher.submit(prediction_input)
+        return await executor.predict(prediction_input)
+
+    async def _run_with_policy(self, prediction_input: PredictionInput, predictor: BasePredictor) -> PredictionOutcome:
+        """
+        Apply the stage policy: per-call deadline, bounded retries with backoff and fallback.
+
+        ``limited`` retries calls that raise or miss the deadline, ``always`` also retries
+        unsuccessful outcomes. Once attempts are exhausted, the ``fallback`` action runs the
+        named fallback predictor; otherwise the error aborts the session.
+        """
+        policy = self.policy(prediction_input.stage)
+        attempts = 1 if policy.retry_strategy is RetryStrategy.NEVER else max(1, policy.max_attempts)
+        delay = policy.backoff_s
+        failure: BaseException | None = None
+        attempt = 0
+        outcome: PredictionOutcome | None = None
+        for attempt in range(1, attempts + 1):
+            try:
+                outcome = await asyncio.wait_for(self._dispatch(prediction_input, predictor), policy.timeout_s)
+            except asyncio.TimeoutError as exc:
+                failure = exc
+                logger.warning(
+                    "Stage %s missed its %.3fs deadline (attempt %d/%d) session=%s",
+                    prediction_input.stage,
+                    policy.timeout_s,
+                    attempt,
+                    attempts,
+                    prediction_input.data.session_id,
+                )
+            except Exception as exc:  # noqa: BLE001
+                if attempts == 1 and policy.failure_action is not FailureAction.FALLBACK:
+                    raise
+                failure = exc
+                logger.warning(
+                    "Stage %s failed (attempt %d/%d) session=%s: %s",
+                    prediction_input.stage,
+                    attempt,
+                    attempts,
+                    prediction_input.data.session_id,
+                    exc,
+                )
+            else:
+                failure = None
+                if outcome.success or policy.retry_strategy is not RetryStrategy.ALWAYS:
+                    break
+            if attempt < attempts and delay > 0:
+                await asyncio.sleep(delay)
+                delay *= policy.backoff_multiplier
+
+        if failure is None and outcome is not None:
+            if attempts > 1:
+                outcome.metrics["attempts"] = attempt
+            return outcome
+
+        reason = (
+            f"Stage {prediction_input.stage.value} missed its {policy.timeout_s}s deadline"
+            if isinstance(failure, asyncio.TimeoutError)
+            else f"Stage {prediction_input.stage.value} failed: {failure}"
+        )
+        if policy.failure_action is FailureAction.FALLBACK and policy.fallback_predictor:
+            fallback = self.fallbacks.get(policy.fallback_predictor)
+            if fallback is None:
+                raise PredictionConsistencyError(f"Fallback predictor {policy.fallback_predictor!r} is not registered")
+            try:
+                outcome = await asyncio.wait_for(fallback.predict(prediction_input), policy.timeout_s)
+            except asyncio.TimeoutError as exc:
+                raise StageDeadlineExceeded(
+                    f"{reason}; fallback {policy.fallback_predictor!r} missed it as well"
+                ) from exc
+            outcome.metrics["attempts"] = attempt
+            outcome.metrics["fallback_predictor"] = policy.fallback_predictor
+            outcome.metrics["fallback_reason"] = reason
+            return outcome
+        if isinstance(failure, asyncio.TimeoutError):
+            raise StageDeadlineExceeded(f"{reason} after {attempt} attempt(s)") from failure
+        assert failure is not None
+        raise failure
+
+    async def run_graph(
+        self,
+        prediction_inputs: Sequence[PredictionInput],
+    ) -> AsyncIterator[Tuple[PredictionInput, PredictionOutcome]]:
+        """
+        Run the inputs of one session following the declared stage dependencies.
+
+        Inputs whose dependencies are satisfied run concurrently and outcomes are yielded
+        in completion order. Dependencies on stages absent from the session are ignored.
+        When a gating dependency fails, the dependent stage is skipped and reported as a
+        failed outcome without calling its predictor.
+        """
+        pending: List[PredictionInput] = list(prediction_inputs)
+        remaining: Dict[PredictionStage, int] = {}
+        for prediction_input in pending:
+            remaining[prediction_input.stage] = remaining.get(prediction_input.stage, 0) + 1
+        failed: Set[PredictionStage] = set()
+        running: Dict[asyncio.Task, PredictionInput] = {}
+
+        def finish(stage: PredictionStage, success: bool) -> None:
+            remaining[stage] -= 1
+            if not success:
+                failed.add(stage)
+
+        try:
+            while pending or running:
+                ready: List[PredictionInput] = []
+                blocked: List[Tuple[PredictionInput, PredictionStage]] = []
+                waiting: List[PredictionInput] = []
+                for prediction_input in pending:
+                    dependencies = [stage for stage in self.dependencies(prediction_input.stage) if stage in remaining]
+                    if any(remaining[stage] for stage in dependencies):
+                        waiting.append(prediction_input)
+                        continue
+                    blocker = next((stage for stage in dependencies if stage in failed and self._is_gating(stage)), None)
+                    if blocker is None:
+                        ready.append(prediction_input)
+                    else:
+                        blocked.append((prediction_input, blocker))
+                pending = waiting
+
+                for prediction_input in ready:
+                    running[asyncio.create_task(self.run(prediction_input))] = prediction_input
+                for prediction_input, blocker in blocked:
+                    finish(prediction_input.stage, False)
+                    yield prediction_input, self._skipped_outcome(prediction_input, blocker)
+                if blocked:
+                    continue
+                if not running:
+                    raise PredictionConsistencyError("Stage dependencies cannot be satisfied for the session inputs.")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    prediction_input = running.pop(task)
+                    outcome = task.result()
+                    finish(prediction_input.stage, outcome.success)
+                    yield prediction_input, outcome
+        finally:
+            for task in running:
+                task.cancel()
+
+    @staticmethod
+    def _skipped_outcome(prediction_input: PredictionInput, blocker: PredictionStage) -> PredictionOutcome:
         logger.debug(
-            "Predictor stage=%s completed success=%s duration=%.2fms session=%s",
+            "Skipping stage=%s session=%s: upstream stage %s failed",
             prediction_input.stage,
-            outcome.success,
-            outcome.duration_ms,
             prediction_input.data.session_id,
+            blocker,
+        )
+        outcome = PredictionOutcome.failure_result(
+            stage=prediction_input.stage,
+            errors=(f"Skipped: upstream stage {blocker.value} failed",),
+            result={"skipped": True, "blocked_by": blocker.value},
+            duration_ms=0.0,
         )
+        outcome.metrics["skipped"] = True
         return outcome
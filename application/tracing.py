@@ -0,0 +1,138 @@
+"""Per-session span tracing on the monotonic clock with Chrome trace-event export."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Span:
+    """Timed hop of one session; timestamps come from ``time.perf_counter_ns``."""
+
+    name: str
+    case_id: str
+    session_id: str
+    start_ns: int
+    end_ns: int
+    attributes: Mapping[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+class Tracer:
+    """
+    Collects spans keyed by session id in a bounded in-memory ring.
+
+    Recording is a no-op while ``enabled`` is false. ``begin_session`` remembers when the
+    session's frame batch was created so later hops can compute end-to-end frame age.
+    """
+
+    def __init__(self, *, enabled: bool = False, max_spans: int = 100_000, max_sessions: int = 10_000) -> None:
+        self.enabled = enabled
+        self.max_sessions = max_sessions
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._origins: "OrderedDict[str, int]" = OrderedDict()
+
+    def begin_session(self, case_id: str, session_id: str, origin_ns: int) -> None:
+        if not self.enabled:
+            return
+        self._origins[session_id] = origin_ns
+        self._origins.move_to_end(session_id)
+        while len(self._origins) > self.max_sessions:
+            self._origins.popitem(last=False)
+
+    def record(
+        self,
+        name: str,
+        case_id: str,
+        session_id: str,
+        start_ns: int,
+        end_ns: Optional[int] = None,
+        **attributes: Any,
+    ) -> None:
+        if not self.enabled:
+            return
+        self._spans.append(
+            Span(
+                name=name,
+                case_id=str(case_id),
+                session_id=str(session_id),
+                start_ns=start_ns,
+                end_ns=time.perf_counter_ns() if end_ns is None else end_ns,
+                attributes=attributes,
+            )
+        )
+
+    def frame_age_ns(self, session_id: str, now_ns: Optional[int] = None) -> Optional[int]:
+        """Time elapsed since the session's frame batch was created, if it is still tracked."""
+        origin = self._origins.get(session_id)
+        if origin is None:
+            return None
+        return (time.perf_counter_ns() if now_ns is None else now_ns) - origin
+
+    def spans(self, session_id: Optional[str] = None) -> List[Span]:
+        if session_id is None:
+            return list(self._spans)
+        return [span for span in self._spans if span.session_id == session_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+        self._origins.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Render spans as Chrome trace events (``chrome://tracing``, Perfetto).
+
+        Each case becomes a process and each session a thread, so the hops of one session
+        line up on a single track.
+        """
+        spans = sorted(self._spans, key=lambda span: span.start_ns)
+        base_ns = spans[0].start_ns if spans else 0
+        pids: Dict[str, int] = {}
+        tids: Dict[Tuple[str, str], int] = {}
+        events: List[Dict[str, Any]] = []
+        for span in spans:
+            pid = pids.get(span.case_id)
+            if pid is None:
+                pid = pids[span.case_id] = len(pids) + 1
+                events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": span.case_id}})
+            tid = tids.get((span.case_id, span.session_id))
+            if tid is None:
+                tid = tids[(span.case_id, span.session_id)] = len(tids) + 1
+                events.append(
+                    {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": span.session_id}}
+                )
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(":", 1)[0],
+                    "ph": "X",
+                    "ts": (span.start_ns - base_ns) / 1000.0,
+                    "dur": (span.end_ns - span.start_ns) / 1000.0,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {key: _json_safe(value) for key, value in span.attributes.items()},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+        return path
+
+
+def _json_safe(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+tracer = Tracer()
@@ -0,0 +1 @@
+"""Microbenchmarks for hot paths of the framework (run as ``python -m benchmarks.<name>``)."""
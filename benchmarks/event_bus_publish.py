@@ -0,0 +1,89 @@
+"""Per-event publish overhead of the in-memory event bus."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+from core.domain import CaseId, DomainEvent, FrameBatch, FrameBatchReceived, PredictionCompleted, SessionId
+from infrastructure.events.memory_bus import InMemoryEventBus
+
+CASE = CaseId("bench")
+BATCH = FrameBatch(session_id=SessionId("bench-0000"), frames=())
+
+
+async def _publish_loop(bus: InMemoryEventBus, events: int) -> float:
+    event = FrameBatchReceived(case_id=CASE, batch=BATCH)
+    start = time.perf_counter_ns()
+    for _ in range(events):
+        await bus.publish(event)
+    return (time.perf_counter_ns() - start) / events
+
+
+async def no_subscribers(events: int) -> float:
+    bus = InMemoryEventBus()
+    return await _publish_loop(bus, events)
+
+
+async def other_type_subscribed(events: int) -> float:
+    bus = InMemoryEventBus()
+    stream = bus.subscribe(PredictionCompleted)
+    waiter = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    try:
+        return await _publish_loop(bus, events)
+    finally:
+        waiter.cancel()
+
+
+async def subscribers(events: int, count: int, event_type: type = FrameBatchReceived) -> float:
+    bus = InMemoryEventBus()
+    streams = [bus.subscribe(event_type, max_size=0) for _ in range(count)]
+    waiters = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    try:
+        return await _publish_loop(bus, events)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def per_case_subscribers(events: int, cases: int) -> float:
+    """Subscribers filtered on other cases: the published events concern none of them."""
+    bus = InMemoryEventBus()
+    streams = [bus.subscribe(FrameBatchReceived, max_size=0, case_id=CaseId(f"other-{index}")) for index in range(cases)]
+    waiters = [asyncio.ensure_future(stream.__anext__()) for stream in streams]
+    await asyncio.sleep(0)
+    try:
+        return await _publish_loop(bus, events)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+def _best_of(repeats: int, scenario: Callable[[], float]) -> float:
+    return min(scenario() for _ in range(repeats))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    scenarios = {
+        "no subscribers": lambda: asyncio.run(no_subscribers(args.events)),
+        "other type subscribed": lambda: asyncio.run(other_type_subscribed(args.events)),
+        "1 subscriber": lambda: asyncio.run(subscribers(args.events, 1)),
+        "4 subscribers": lambda: asyncio.run(subscribers(args.events, 4)),
+        "1 catch-all subscriber": lambda: asyncio.run(subscribers(args.events, 1, DomainEvent)),
+        "32 other-case subscribers": lambda: asyncio.run(per_case_subscribers(args.events, 32)),
+    }
+    for name, scenario in scenarios.items():
+        print(f"{name:>24}: {_best_of(args.repeats, scenario):8.0f} ns/event")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Throughput and latency of the socket broker bus against the in-memory bus.
+
+The socket scenario publishes from a separate process. Latency compares the event's
+``occurred_ns`` with the receive time, which is only meaningful because
+``perf_counter_ns`` reads the system-wide monotonic clock on Linux.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from core.domain import CaseId, PredictionCompleted, PredictionOutcome, PredictionStage, SessionId
+from core.interfaces import IEventBus
+from infrastructure.events import EventBroker, InMemoryEventBus, SocketEventBus
+
+CASE = CaseId("bench")
+
+
+def _event(index: int) -> PredictionCompleted:
+    outcome = PredictionOutcome.success_result(
+        stage=PredictionStage.ANALYTICS,
+        result={"score": 0.5, "frame": index},
+        metrics={"duration_ms": 1.0},
+    )
+    return PredictionCompleted(case_id=CASE, session_id=SessionId(f"bench-{index:06d}"), outcome=outcome)
+
+
+async def _publish(bus: IEventBus, events: int, rate: float) -> None:
+    interval = 1.0 / rate if rate else 0.0
+    for index in range(events):
+        await bus.publish(_event(index))
+        if interval:
+            await asyncio.sleep(interval)
+        elif index % 256 == 255:
+            await asyncio.sleep(0)
+
+
+async def _consume(bus: IEventBus, events: int) -> Tuple[float, List[int]]:
+    latencies: List[int] = []
+    first_ns = 0
+    async for batch in bus.subscribe_batch(PredictionCompleted, max_items=256, max_wait=0.0, max_size=0):
+        now = time.perf_counter_ns()
+        first_ns = first_ns or now
+        latencies.extend(now - event.occurred_ns for event in batch)
+        if len(latencies) >= events:
+            break
+    elapsed = (time.perf_counter_ns() - first_ns) / 1e9
+    return events / elapsed if elapsed else float("inf"), latencies
+
+
+async def in_memory(events: int, rate: float) -> Tuple[float, List[int]]:
+    bus = InMemoryEventBus()
+    consumer = asyncio.create_task(_consume(bus, events))
+    await asyncio.sleep(0)
+    await _publish(bus, events, rate)
+    return await consumer
+
+
+def _publisher_process(address: str, events: int, rate: float) -> None:
+    async def run() -> None:
+        async with SocketEventBus(address) as bus:
+            await _publish(bus, events, rate)
+            await bus.flush()
+
+    asyncio.run(run())
+
+
+async def over_socket(events: int, rate: float) -> Tuple[float, List[int]]:
+    address = str(Path(tempfile.mkdtemp()) / "broker.sock")
+    async with EventBroker(address), SocketEventBus(address) as bus:
+        consumer = asyncio.create_task(_consume(bus, events))
+        await asyncio.sleep(0.05)
+        process = multiprocessing.get_context("spawn").Process(target=_publisher_process, args=(address, events, rate))
+        process.start()
+        try:
+            return await consumer
+        finally:
+            await asyncio.to_thread(process.join)
+
+
+def _report(name: str, throughput: float, latencies: List[int]) -> None:
+    ordered = sorted(latencies)
+    p50 = ordered[len(ordered) // 2] / 1000
+    p99 = ordered[int(len(ordered) * 0.99)] / 1000
+    print(f"{name:>22}: {throughput:10.0f} events/s  p50 {p50:8.1f} us  p99 {p99:8.1f} us  mean {statistics.fmean(ordered) / 1000:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Paced publish rate for the latency runs.")
+    args = parser.parse_args()
+
+    _report("in-memory, saturated", *asyncio.run(in_memory(args.events, 0)))
+    _report("socket, saturated", *asyncio.run(over_socket(args.events, 0)))
+    paced = min(args.events, int(args.rate * 2))
+    _report(f"in-memory, {args.rate:.0f}/s", *asyncio.run(in_memory(paced, args.rate)))
+    _report(f"socket, {args.rate:.0f}/s", *asyncio.run(over_socket(paced, args.rate)))
+
+
+if __name__ == "__main__":
+    main()
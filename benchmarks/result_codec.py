@@ -0,0 +1,63 @@
+"""Encoded size and encode/decode time of prediction results per result codec."""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from infrastructure.codecs import BinaryResultCodec, JsonResultCodec
+
+
+def _samples() -> Dict[str, Any]:
+    # The JSON codec stores arrays as ``str()``, which numpy abbreviates past 1000 items, so its
+    # depth map payload is small but lossy.
+    rng = np.random.default_rng(0)
+    return {
+        "analytics": {
+            "mean": 127.5,
+            "status": "ok",
+            "channels": {
+                name: {"mean": float(value), "min": 0.0, "max": 255.0} for name, value in zip("rgb", rng.random(3))
+            },
+            "histogram": [float(value) for value in rng.random(256)],
+        },
+        "detections": {
+            "boxes": rng.random((100, 4), dtype=np.float32),
+            "scores": rng.random(100, dtype=np.float32),
+            "labels": [f"class_{index % 20}" for index in range(100)],
+        },
+        "classification": {"probabilities": rng.random(1000, dtype=np.float32), "top1": 17},
+        "depth map": {"depth": rng.random((120, 160), dtype=np.float32)},
+    }
+
+
+def _best_ms(call: Callable[[], Any], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    for sample, result in _samples().items():
+        for codec in (JsonResultCodec(), BinaryResultCodec()):
+            payload = codec.encode(result)
+            encode_ms = _best_ms(lambda: codec.encode(result), args.repeats)
+            decode_ms = _best_ms(lambda: codec.decode(payload), args.repeats)
+            print(
+                f"{sample:>14} {codec.name:>6}: {len(payload):9d} bytes,"
+                f" encode {encode_ms:7.3f} ms, decode {decode_ms:7.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
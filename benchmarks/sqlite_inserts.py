@@ -0,0 +1,76 @@
+"""Prediction-outcome inserts per second through the SQLite repository paths."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List, Tuple
+
+from core.domain import PredictionOutcome, PredictionStage, SessionId
+from infrastructure.repositories.factory import create_sqlite_uow
+from infrastructure.repositories.sqlite.facade import SqliteRepositoryFacade
+
+Items = List[Tuple[SessionId, PredictionOutcome]]
+
+
+def _items(count: int) -> Items:
+    return [
+        (
+            SessionId(f"bench-{index:06d}"),
+            PredictionOutcome.success_result(
+                stage=PredictionStage.ANALYTICS,
+                result={"mean": 127.5, "status": "ok"},
+                metrics={"duration_ms": 1.25, "queue_age_ms": 0.5},
+                duration_ms=1.25,
+            ),
+        )
+        for index in range(count)
+    ]
+
+
+async def unit_of_work_per_outcome(db_path: Path, items: Items, batch: int) -> None:
+    """The previous facade: a fresh connection, schema check and commit for every outcome."""
+    for session_id, outcome in items:
+        async with create_sqlite_uow(db_path) as uow:
+            await uow.repository.save_prediction_outcome(session_id, outcome)
+
+
+async def pooled(db_path: Path, items: Items, batch: int) -> None:
+    repository = SqliteRepositoryFacade(db_path=db_path)
+    try:
+        for start in range(0, len(items), batch):
+            await repository.save_prediction_outcomes(items[start : start + batch])
+    finally:
+        await repository.close()
+
+
+def _run(scenario: Callable[[Path, Items, int], Awaitable[None]], count: int, batch: int) -> float:
+    items = _items(count)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = Path(directory) / "bench.sqlite"
+        start = time.perf_counter()
+        asyncio.run(scenario(db_path, items, batch))
+        return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outcomes", type=int, default=2_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios = {
+        "unit of work per outcome": (unit_of_work_per_outcome, 1),
+        "pooled, 1 per commit": (pooled, 1),
+        "pooled, 64 per commit": (pooled, 64),
+    }
+    for name, (scenario, batch) in scenarios.items():
+        best = max(_run(scenario, args.outcomes, batch) for _ in range(args.repeats))
+        print(f"{name:>26}: {best:10.0f} inserts/s")
+
+
+if __name__ == "__main__":
+    main()
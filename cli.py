@@ -7,6 +7,7 @@ import asyncio
 import logging
 import contextlib
 import sys
+from pathlib import Path
 from typing import Mapping, Sequence
 
 from application import create_runtime
@@ -41,6 +42,13 @@ def build_parser() -> argparse.ArgumentParser:
         metavar="CASE:KEY=VALUE",
         help="Attach metadata key/value to case handler (can be repeated).",
     )
+    run_parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Trace every session and write a Chrome trace-event JSON file on shutdown.",
+    )
 
     subparsers.add_parser("version", help="Display CLI version information.")
 
@@ -97,8 +105,9 @@ async def _run_case(
     *,
     device_serials: Mapping[str, str] | None = None,
     metadata: Mapping[str, Mapping[str, object]] | None = None,
+    trace_path: Path | None = None,
 ) -> None:
-    runtime = await create_runtime(device_serials=device_serials, metadata=metadata)
+    runtime = await create_runtime(device_serials=device_serials, metadata=metadata, trace_path=trace_path)
     case_manager = runtime.case_manager
     case_id_obj = CaseId(case_id)
     try:
@@ -154,6 +163,7 @@ def main(argv: Sequence[str] | None = None) -> int:
                 duration=args.duration,
                 device_serials=device_serials or None,
                 metadata=metadata or None,
+                trace_path=args.trace,
             )
         )
         return 0
@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal, Optional
 
-from pydantic import field_validator
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,6 +21,75 @@ class AppSettings(BaseSettings):
     artifacts_root: Path = Path("artifacts")
     data_root: Path = Path("data")
     database_path: Path = Path("data/db.sqlite")
+    database_readers: int = Field(default=2, ge=0, description="Read-only SQLite connections kept next to the writer.")
+    database_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = Field(
+        default="NORMAL", description="SQLite synchronous pragma; NORMAL is durable across crashes in WAL mode."
+    )
+    database_retention_days: int = Field(
+        default=0, ge=0, description="Days of outcomes kept in the day-partitioned database; 0 keeps everything."
+    )
+    database_maintenance_interval_s: float = Field(
+        default=3600.0, gt=0, description="Interval between retention and incremental-vacuum runs."
+    )
+    database_vacuum_pages: int = Field(
+        default=0, ge=0, description="Free pages released per maintenance run; 0 releases all of them."
+    )
+    result_codec: Literal["binary", "json"] = Field(
+        default="binary", description="Encoding of prediction results in the database and result artifacts."
+    )
+    scheduler_slots: int = Field(default=8, ge=1, description="Prediction slots shared by all active cases.")
+    frame_store_slots: int = Field(
+        default=0, ge=0, description="Preallocated frame buffers shared by handlers and predictors; 0 disables the store."
+    )
+    frame_store_slot_kb: int = Field(default=1024, ge=1, description="Size of one frame-store buffer.")
+    event_queue_size: int = Field(
+        default=1024, ge=0, description="Default bound of every event-bus subscription queue; 0 is unbounded."
+    )
+    event_broker: Optional[str] = Field(
+        default=None,
+        description="Unix socket path or tcp://host:port (loopback only) of an event broker hosted by the runtime for other processes.",
+    )
+    event_journal_dir: Optional[Path] = Field(
+        default=None, description="Directory of the durable event journal; persistence resumes from it after a restart."
+    )
+    event_journal_segment_mb: int = Field(default=64, ge=1, description="Size at which a journal segment is rolled over.")
+    event_journal_fsync_ms: float = Field(default=10.0, ge=0, description="Group-commit window of journal fsyncs.")
+    persistence_batch_size: int = Field(default=64, ge=1, description="Outcomes persisted per batch at most.")
+    persistence_batch_wait_ms: float = Field(
+        default=50.0, ge=0, description="How long the persistence consumer waits to fill a batch."
+    )
+    persistence_concurrency: int = Field(
+        default=4, ge=1, description="Persistence workers; outcomes of one session always go to the same worker."
+    )
+    persistence_queue_size: int = Field(
+        default=16, ge=1, description="Per-session outcome batches queued in front of each persistence worker."
+    )
+    persistence_flush_size: int = Field(
+        default=256, ge=1, description="Outcomes that make the bulk writer commit immediately."
+    )
+    persistence_flush_interval_ms: float = Field(
+        default=50.0, ge=0, description="Longest time an outcome waits in the bulk writer before a commit."
+    )
+    persistence_max_pending: int = Field(
+        default=4096, ge=1, description="Outcomes buffered by the bulk writer before submitters wait."
+    )
+    persistence_flush_attempts: int = Field(
+        default=3, ge=1, description="Attempts at committing one bulk-writer batch before its outcomes are dropped."
+    )
+    persistence_flush_backoff_ms: float = Field(
+        default=50.0, ge=0, description="Pause before retrying a failed commit; doubled on every further retry."
+    )
+    session_timeout_s: float = Field(
+        default=5.0,
+        ge=0,
+        description="How long a session's outcomes wait for its remaining stages; 0 stores outcomes without session records.",
+    )
+    metrics_log_interval_s: float = Field(
+        default=30.0, ge=0, description="Period of the runtime metrics summary log; 0 disables it."
+    )
+    trace_path: Optional[Path] = Field(
+        default=None, description="Enables session tracing and receives the Chrome trace on shutdown."
+    )
 
     @staticmethod
     def _resolve(path: Path) -> Path:
@@ -51,5 +121,13 @@ class AppSettings(BaseSettings):
     def database_file(self) -> Path:
         return self._resolve(self.database_path)
 
+    @property
+    def event_journal_path(self) -> Optional[Path]:
+        return self._resolve(self.event_journal_dir) if self.event_journal_dir is not None else None
+
+    @property
+    def trace_file(self) -> Optional[Path]:
+        return self._resolve(self.trace_path) if self.trace_path is not None else None
+
 
 settings = AppSettings()
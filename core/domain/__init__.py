@@ -1,7 +1,16 @@
 """Domain layer constructs."""
 
-from core.domain.data_models import BasePredictionData, FrameBatch, FramePayload, PredictionInput, PredictionOutcome, PredictionStage
-from core.domain.errors import CaseConfigurationError, DomainError, PredictionConsistencyError
+from core.domain.data_models import (
+    BasePredictionData,
+    FrameBatch,
+    FramePayload,
+    PredictionInput,
+    PredictionOutcome,
+    PredictionStage,
+    StoredOutcome,
+    StoredSession,
+)
+from core.domain.errors import CaseConfigurationError, DomainError, PredictionConsistencyError, StageDeadlineExceeded
 from core.domain.events import (
     CaseActivated,
     DomainEvent,
@@ -9,9 +18,11 @@ from core.domain.events import (
     PredictionCompleted,
     PredictionFailed,
     PredictionStarted,
+    SessionCompleted,
     SessionFailed,
+    SessionPredicted,
 )
-from core.domain.policies import FailureAction, RetryStrategy, StagePolicy, StoragePolicy
+from core.domain.policies import FailureAction, OverflowPolicy, RetryStrategy, StagePolicy, StoragePolicy
 from core.domain.use_cases import AsyncUseCase, UseCase
 from core.domain.value_objects import ArtifactRef, CaseId, ChannelKey, PredictionId, SessionId, TimestampedValue
 
@@ -22,9 +33,12 @@ __all__ = [
     "PredictionInput",
     "PredictionOutcome",
     "PredictionStage",
+    "StoredOutcome",
+    "StoredSession",
     "DomainError",
     "PredictionConsistencyError",
     "CaseConfigurationError",
+    "StageDeadlineExceeded",
     "DomainEvent",
     "CaseActivated",
     "FrameBatchReceived",
@@ -32,7 +46,10 @@ __all__ = [
     "PredictionCompleted",
     "PredictionFailed",
     "SessionFailed",
+    "SessionPredicted",
+    "SessionCompleted",
     "FailureAction",
+    "OverflowPolicy",
     "RetryStrategy",
     "StoragePolicy",
     "StagePolicy",
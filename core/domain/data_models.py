@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence
+from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from core.domain.value_objects import ArtifactRef, CaseId, ChannelKey, PredictionId, SessionId
 
 
 @dataclass(frozen=True)
 class FramePayload:
-    """Single frame or message coming from a handler."""
+    """
+    Single frame or message coming from a handler.
+
+    ``content`` is either the data itself or a handle into a frame store that resolves to
+    a read-only array through ``np.asarray``.
+    """
 
     channel: ChannelKey
     content: Any
@@ -27,6 +33,7 @@ class FrameBatch:
     session_id: SessionId
     frames: Sequence[FramePayload]
     metadata: Mapping[str, Any] = field(default_factory=dict)
+    created_ns: int = field(default_factory=time.perf_counter_ns, compare=False)
 
     def by_channel(self) -> Dict[ChannelKey, FramePayload]:
         """Return a mapping channel -> payload for quick lookup."""
@@ -123,3 +130,38 @@ class PredictionOutcome:
             errors=tuple(errors),
             duration_ms=duration_ms,
         )
+
+
+@dataclass(frozen=True)
+class StoredOutcome:
+    """Prediction outcome read back from the repository together with its keys."""
+
+    prediction_id: PredictionId
+    case_id: Optional[CaseId]
+    session_id: SessionId
+    created_at: datetime
+    outcome: PredictionOutcome
+
+
+@dataclass(frozen=True)
+class StoredSession:
+    """
+    Combined record of one session read back from the repository.
+
+    ``prediction_ids`` are the outcomes written with the record, in the order of ``completed``.
+    Stages in ``missing`` had not reported when the session timed out.
+    """
+
+    record_id: int
+    case_id: Optional[CaseId]
+    session_id: SessionId
+    created_at: datetime
+    completed: Tuple[PredictionStage, ...]
+    failed: Tuple[PredictionStage, ...] = ()
+    missing: Tuple[PredictionStage, ...] = ()
+    prediction_ids: Tuple[PredictionId, ...] = ()
+    timed_out: bool = False
+
+    @property
+    def complete(self) -> bool:
+        return not self.timed_out
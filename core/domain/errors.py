@@ -10,3 +10,7 @@ class PredictionConsistencyError(DomainError):
 
 class CaseConfigurationError(DomainError):
     """Raised when the case manifest is invalid or incomplete."""
+
+
+class StageDeadlineExceeded(DomainError):
+    """Raised when a stage misses its deadline and no fallback is configured."""
@@ -2,25 +2,45 @@
 
 from __future__ import annotations
 
+import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Mapping, Optional, Sequence
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
 from core.domain.data_models import FrameBatch, PredictionOutcome, PredictionStage
-from core.domain.value_objects import CaseId, SessionId
+from core.domain.value_objects import CaseId, PredictionId, SessionId
+
+
+# Identifies this process run; events relayed from another process or replayed after a
+# restart carry a different one, and their ``occurred_ns`` is from another clock reading.
+_PROCESS_ORIGIN = uuid.uuid4().int >> 64
+
+
+def _process_origin() -> int:
+    return _PROCESS_ORIGIN
 
 
 @dataclass(frozen=True)
 class DomainEvent:
-    """Base event with timestamp metadata."""
+    """Base event with wall-clock and monotonic timestamps."""
 
     occurred_at: datetime = field(default_factory=datetime.utcnow, init=False)
+    occurred_ns: int = field(default_factory=time.perf_counter_ns, init=False, compare=False)
+    origin: int = field(default_factory=_process_origin, init=False, compare=False, repr=False)
+
+    @property
+    def local(self) -> bool:
+        """Whether the event was created by this process run, so ``occurred_ns`` is comparable."""
+        return self.origin == _PROCESS_ORIGIN
 
 
 @dataclass(frozen=True)
 class CaseActivated(DomainEvent):
     case_id: CaseId
     manifest_hash: Optional[str] = None
+    # Stages every session of the case runs through.
+    stages: Tuple[PredictionStage, ...] = ()
 
 
 @dataclass(frozen=True)
@@ -52,9 +72,31 @@ class PredictionFailed(DomainEvent):
     errors: Sequence[str]
 
 
+@dataclass(frozen=True)
+class SessionPredicted(DomainEvent):
+    """Every outcome of a session has been produced; ``stages`` holds the stage of each, skipped ones included."""
+
+    case_id: CaseId
+    session_id: SessionId
+    stages: Tuple[PredictionStage, ...]
+
+
 @dataclass(frozen=True)
 class SessionFailed(DomainEvent):
     case_id: CaseId
     session_id: SessionId
     reason: str
     details: Optional[Mapping[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class SessionCompleted(DomainEvent):
+    """All outcomes of a session are stored; ``missing`` stages had not reported when it timed out."""
+
+    case_id: Optional[CaseId]
+    session_id: SessionId
+    completed: Tuple[PredictionStage, ...]
+    failed: Tuple[PredictionStage, ...] = ()
+    missing: Tuple[PredictionStage, ...] = ()
+    prediction_ids: Tuple[PredictionId, ...] = ()
+    timed_out: bool = False
@@ -25,9 +25,22 @@ class StoragePolicy(str, Enum):
     PERSIST = "persist"
 
 
+class OverflowPolicy(str, Enum):
+    """What a bounded buffer does with a new item when it is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    KEEP_LATEST = "keep_latest"
+    DECIMATE = "decimate"
+
+
 @dataclass
 class StagePolicy:
     max_attempts: int = 1
     retry_strategy: RetryStrategy = RetryStrategy.NEVER
     failure_action: FailureAction = FailureAction.ABORT_SESSION
     fallback_predictor: Optional[str] = None
+    timeout_s: Optional[float] = None
+    backoff_s: float = 0.0
+    backoff_multiplier: float = 2.0
@@ -1,13 +1,24 @@
 """Interface definitions for the framework."""
 
-from core.interfaces.events import IEventBus
+from core.interfaces.codecs import IResultCodec
+from core.interfaces.events import IEventBus, SubscriptionStats
 from core.interfaces.predictors import BaseAnalyticsPredictor, BasePredictor, BaseValidationPredictor
-from core.interfaces.repositories import IArtifactStorage, IFileStorage, IRepositoryDB, IUnitOfWork
+from core.interfaces.repositories import (
+    IArtifactStorage,
+    IFileStorage,
+    IRepositoryDB,
+    IUnitOfWork,
+    MeasurementRows,
+    MeasurementSchema,
+    OutcomeItem,
+    SessionRecord,
+)
 from core.interfaces.streams import (
     BaseStreamHandler,
     ChannelSpec,
     IDeviceProbe,
     IFrameMuxer,
+    IFrameStore,
     IMultiChannelFrame,
     IStreamHandler,
     StreamDescriptor,
@@ -18,6 +29,7 @@ __all__ = [
     "ChannelSpec",
     "IStreamHandler",
     "IFrameMuxer",
+    "IFrameStore",
     "IMultiChannelFrame",
     "IDeviceProbe",
     "StreamDescriptor",
@@ -25,8 +37,14 @@ __all__ = [
     "BaseValidationPredictor",
     "BaseAnalyticsPredictor",
     "IRepositoryDB",
+    "OutcomeItem",
+    "MeasurementRows",
+    "MeasurementSchema",
+    "SessionRecord",
     "IUnitOfWork",
     "IFileStorage",
     "IArtifactStorage",
+    "IResultCodec",
     "IEventBus",
+    "SubscriptionStats",
 ]
@@ -0,0 +1,21 @@
+"""Serialization contracts for prediction results."""
+
+from __future__ import annotations
+
+from typing import Any, Protocol
+
+
+class IResultCodec(Protocol):
+    """Turns prediction results into bytes for the database and result artifacts, and back."""
+
+    name: str
+    media_type: str
+    file_extension: str
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize ``value``; unsupported objects degrade to their ``str()`` form."""
+        ...
+
+    def decode(self, payload: bytes) -> Any:
+        """Restore a value produced by ``encode``."""
+        ...
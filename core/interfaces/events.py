@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Generic, TypeVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Generic, List, Optional, Sequence, TypeVar
 
+from core.domain.data_models import PredictionStage
 from core.domain.events import DomainEvent
+from core.domain.policies import OverflowPolicy
+from core.domain.value_objects import CaseId
 
 TEvent = TypeVar("TEvent", bound=DomainEvent)
 
 
+@dataclass(frozen=True)
+class SubscriptionStats:
+    """Queue occupancy and delivery counters of one subscription."""
+
+    event_type: str
+    max_size: int
+    overflow: OverflowPolicy
+    depth: int
+    delivered: int
+    dropped: int
+
+
 class IEventBus(ABC, Generic[TEvent]):
     """Pub-sub event bus contract."""
 
@@ -18,5 +35,58 @@ class IEventBus(ABC, Generic[TEvent]):
         ...
 
     @abstractmethod
-    async def subscribe(self, event_type: type[TEvent]) -> AsyncIterator[TEvent]:
+    async def subscribe(
+        self,
+        event_type: type[TEvent],
+        *,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TEvent]:
+        """
+        Yield published events of ``event_type`` and its subclasses.
+
+        ``max_size`` bounds the subscription queue (``0`` means unbounded, ``None`` the bus
+        default); ``overflow`` decides what a full queue does to the publisher. ``case_id``,
+        ``stage`` and ``session_prefix`` restrict delivery to matching events; events that
+        lack a filtered attribute never match. The subscription is registered when iteration
+        starts; ``ready`` is set at that point, after which published events reach it.
+        """
+        ...
+
+    @abstractmethod
+    async def subscribe_batch(
+        self,
+        event_type: type[TEvent],
+        *,
+        max_items: int = 64,
+        max_wait: float = 0.05,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        until: Optional[asyncio.Event] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[List[TEvent]]:
+        """
+        Yield lists of published events of ``event_type`` and its subclasses.
+
+        A list is yielded once it holds ``max_items`` events or ``max_wait`` seconds after
+        its first event arrived, whichever comes first; it is never empty. Queue bounds and
+        filters behave as in ``subscribe``. Once ``until`` is set, the events still queued
+        are yielded without waiting and the iterator ends, so nothing it received is lost.
+        ``ready`` behaves as in ``subscribe``.
+        """
         ...
+
+    def subscription_stats(self) -> Sequence[SubscriptionStats]:
+        """Return per-subscription queue statistics, if the bus tracks them."""
+        return ()
+
+    async def close(self) -> None:
+        """Release transport resources; in-process buses have none."""
+        return None
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Sequence
 
 from core.domain.data_models import PredictionInput, PredictionOutcome, PredictionStage
 
@@ -17,6 +17,18 @@ class BasePredictor(ABC):
     async def predict(self, request: PredictionInput) -> PredictionOutcome:
         """Run prediction for the given input."""
 
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        """Run prediction for several inputs, returning outcomes in input order.
+
+        Predictors that can amortize per-call overhead override this method; the default
+        simply calls :meth:`predict` for every request.
+        """
+        return [await self.predict(request) for request in requests]
+
+    @property
+    def supports_batching(self) -> bool:
+        return type(self).predict_batch is not BasePredictor.predict_batch
+
 
 class BaseValidationPredictor(BasePredictor, ABC):
     stage = PredictionStage.VALIDATION
@@ -3,10 +3,51 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Protocol
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Protocol, Sequence, Tuple, Union
 
-from core.domain.data_models import PredictionOutcome
-from core.domain.value_objects import ArtifactRef, PredictionId, SessionId
+from core.domain.data_models import PredictionOutcome, PredictionStage, StoredOutcome, StoredSession
+from core.domain.value_objects import ArtifactRef, CaseId, PredictionId, SessionId
+
+# ``(session_id, outcome[, case_id[, result_payload]])``; a payload is ``outcome.result`` already
+# encoded by a result codec, so the repository does not encode it again.
+OutcomeItem = Union[
+    Tuple[SessionId, PredictionOutcome],
+    Tuple[SessionId, PredictionOutcome, Optional[CaseId]],
+    Tuple[SessionId, PredictionOutcome, Optional[CaseId], Optional[bytes]],
+]
+
+
+@dataclass(frozen=True)
+class MeasurementSchema:
+    """Typed table that receives scalar fields extracted from outcomes."""
+
+    table: str
+    # ``(name, declared type)``, e.g. ``("mean", "REAL")`` or ``("status", "TEXT NOT NULL")``.
+    columns: Tuple[Tuple[str, str], ...]
+    indexed: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class MeasurementRows:
+    """Rows for one measurement table; ``item`` is the index of the outcome they came from."""
+
+    schema: MeasurementSchema
+    rows: Sequence[Tuple[int, Tuple[object, ...]]]
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    """Combined record of one session; ``items`` are the indexes of its outcomes in the same write."""
+
+    case_id: Optional[CaseId]
+    session_id: SessionId
+    completed: Tuple[PredictionStage, ...]
+    failed: Tuple[PredictionStage, ...] = ()
+    missing: Tuple[PredictionStage, ...] = ()
+    items: Tuple[int, ...] = ()
+    timed_out: bool = False
 
 
 class IRepositoryDB(ABC):
@@ -17,9 +58,73 @@ class IRepositoryDB(ABC):
         self,
         session_id: SessionId,
         outcome: PredictionOutcome,
+        *,
+        case_id: Optional[CaseId] = None,
     ) -> PredictionId:
         """Persist prediction outcome and return its id."""
 
+    @abstractmethod
+    async def save_prediction_outcomes(
+        self,
+        items: Sequence[OutcomeItem],
+        *,
+        measurements: Sequence[MeasurementRows] = (),
+        sessions: Sequence[SessionRecord] = (),
+    ) -> List[PredictionId]:
+        """
+        Persist several outcomes in one write, returning their ids in order.
+
+        ``measurements`` and ``sessions`` are written alongside, linked to the outcomes they
+        refer to.
+        """
+
+    @abstractmethod
+    async def ensure_measurement_tables(self, schemas: Sequence[MeasurementSchema]) -> None:
+        """Create measurement tables (and their indexes) that do not exist yet."""
+
+    async def apply_retention(self, before: datetime) -> int:
+        """
+        Drop outcomes and measurements from days before ``before``; returns the partitions dropped.
+
+        Repositories without time-partitioned storage keep everything.
+        """
+        return 0
+
+    @abstractmethod
+    async def get_session_record(self, session_id: SessionId) -> Optional[StoredSession]:
+        """The latest combined record of a session, if one was written."""
+
+    @abstractmethod
+    async def get_session_outcomes(
+        self,
+        session_id: SessionId,
+        *,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        """Outcomes of one session in insertion order."""
+
+    @abstractmethod
+    async def get_case_outcomes(
+        self,
+        case_id: CaseId,
+        *,
+        stage: Optional[PredictionStage] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredOutcome]:
+        """Outcomes of a case created in ``[since, until)``, oldest first; naive datetimes are UTC."""
+
+    @abstractmethod
+    async def get_latest_outcomes(
+        self,
+        limit: int = 50,
+        *,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        """The ``limit`` most recent outcomes, newest first."""
+
 
 class IUnitOfWork(Protocol):
     """Unit-of-work contract for database operations."""
@@ -85,6 +85,14 @@ class IMultiChannelFrame(Protocol):
     def get(self, channel: ChannelKey) -> FramePayload: ...
 
 
+class IFrameStore(Protocol):
+    """Storage that lets frames travel through the pipeline as lightweight handles."""
+
+    def put(self, frame: Any) -> Optional[Any]:
+        """Store ``frame`` and return an array-like handle, or ``None`` if it cannot be stored."""
+        ...
+
+
 class IDeviceProbe(Protocol):
     """Abstraction for probing device state before activation."""
 
@@ -10,17 +10,25 @@ import numpy as np
 
 from core.domain import FrameBatch, FramePayload
 from core.domain.value_objects import CaseId, ChannelKey, SessionId
-from core.interfaces.streams import BaseStreamHandler, ChannelSpec, StreamDescriptor
+from core.interfaces.streams import BaseStreamHandler, ChannelSpec, IFrameStore, StreamDescriptor
 from implementations.examples.dummy.config import DummyHandlerConfig
 
 
 class DummyStreamHandler(BaseStreamHandler):
     """Produces synthetic RGB frames for multiple channels."""
 
-    def __init__(self, *, descriptor: StreamDescriptor, config: DummyHandlerConfig, case_id: CaseId | None = None) -> None:
+    def __init__(
+        self,
+        *,
+        descriptor: StreamDescriptor,
+        config: DummyHandlerConfig,
+        case_id: CaseId | None = None,
+        frame_store: IFrameStore | None = None,
+    ) -> None:
         self.descriptor = descriptor
         self.config = config
         self.case_id = case_id
+        self.frame_store = frame_store
         self._running = False
         self._batch_index = 0
 
@@ -48,10 +56,11 @@ class DummyStreamHandler(BaseStreamHandler):
             gradient = np.linspace(0, 255, num=width, dtype=np.float32)
             frame = np.tile(gradient, (height, 1)) + noise * 0.1 + idx * 10
             frame = np.clip(frame, 0, 255).astype(np.uint8)
+            handle = self.frame_store.put(frame) if self.frame_store is not None else None
             payloads.append(
                 FramePayload(
                     channel=ChannelKey(channel),
-                    content=frame,
+                    content=frame if handle is None else handle,
                     timestamp=timestamp,
                     metadata={"channel_index": idx},
                 )
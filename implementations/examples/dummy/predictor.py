@@ -22,7 +22,7 @@ class DummyValidationPredictor(BaseValidationPredictor):
         assert isinstance(data, BasePredictionData)
         stats: Dict[str, float] = {}
         for channel, payload in data.payloads.items():
-            frame = np.array(payload)
+            frame = np.asarray(payload)
             mean_intensity = float(frame.mean())
             stats[str(channel)] = mean_intensity
             if mean_intensity < self.config.min_intensity or mean_intensity > self.config.max_intensity:
@@ -48,7 +48,7 @@ class DummyAnalyticsPredictor(BaseAnalyticsPredictor):
         assert isinstance(data, BasePredictionData)
         result: Dict[str, Any] = {"channels": {}}
         for channel, payload in data.payloads.items():
-            frame = np.array(payload)
+            frame = np.asarray(payload)
             mean_val = float(frame.mean())
             max_val = float(frame.max())
             min_val = float(frame.min())
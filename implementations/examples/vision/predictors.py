@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Sequence, Tuple
 
 import numpy as np
 
@@ -11,6 +11,31 @@ from core.interfaces.predictors import BaseAnalyticsPredictor
 from implementations.examples.vision.config import ResNet50Config, YoloV8DetectorConfig
 
 
+def _frame_statistics(requests: Sequence[PredictionInput]) -> List[Dict[str, Tuple[float, float]]]:
+    """Return (mean, std) per channel for every request, vectorized over equally shaped frames."""
+    entries: List[Tuple[int, str, np.ndarray]] = []
+    for index, request in enumerate(requests):
+        data = request.data
+        assert isinstance(data, BasePredictionData)
+        for channel, payload in data.payloads.items():
+            entries.append((index, str(channel), np.asarray(payload, dtype=np.float32)))
+
+    stats: List[Dict[str, Tuple[float, float]]] = [{} for _ in requests]
+    by_shape: Dict[Tuple[int, ...], List[Tuple[int, str, np.ndarray]]] = {}
+    for entry in entries:
+        by_shape.setdefault(entry[2].shape, []).append(entry)
+    for group in by_shape.values():
+        stacked = np.stack([frame for _, _, frame in group]).reshape(len(group), -1)
+        means = stacked.mean(axis=1)
+        stds = stacked.std(axis=1)
+        for (index, channel, _), mean_val, std_val in zip(group, means, stds):
+            stats[index][channel] = (float(mean_val), float(std_val))
+    for index, request in enumerate(requests):
+        ordered = {str(channel): stats[index][str(channel)] for channel in request.data.payloads}
+        stats[index] = ordered
+    return stats
+
+
 class YoloV8DetectionPredictor(BaseAnalyticsPredictor):
     """Heuristic detector producing pseudo bounding boxes and scores."""
 
@@ -18,30 +43,32 @@ class YoloV8DetectionPredictor(BaseAnalyticsPredictor):
         self.config = config
 
     async def predict(self, request: PredictionInput) -> PredictionOutcome:
-        data = request.data
-        assert isinstance(data, BasePredictionData)
-        detections: Dict[str, list[dict[str, Any]]] = {}
-        for channel, payload in data.payloads.items():
-            frame = np.array(payload, dtype=np.float32)
-            # Simple heuristic: threshold bright regions and pick a few random-ish boxes.
-            mean_val = frame.mean()
-            std_val = frame.std()
-            score = float(min(1.0, max(0.0, (mean_val + std_val) / 255.0)))
-            channel_detections: list[dict[str, Any]] = []
-            for idx, label in enumerate(self.config.class_names[: self.config.max_detections]):
-                conf = max(self.config.score_threshold, score * (1.0 - idx * 0.05))
-                box = {
-                    "x1": 5 * (idx + 1),
-                    "y1": 5 * (idx + 1),
-                    "x2": 5 * (idx + 3),
-                    "y2": 5 * (idx + 3),
-                    "confidence": round(conf, 3),
-                    "label": label,
-                }
-                channel_detections.append(box)
-            detections[str(channel)] = channel_detections
-        result = {"detections": detections}
-        return PredictionOutcome.success_result(stage=self.stage, result=result)
+        outcomes = await self.predict_batch([request])
+        return outcomes[0]
+
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        outcomes: List[PredictionOutcome] = []
+        for channel_stats in _frame_statistics(requests):
+            detections: Dict[str, list[dict[str, Any]]] = {}
+            for channel, (mean_val, std_val) in channel_stats.items():
+                # Simple heuristic: threshold bright regions and pick a few random-ish boxes.
+                score = float(min(1.0, max(0.0, (mean_val + std_val) / 255.0)))
+                channel_detections: list[dict[str, Any]] = []
+                for idx, label in enumerate(self.config.class_names[: self.config.max_detections]):
+                    conf = max(self.config.score_threshold, score * (1.0 - idx * 0.05))
+                    box = {
+                        "x1": 5 * (idx + 1),
+                        "y1": 5 * (idx + 1),
+                        "x2": 5 * (idx + 3),
+                        "y2": 5 * (idx + 3),
+                        "confidence": round(conf, 3),
+                        "label": label,
+                    }
+                    channel_detections.append(box)
+                detections[channel] = channel_detections
+            result = {"detections": detections}
+            outcomes.append(PredictionOutcome.success_result(stage=self.stage, result=result))
+        return outcomes
 
 
 class ResNet50ClassifierPredictor(BaseAnalyticsPredictor):
@@ -51,24 +78,27 @@ class ResNet50ClassifierPredictor(BaseAnalyticsPredictor):
         self.config = config
 
     async def predict(self, request: PredictionInput) -> PredictionOutcome:
-        data = request.data
-        assert isinstance(data, BasePredictionData)
-        predictions: Dict[str, list[dict[str, Any]]] = {}
-        for channel, payload in data.payloads.items():
-            frame = np.array(payload, dtype=np.float32)
-            mean_val = frame.mean()
-            norm = max(1e-6, frame.std() + mean_val / 255.0)
-            scores = np.linspace(1.0, 0.2, num=len(self.config.class_names))
-            scores = scores * (mean_val / 255.0) / norm
-            top_indices = scores.argsort()[::-1][: self.config.top_k]
-            channel_preds: list[dict[str, Any]] = []
-            for idx in top_indices:
-                channel_preds.append(
-                    {
-                        "label": self.config.class_names[idx],
-                        "score": round(float(scores[idx]), 3),
-                    }
-                )
-            predictions[str(channel)] = channel_preds
-        result = {"predictions": predictions}
-        return PredictionOutcome.success_result(stage=self.stage, result=result)
+        outcomes = await self.predict_batch([request])
+        return outcomes[0]
+
+    async def predict_batch(self, requests: Sequence[PredictionInput]) -> Sequence[PredictionOutcome]:
+        base_scores = np.linspace(1.0, 0.2, num=len(self.config.class_names))
+        outcomes: List[PredictionOutcome] = []
+        for channel_stats in _frame_statistics(requests):
+            predictions: Dict[str, list[dict[str, Any]]] = {}
+            for channel, (mean_val, std_val) in channel_stats.items():
+                norm = max(1e-6, std_val + mean_val / 255.0)
+                scores = base_scores * (mean_val / 255.0) / norm
+                top_indices = scores.argsort()[::-1][: self.config.top_k]
+                channel_preds: list[dict[str, Any]] = []
+                for idx in top_indices:
+                    channel_preds.append(
+                        {
+                            "label": self.config.class_names[idx],
+                            "score": round(float(scores[idx]), 3),
+                        }
+                    )
+                predictions[channel] = channel_preds
+            result = {"predictions": predictions}
+            outcomes.append(PredictionOutcome.success_result(stage=self.stage, result=result))
+        return outcomes
@@ -1,11 +1,21 @@
 """Infrastructure adapters."""
 
-from infrastructure.events import InMemoryEventBus
+from infrastructure.codecs import BinaryResultCodec, JsonResultCodec
+from infrastructure.events import EventBroker, EventJournal, InMemoryEventBus, JournaledEventBus, SocketEventBus
+from infrastructure.frames import FrameHandle, FrameStore
 from infrastructure.repositories.sqlite import SqliteRepository, SqliteUnitOfWork
 from infrastructure.storage.local_fs import LocalArtifactStorage, LocalFileStorage
 
 __all__ = [
+    "BinaryResultCodec",
+    "JsonResultCodec",
+    "EventBroker",
+    "EventJournal",
+    "FrameHandle",
+    "FrameStore",
     "InMemoryEventBus",
+    "JournaledEventBus",
+    "SocketEventBus",
     "SqliteRepository",
     "SqliteUnitOfWork",
     "LocalFileStorage",
@@ -0,0 +1,34 @@
+"""Result codecs used by the repository and artifact persistence."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Type, Union
+
+from core.interfaces import IResultCodec
+from infrastructure.codecs.binary import MAGIC, BinaryResultCodec
+from infrastructure.codecs.json_codec import JsonResultCodec
+
+_CODECS: Dict[str, Type[IResultCodec]] = {
+    BinaryResultCodec.name: BinaryResultCodec,
+    JsonResultCodec.name: JsonResultCodec,
+}
+
+
+def create_result_codec(name: str) -> IResultCodec:
+    try:
+        return _CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown result codec {name!r}; expected one of {sorted(_CODECS)}.") from None
+
+
+def decode_result(payload: Union[bytes, str]) -> Any:
+    """Decode a payload written by any codec; binary payloads are recognised by their header."""
+    if isinstance(payload, (bytes, memoryview)) and bytes(payload[: len(MAGIC)]) == MAGIC:
+        return _BINARY.decode(payload)
+    return json.loads(payload)
+
+
+_BINARY = BinaryResultCodec()
+
+__all__ = ["BinaryResultCodec", "JsonResultCodec", "create_result_codec", "decode_result"]
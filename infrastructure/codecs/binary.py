@@ -0,0 +1,280 @@
+"""Compact tagged binary encoding of prediction results with raw numpy buffers."""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, List, Mapping, Tuple
+
+import numpy as np
+
+MAGIC = b"\x93MRC\x01"
+
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LENGTH = struct.Struct("<I")
+_INT_MIN, _INT_MAX = -(2**63), 2**63 - 1
+# Lists at least this long whose items are all floats (or all ints) are packed in one struct call.
+_PACKED_MIN = 8
+_LONG_LENGTH = 0xFF
+
+_NONE, _TRUE, _FALSE = b"N", b"T", b"F"
+_INT_TAG, _BIG_INT, _FLOAT_TAG = b"i", b"I", b"f"
+_STR, _BYTES = b"s", b"b"
+_LIST, _TUPLE, _DICT = b"l", b"t", b"d"
+_FLOATS, _INTS = b"D", b"Q"
+_ARRAY, _OBJECT_ARRAY, _SCALAR = b"a", b"O", b"g"
+
+
+class BinaryResultCodec:
+    """
+    Self-describing binary format for result trees of dicts, lists and scalars.
+
+    Every value is a one-byte tag followed by its payload. Numpy arrays are written as
+    dtype, shape and their raw C-order buffer, and numpy scalars keep their dtype, so both
+    decode to the same type and precision. Lists of floats or ints are packed into one
+    buffer. Objects of other types are stored as ``str()``, like the JSON codec's
+    ``default=str``. Encoding a structured array falls back to its ``tolist()``.
+    """
+
+    name = "binary"
+    media_type = "application/x-mmla-result"
+    file_extension = ".mrc"
+
+    def encode(self, value: Any) -> bytes:
+        chunks: List[Any] = [MAGIC]
+        _encode(value, chunks)
+        return b"".join(chunks)
+
+    def decode(self, payload: bytes) -> Any:
+        view = memoryview(payload)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError("Payload is not a binary result.")
+        value, offset = _decode(view, len(MAGIC))
+        if offset != len(view):
+            raise ValueError("Trailing bytes after binary result.")
+        return value
+
+
+def _length(size: int) -> bytes:
+    return bytes((size,)) if size < _LONG_LENGTH else b"\xff" + _LENGTH.pack(size)
+
+
+def _text(value: str, chunks: List[Any]) -> None:
+    data = value.encode("utf-8")
+    chunks.append(_length(len(data)))
+    chunks.append(data)
+
+
+def _encode(value: Any, chunks: List[Any]) -> None:
+    kind = type(value)
+    if kind is str:
+        chunks.append(_STR)
+        _text(value, chunks)
+    elif kind is float:
+        chunks.append(_FLOAT_TAG + _FLOAT.pack(value))
+    elif kind is bool or value is None:
+        chunks.append(_NONE if value is None else _TRUE if value else _FALSE)
+    elif kind is int:
+        if _INT_MIN <= value <= _INT_MAX:
+            chunks.append(_INT_TAG + _INT.pack(value))
+        else:
+            chunks.append(_BIG_INT)
+            _text(str(value), chunks)
+    elif isinstance(value, Mapping):
+        chunks.append(_DICT + _length(len(value)))
+        for key, item in value.items():
+            _encode(key, chunks)
+            _encode(item, chunks)
+    elif kind is list or kind is tuple:
+        _encode_sequence(value, kind is tuple, chunks)
+    elif isinstance(value, np.ndarray):
+        _encode_array(value, chunks)
+    elif isinstance(value, np.generic):
+        _encode_scalar(value, chunks)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        chunks.append(_BYTES + _length(len(data)))
+        chunks.append(data)
+    elif isinstance(value, (list, tuple)):
+        _encode_sequence(value, isinstance(value, tuple), chunks)
+    elif isinstance(value, str):
+        # String subclasses such as ``str`` enums keep their value, as in JSON.
+        chunks.append(_STR)
+        _text(str.__str__(value), chunks)
+    elif isinstance(value, int):
+        _encode(int(value), chunks)
+    elif isinstance(value, float):
+        _encode(float(value), chunks)
+    else:
+        chunks.append(_STR)
+        _text(str(value), chunks)
+
+
+def _encode_sequence(value: Any, is_tuple: bool, chunks: List[Any]) -> None:
+    size = len(value)
+    if not is_tuple and size >= _PACKED_MIN:
+        first = type(value[0])
+        if first is float and all(type(item) is float for item in value):
+            chunks.append(_FLOATS + _length(size) + struct.pack(f"<{size}d", *value))
+            return
+        if first is int and all(type(item) is int for item in value):
+            try:
+                packed = struct.pack(f"<{size}q", *value)
+            except struct.error:
+                pass
+            else:
+                chunks.append(_INTS + _length(size) + packed)
+                return
+    chunks.append((_TUPLE if is_tuple else _LIST) + _length(size))
+    for item in value:
+        _encode(item, chunks)
+
+
+def _dtype(dtype: np.dtype, chunks: List[Any]) -> None:
+    descr = dtype.str.encode("ascii")
+    chunks.append(bytes((len(descr),)) + descr)
+
+
+def _shape(shape: Tuple[int, ...], chunks: List[Any]) -> None:
+    chunks.append(bytes((len(shape),)) + struct.pack(f"<{len(shape)}Q", *shape))
+
+
+def _encode_array(value: np.ndarray, chunks: List[Any]) -> None:
+    if value.dtype.fields is not None:
+        _encode(value.tolist(), chunks)
+        return
+    if value.dtype.hasobject:
+        chunks.append(_OBJECT_ARRAY)
+        _shape(value.shape, chunks)
+        for item in value.reshape(-1):
+            _encode(item, chunks)
+        return
+    chunks.append(_ARRAY)
+    _dtype(value.dtype, chunks)
+    _shape(value.shape, chunks)
+    contiguous = value if value.flags.c_contiguous else np.ascontiguousarray(value)
+    # ``bytes.join`` reads the array buffer directly, without an intermediate ``tobytes()`` copy.
+    chunks.append(contiguous.reshape(-1).view(np.uint8).data if contiguous.size else b"")
+
+
+def _encode_scalar(value: np.generic, chunks: List[Any]) -> None:
+    if value.dtype.hasobject or value.dtype.fields is not None:
+        _encode(value.item(), chunks)
+        return
+    chunks.append(_SCALAR)
+    _dtype(value.dtype, chunks)
+    chunks.append(value.tobytes())
+
+
+def _read_length(view: memoryview, offset: int) -> Tuple[int, int]:
+    size = view[offset]
+    if size != _LONG_LENGTH:
+        return size, offset + 1
+    return _LENGTH.unpack_from(view, offset + 1)[0], offset + 5
+
+
+def _read_text(view: memoryview, offset: int) -> Tuple[str, int]:
+    size, offset = _read_length(view, offset)
+    return str(view[offset : offset + size], "utf-8"), offset + size
+
+
+def _read_dtype(view: memoryview, offset: int) -> Tuple[np.dtype, int]:
+    size = view[offset]
+    offset += 1
+    return np.dtype(str(view[offset : offset + size], "ascii")), offset + size
+
+
+def _read_shape(view: memoryview, offset: int) -> Tuple[Tuple[int, ...], int]:
+    ndim = view[offset]
+    offset += 1
+    return struct.unpack_from(f"<{ndim}Q", view, offset), offset + 8 * ndim
+
+
+def _decode(view: memoryview, offset: int) -> Tuple[Any, int]:
+    decoder = _DECODERS.get(view[offset])
+    if decoder is None:
+        raise ValueError(f"Unknown tag {bytes(view[offset : offset + 1])!r} in binary result.")
+    return decoder(view, offset + 1)
+
+
+def _decode_list(view: memoryview, offset: int) -> Tuple[Any, int]:
+    size, offset = _read_length(view, offset)
+    items = []
+    for _ in range(size):
+        item, offset = _decode(view, offset)
+        items.append(item)
+    return items, offset
+
+
+def _decode_tuple(view: memoryview, offset: int) -> Tuple[Any, int]:
+    items, offset = _decode_list(view, offset)
+    return tuple(items), offset
+
+
+def _decode_dict(view: memoryview, offset: int) -> Tuple[Any, int]:
+    size, offset = _read_length(view, offset)
+    result = {}
+    for _ in range(size):
+        key, offset = _decode(view, offset)
+        result[key], offset = _decode(view, offset)
+    return result, offset
+
+
+def _decode_packed(code: str) -> Callable[[memoryview, int], Tuple[Any, int]]:
+    def decode(view: memoryview, offset: int) -> Tuple[Any, int]:
+        size, offset = _read_length(view, offset)
+        return list(struct.unpack_from(f"<{size}{code}", view, offset)), offset + 8 * size
+
+    return decode
+
+
+def _decode_array(view: memoryview, offset: int) -> Tuple[Any, int]:
+    dtype, offset = _read_dtype(view, offset)
+    shape, offset = _read_shape(view, offset)
+    count = int(np.prod(shape, dtype=np.int64))
+    array = np.frombuffer(view, dtype=dtype, count=count, offset=offset).reshape(shape).copy()
+    return array, offset + count * dtype.itemsize
+
+
+def _decode_object_array(view: memoryview, offset: int) -> Tuple[Any, int]:
+    shape, offset = _read_shape(view, offset)
+    array = np.empty(int(np.prod(shape, dtype=np.int64)), dtype=object)
+    for index in range(array.size):
+        array[index], offset = _decode(view, offset)
+    return array.reshape(shape), offset
+
+
+def _decode_scalar(view: memoryview, offset: int) -> Tuple[Any, int]:
+    dtype, offset = _read_dtype(view, offset)
+    return np.frombuffer(view, dtype=dtype, count=1, offset=offset)[0], offset + dtype.itemsize
+
+
+def _decode_bytes(view: memoryview, offset: int) -> Tuple[Any, int]:
+    size, offset = _read_length(view, offset)
+    return view[offset : offset + size].tobytes(), offset + size
+
+
+def _decode_big_int(view: memoryview, offset: int) -> Tuple[Any, int]:
+    text, offset = _read_text(view, offset)
+    return int(text), offset
+
+
+# Keyed by the tag's byte value, which is what indexing a memoryview returns.
+_DECODERS = {
+    _NONE[0]: lambda view, offset: (None, offset),
+    _TRUE[0]: lambda view, offset: (True, offset),
+    _FALSE[0]: lambda view, offset: (False, offset),
+    _INT_TAG[0]: lambda view, offset: (_INT.unpack_from(view, offset)[0], offset + 8),
+    _BIG_INT[0]: _decode_big_int,
+    _FLOAT_TAG[0]: lambda view, offset: (_FLOAT.unpack_from(view, offset)[0], offset + 8),
+    _STR[0]: _read_text,
+    _BYTES[0]: _decode_bytes,
+    _LIST[0]: _decode_list,
+    _TUPLE[0]: _decode_tuple,
+    _DICT[0]: _decode_dict,
+    _FLOATS[0]: _decode_packed("d"),
+    _INTS[0]: _decode_packed("q"),
+    _ARRAY[0]: _decode_array,
+    _OBJECT_ARRAY[0]: _decode_object_array,
+    _SCALAR[0]: _decode_scalar,
+}
@@ -0,0 +1,33 @@
+"""JSON encoding of prediction results."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class JsonResultCodec:
+    """
+    UTF-8 JSON with ``default=str``, the format results were always stored in.
+
+    Numpy arrays and other objects JSON cannot represent are stored as their ``str()``, so
+    they do not decode to the original values; results that still fail to serialize (for
+    example dicts with tuple keys) are wrapped as ``{"value": str(result)}``.
+    """
+
+    name = "json"
+    media_type = "application/json"
+    file_extension = ".json"
+
+    def encode(self, value: Any) -> bytes:
+        try:
+            return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+        except (TypeError, ValueError):
+            logger.warning("Result contains non-serializable data; storing stringified fallback.")
+            return json.dumps({"value": str(value)}, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
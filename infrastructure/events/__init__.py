@@ -1,5 +1,14 @@
 """Event bus implementations."""
 
+from infrastructure.events.journal import EventJournal, JournaledEventBus, JournalRecord
 from infrastructure.events.memory_bus import InMemoryEventBus
+from infrastructure.events.socket_bus import EventBroker, SocketEventBus
 
-__all__ = ["InMemoryEventBus"]
+__all__ = [
+    "EventBroker",
+    "EventJournal",
+    "InMemoryEventBus",
+    "JournalRecord",
+    "JournaledEventBus",
+    "SocketEventBus",
+]
@@ -0,0 +1,368 @@
+"""Durable, segmented append-only journal of domain events."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+from core.domain import CaseId, DomainEvent, OverflowPolicy, PredictionStage
+from core.interfaces import IEventBus, SubscriptionStats
+
+TEvent = TypeVar("TEvent", bound=DomainEvent)
+
+# Record: payload length (u32) and CRC32 of the payload (u32), followed by the pickled event.
+_RECORD = struct.Struct("!II")
+_SEGMENT_SUFFIX = ".seg"
+_OFFSETS_FILE = "offsets.json"
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    """Event read back from the journal; resume after it from ``next_offset``."""
+
+    offset: int
+    next_offset: int
+    event: DomainEvent
+
+
+@dataclass
+class _Segment:
+    base: int
+    path: Path
+    size: int
+
+    @property
+    def end(self) -> int:
+        return self.base + self.size
+
+
+class EventJournal:
+    """
+    Append-only event log split into size-bounded segment files.
+
+    Offsets are global byte positions: a segment file is named after the offset of its
+    first record, so records stay addressable across rollovers. Appends are written
+    immediately and made durable by a background group commit that flushes and fsyncs
+    at most every ``fsync_interval`` seconds; only durable records are visible to
+    readers. Reads memory-map the segments and scan them sequentially, stopping at a
+    torn tail, which ``open`` also truncates after a crash. Consumer offsets are kept in
+    a small side file and are at-least-once: a crash between processing and
+    ``commit_offset`` replays the uncommitted records.
+    """
+
+    def __init__(self, directory: Path, *, segment_bytes: int = 64 * 1024 * 1024, fsync_interval: float = 0.01) -> None:
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync_interval = fsync_interval
+        self._segments: List[_Segment] = []
+        self._file: Optional[BinaryIO] = None
+        self._written = 0
+        self._durable = 0
+        self._dirty = asyncio.Event()
+        self._durable_changed = asyncio.Condition()
+        self._flusher: Optional[asyncio.Task] = None
+        # fsync and close of segments sealed by a rollover, running in worker threads.
+        self._sealing: List[asyncio.Future] = []
+        self._offsets: Dict[str, int] = {}
+
+    @property
+    def end_offset(self) -> int:
+        """Offset just past the last durable record."""
+        return self._durable
+
+    @property
+    def start_offset(self) -> int:
+        return self._segments[0].base if self._segments else 0
+
+    async def open(self) -> "EventJournal":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segments = [
+            _Segment(base=int(path.stem), path=path, size=path.stat().st_size)
+            for path in sorted(self.directory.glob(f"*{_SEGMENT_SUFFIX}"))
+        ]
+        if not self._segments:
+            self._segments.append(_Segment(base=0, path=self._segment_path(0), size=0))
+        active = self._segments[-1]
+        active.size = self._valid_length(active)
+        self._file = open(active.path, "ab")
+        self._file.truncate(active.size)
+        self._written = self._durable = active.end
+        offsets_path = self.directory / _OFFSETS_FILE
+        if offsets_path.exists():
+            self._offsets = {name: int(value) for name, value in json.loads(offsets_path.read_text()).items()}
+        self._flusher = asyncio.create_task(self._flush_loop(), name="event-journal-fsync")
+        return self
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+        if self._file is not None:
+            await self._sync()
+            self._file.close()
+            self._file = None
+
+    async def __aenter__(self) -> "EventJournal":
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def append(self, event: DomainEvent, *, wait: bool = False) -> int:
+        """Write ``event`` and return its offset; with ``wait`` return once it is durable."""
+        if self._file is None:
+            raise RuntimeError("Event journal is not open.")
+        payload = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        record = _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+        active = self._segments[-1]
+        if active.size and active.size + len(record) > self.segment_bytes:
+            active = self._roll()
+        offset = active.end
+        self._file.write(record)
+        active.size += len(record)
+        self._written = active.end
+        self._dirty.set()
+        if wait:
+            await self.wait_durable(offset + len(record))
+        return offset
+
+    async def wait_durable(self, offset: int) -> None:
+        """Wait until every record before ``offset`` has been fsynced."""
+        async with self._durable_changed:
+            await self._durable_changed.wait_for(lambda: self._durable >= offset)
+
+    def read(self, from_offset: int = 0, max_records: Optional[int] = None) -> List[JournalRecord]:
+        """Read durable records starting at ``from_offset`` (clamped to the oldest segment)."""
+        return list(self._iter_records(from_offset, max_records))
+
+    def replay(self, from_offset: int = 0) -> Iterator[JournalRecord]:
+        """Sequentially yield every durable record from ``from_offset`` on."""
+        offset = from_offset
+        while True:
+            records = self.read(offset, max_records=1024)
+            if not records:
+                return
+            yield from records
+            offset = records[-1].next_offset
+
+    async def tail(
+        self, from_offset: int = 0, *, max_records: int = 64, until: Optional[asyncio.Event] = None
+    ) -> AsyncIterator[List[JournalRecord]]:
+        """
+        Yield lists of records from ``from_offset`` on, waiting for new durable appends.
+
+        Once ``until`` is set, the records appended so far are yielded as they become
+        durable and the iterator ends.
+        """
+        offset = from_offset
+        while True:
+            records = self.read(offset, max_records)
+            if records:
+                offset = records[-1].next_offset
+                yield records
+                continue
+            offset = max(offset, self.start_offset)
+            if until is None:
+                await self.wait_durable(offset + 1)
+            elif until.is_set():
+                if offset >= self._written:
+                    return
+                await self.wait_durable(self._written)
+            else:
+                durable = asyncio.ensure_future(self.wait_durable(offset + 1))
+                stopper = asyncio.ensure_future(until.wait())
+                try:
+                    await asyncio.wait((durable, stopper), return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    durable.cancel()
+                    stopper.cancel()
+
+    def committed_offset(self, consumer: str) -> int:
+        return self._offsets.get(consumer, self.start_offset)
+
+    def commit_offset(self, consumer: str, offset: int) -> None:
+        """Remember that ``consumer`` has processed every record before ``offset``."""
+        self._offsets[consumer] = offset
+        path = self.directory / _OFFSETS_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._offsets))
+        os.replace(tmp_path, path)
+
+    def compact(self, before_offset: int) -> int:
+        """Delete sealed segments whose records all precede ``before_offset``; return how many."""
+        removed = 0
+        while len(self._segments) > 1 and self._segments[0].end <= before_offset:
+            self._segments.pop(0).path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def _segment_path(self, base: int) -> Path:
+        return self.directory / f"{base:020d}{_SEGMENT_SUFFIX}"
+
+    def _roll(self) -> _Segment:
+        assert self._file is not None
+        sealed = self._file
+        sealed.flush()
+        # The sealed segment's fsync runs off the loop; ``_sync`` waits for it before
+        # declaring anything durable.
+        self._sealing.append(asyncio.ensure_future(asyncio.to_thread(_seal, sealed)))
+        segment = _Segment(base=self._segments[-1].end, path=self._segment_path(self._segments[-1].end), size=0)
+        self._segments.append(segment)
+        self._file = open(segment.path, "ab")
+        return segment
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.fsync_interval)
+            self._dirty.clear()
+            await self._sync()
+
+    async def _sync(self) -> None:
+        if self._file is None or self._durable == self._written:
+            return
+        target = self._written
+        self._file.flush()
+        sealing, self._sealing = self._sealing, []
+        # fsync a duplicate descriptor: a rollover may close the file while the thread runs.
+        descriptor = os.dup(self._file.fileno())
+        try:
+            await asyncio.to_thread(os.fsync, descriptor)
+        finally:
+            os.close(descriptor)
+        if sealing:
+            await asyncio.gather(*sealing)
+        async with self._durable_changed:
+            self._durable = max(self._durable, target)
+            self._durable_changed.notify_all()
+
+    def _iter_records(self, from_offset: int, max_records: Optional[int]) -> Iterator[JournalRecord]:
+        offset = max(from_offset, self.start_offset)
+        count = 0
+        for segment in self._segments:
+            limit = min(segment.end, self._durable) - segment.base
+            if segment.end <= offset or limit <= 0:
+                continue
+            with open(segment.path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                position = offset - segment.base
+                while position + _RECORD.size <= limit:
+                    length, checksum = _RECORD.unpack_from(view, position)
+                    start = position + _RECORD.size
+                    payload = view[start : start + length]
+                    if start + length > limit or zlib.crc32(payload) != checksum:
+                        return
+                    next_offset = segment.base + start + length
+                    yield JournalRecord(offset=segment.base + position, next_offset=next_offset, event=pickle.loads(payload))
+                    count += 1
+                    position = start + length
+                    offset = next_offset
+                    if max_records is not None and count >= max_records:
+                        return
+
+    @staticmethod
+    def _valid_length(segment: _Segment) -> int:
+        """Length of the intact prefix of a segment, dropping a torn or corrupt tail."""
+        if not segment.path.exists() or not segment.size:
+            return 0
+        with open(segment.path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            position = 0
+            while position + _RECORD.size <= len(view):
+                length, checksum = _RECORD.unpack_from(view, position)
+                end = position + _RECORD.size + length
+                if end > len(view) or zlib.crc32(view[position + _RECORD.size : end]) != checksum:
+                    break
+                position = end
+        return position
+
+
+def _seal(segment_file: BinaryIO) -> None:
+    os.fsync(segment_file.fileno())
+    segment_file.close()
+
+
+class JournaledEventBus(IEventBus[TEvent]):
+    """
+    Event bus decorator that appends selected event types to an ``EventJournal``.
+
+    Events are journaled before being published on the wrapped bus; publishers do not wait
+    for the fsync. Durable consumers read the journal through ``EventJournal.tail`` and
+    commit their offsets, so they resume after a crash or restart.
+    """
+
+    def __init__(self, inner: IEventBus[TEvent], journal: EventJournal, journaled_types: Tuple[type, ...]) -> None:
+        self.inner = inner
+        self.journal = journal
+        self.journaled_types = journaled_types
+
+    async def publish(self, event: TEvent) -> None:
+        if isinstance(event, self.journaled_types):
+            await self.journal.append(event)
+        await self.inner.publish(event)
+
+    async def subscribe(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TEvent]:
+        async for event in self.inner.subscribe(
+            event_type,
+            max_size=max_size,
+            overflow=overflow,
+            case_id=case_id,
+            stage=stage,
+            session_prefix=session_prefix,
+            ready=ready,
+        ):
+            yield event
+
+    async def subscribe_batch(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_items: int = 64,
+        max_wait: float = 0.05,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        until: Optional[asyncio.Event] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[List[TEvent]]:
+        async for events in self.inner.subscribe_batch(
+            event_type,
+            max_items=max_items,
+            max_wait=max_wait,
+            max_size=max_size,
+            overflow=overflow,
+            case_id=case_id,
+            stage=stage,
+            session_prefix=session_prefix,
+            until=until,
+            ready=ready,
+        ):
+            yield events
+
+    def subscription_stats(self) -> List[SubscriptionStats]:
+        return list(self.inner.subscription_stats())
+
+    async def close(self) -> None:
+        await self.journal.close()
+        await self.inner.close()
@@ -3,35 +3,298 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict, deque
-from typing import AsyncIterator, DefaultDict, Deque, Type, TypeVar
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
 
-from core.domain import DomainEvent
-from core.interfaces import IEventBus
+from core.domain import CaseId, DomainEvent, OverflowPolicy, PredictionStage
+from core.interfaces import IEventBus, SubscriptionStats
 
 TEvent = TypeVar("TEvent", bound=DomainEvent)
 
+_SUPPORTED_POLICIES = (
+    OverflowPolicy.BLOCK,
+    OverflowPolicy.DROP_OLDEST,
+    OverflowPolicy.DROP_NEWEST,
+    OverflowPolicy.KEEP_LATEST,
+)
+
+
+class _Subscription:
+    """Bounded queue of one subscriber together with its overflow policy and counters."""
+
+    def __init__(
+        self,
+        event_type: type,
+        max_size: int,
+        overflow: OverflowPolicy,
+        *,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+    ) -> None:
+        if overflow not in _SUPPORTED_POLICIES:
+            raise ValueError(f"Overflow policy {overflow.value!r} is not supported for event subscriptions.")
+        if overflow is OverflowPolicy.KEEP_LATEST:
+            max_size = 1
+        self.event_type = event_type
+        self.case_id = case_id
+        self.stage = stage
+        self.session_prefix = session_prefix
+        self.max_size = max_size
+        self.overflow = overflow
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.delivered = 0
+        self.dropped = 0
+
+    async def offer_full(self, event: DomainEvent) -> None:
+        """Apply the overflow policy to an event published while the queue is full."""
+        queue = self.queue
+        if self.overflow is OverflowPolicy.BLOCK:
+            await queue.put(event)
+        elif self.overflow is OverflowPolicy.DROP_NEWEST:
+            self.dropped += 1
+        else:
+            queue.get_nowait()
+            self.dropped += 1
+            queue.put_nowait(event)
+
+    @property
+    def filtered(self) -> bool:
+        return self.case_id is not None or self.stage is not None or self.session_prefix is not None
+
+    def stats(self) -> SubscriptionStats:
+        return SubscriptionStats(
+            event_type=self.event_type.__name__,
+            max_size=self.max_size,
+            overflow=self.overflow,
+            depth=self.queue.qsize(),
+            delivered=self.delivered,
+            dropped=self.dropped,
+        )
+
+
+_IndexKey = Tuple[Optional[str], Optional[PredictionStage]]
+
+
+def _event_stage(event: DomainEvent) -> Optional[PredictionStage]:
+    stage = getattr(event, "stage", None)
+    if stage is None:
+        outcome = getattr(event, "outcome", None)
+        stage = getattr(outcome, "stage", None)
+    return stage
+
+
+class _Route:
+    """Subscribers of one concrete event type: unfiltered ones and a (case, stage) index."""
+
+    __slots__ = ("everyone", "indexed", "cases", "any_case")
+
+    def __init__(self, subscriptions: Iterable[_Subscription]) -> None:
+        everyone: List[_Subscription] = []
+        indexed: Dict[_IndexKey, Tuple[_Subscription, ...]] = {}
+        for subscription in subscriptions:
+            if not subscription.filtered:
+                everyone.append(subscription)
+                continue
+            key = (subscription.case_id, subscription.stage)
+            indexed[key] = (*indexed.get(key, ()), subscription)
+        self.everyone: Tuple[_Subscription, ...] = tuple(everyone)
+        self.indexed = indexed
+        self.cases = frozenset(case_id for case_id, _ in indexed if case_id is not None)
+        self.any_case = any(case_id is None for case_id, _ in indexed)
+
+    def matching(self, event: DomainEvent) -> List[_Subscription]:
+        case_id = getattr(event, "case_id", None)
+        if not self.any_case and case_id not in self.cases:
+            return []
+        stage = _event_stage(event)
+        keys = {(case_id, stage), (case_id, None), (None, stage), (None, None)}
+        session_id = getattr(event, "session_id", None)
+        matched: List[_Subscription] = []
+        for key in keys:
+            for subscription in self.indexed.get(key, ()):
+                prefix = subscription.session_prefix
+                if prefix is None or (session_id is not None and session_id.startswith(prefix)):
+                    matched.append(subscription)
+        return matched
+
+
+async def _next_event(
+    queue: asyncio.Queue, until: Optional[asyncio.Event], timeout: Optional[float]
+) -> Optional[DomainEvent]:
+    """Next queued event, or ``None`` after ``timeout`` or once ``until`` is set with the queue empty."""
+    if not queue.empty():
+        return queue.get_nowait()
+    if until is None:
+        if timeout is None:
+            return await queue.get()
+        try:
+            return await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    if until.is_set():
+        return None
+    getter = asyncio.ensure_future(queue.get())
+    stopper = asyncio.ensure_future(until.wait())
+    try:
+        await asyncio.wait((getter, stopper), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopper.cancel()
+        if not getter.done():
+            # A cancelled get leaves its event in the queue.
+            getter.cancel()
+    return getter.result() if getter.done() and not getter.cancelled() else None
+
 
 class InMemoryEventBus(IEventBus[TEvent]):
-    """Simple in-memory pub-sub using asyncio queues."""
+    """
+    Simple in-memory pub-sub using asyncio queues.
 
-    def __init__(self) -> None:
-        self._queues: DefaultDict[Type[TEvent], Deque[asyncio.Queue[TEvent]]] = defaultdict(lambda: deque())
-        self._lock = asyncio.Lock()
+    Subscriptions honour the event class hierarchy: ``subscribe(DomainEvent)`` receives
+    every event. Each published type is resolved once through its MRO into a cached
+    dispatch route, which is discarded whenever subscriptions change.
+
+    Subscriptions may filter on ``case_id``, ``stage`` (of the event or of its outcome)
+    and a ``session_prefix``. Filtered subscriptions are indexed by ``(case_id, stage)``,
+    so a publish only touches the buckets its own keys select and per-case consumers
+    cost nothing for other cases' traffic.
+
+    Every subscription owns a queue bounded by ``max_size`` (``default_max_size`` when not
+    given, ``0`` for unbounded). When it is full, ``block`` makes the publisher wait,
+    ``drop_oldest`` evicts the oldest queued event, ``drop_newest`` discards the published
+    one and ``keep_latest`` keeps only the most recent event.
+    """
+
+    def __init__(self, *, default_max_size: int = 0) -> None:
+        self.default_max_size = default_max_size
+        # Subscriber tuples are immutable and replaced on (un)subscribe, so publishers can
+        # iterate them without a lock or a defensive copy.
+        self._subscriptions: Dict[type, Tuple[_Subscription, ...]] = {}
+        self._dispatch: Dict[type, _Route] = {}
 
     async def publish(self, event: TEvent) -> None:
-        async with self._lock:
-            queues = list(self._queues[type(event)])
-        for queue in queues:
-            await queue.put(event)
+        route = self._dispatch.get(type(event))
+        if route is None:
+            route = self._resolve(type(event))
+        subscriptions: Sequence[_Subscription] = route.everyone
+        if route.indexed:
+            subscriptions = (*subscriptions, *route.matching(event))
+        if not subscriptions:
+            return
+        for subscription in subscriptions:
+            queue = subscription.queue
+            if queue.full():
+                await subscription.offer_full(event)
+            else:
+                queue.put_nowait(event)
 
-    async def subscribe(self, event_type: Type[TEvent]) -> AsyncIterator[TEvent]:
-        queue: asyncio.Queue[TEvent] = asyncio.Queue()
-        async with self._lock:
-            self._queues[event_type].append(queue)
+    async def subscribe(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TEvent]:
+        subscription = self._register(
+            _Subscription(
+                event_type,
+                self.default_max_size if max_size is None else max_size,
+                overflow,
+                case_id=case_id,
+                stage=stage,
+                session_prefix=session_prefix,
+            ),
+            ready,
+        )
         try:
             while True:
-                yield await queue.get()
+                event = await subscription.queue.get()
+                subscription.delivered += 1
+                yield event
         finally:
-            async with self._lock:
-                self._queues[event_type].remove(queue)
+            self._unregister(subscription)
+
+    async def subscribe_batch(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_items: int = 64,
+        max_wait: float = 0.05,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        until: Optional[asyncio.Event] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[List[TEvent]]:
+        if max_items < 1:
+            raise ValueError("max_items must be at least 1.")
+        subscription = self._register(
+            _Subscription(
+                event_type,
+                self.default_max_size if max_size is None else max_size,
+                overflow,
+                case_id=case_id,
+                stage=stage,
+                session_prefix=session_prefix,
+            ),
+            ready,
+        )
+        queue = subscription.queue
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                first = await _next_event(queue, until, None)
+                if first is None:
+                    return
+                batch: List[TEvent] = [first]
+                deadline = loop.time() + max_wait
+                while len(batch) < max_items:
+                    if not queue.empty():
+                        batch.append(queue.get_nowait())
+                        continue
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    event = await _next_event(queue, until, timeout)
+                    if event is None:
+                        break
+                    batch.append(event)
+                subscription.delivered += len(batch)
+                yield batch
+        finally:
+            self._unregister(subscription)
+
+    def _register(self, subscription: _Subscription, ready: Optional[asyncio.Event] = None) -> _Subscription:
+        event_type = subscription.event_type
+        self._subscriptions[event_type] = (*self._subscriptions.get(event_type, ()), subscription)
+        self._dispatch = {}
+        if ready is not None:
+            ready.set()
+        return subscription
+
+    def _unregister(self, subscription: _Subscription) -> None:
+        event_type = subscription.event_type
+        remaining = tuple(item for item in self._subscriptions.get(event_type, ()) if item is not subscription)
+        if remaining:
+            self._subscriptions[event_type] = remaining
+        else:
+            self._subscriptions.pop(event_type, None)
+        self._dispatch = {}
+
+    def _resolve(self, event_type: type) -> _Route:
+        route = _Route(
+            subscription for cls in event_type.__mro__ for subscription in self._subscriptions.get(cls, ())
+        )
+        self._dispatch[event_type] = route
+        return route
+
+    def subscription_stats(self) -> Sequence[SubscriptionStats]:
+        stats: List[SubscriptionStats] = []
+        for subscriptions in self._subscriptions.values():
+            stats.extend(subscription.stats() for subscription in subscriptions)
+        return stats
@@ -0,0 +1,427 @@
+"""Cross-process event bus relaying events through a local socket broker."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import logging
+import pickle
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AbstractSet, AsyncIterator, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, Type, TypeVar
+
+from core.domain import CaseId, DomainEvent, OverflowPolicy, PredictionStage
+from core.interfaces import IEventBus, SubscriptionStats
+from infrastructure.events.memory_bus import InMemoryEventBus
+
+TEvent = TypeVar("TEvent", bound=DomainEvent)
+
+logger = logging.getLogger(__name__)
+
+# Frame: payload length (u32) and kind (u8), followed by the payload.
+_HEADER = struct.Struct("!IB")
+_NAMES = struct.Struct("!H")
+_PUBLISH = 1
+_INTEREST = 2
+
+
+def _type_names(event_type: type) -> Tuple[str, ...]:
+    return tuple(f"{cls.__module__}.{cls.__qualname__}" for cls in event_type.__mro__ if cls is not object)
+
+
+def _encode_publish(names: Sequence[str], events: Sequence[DomainEvent]) -> bytes:
+    names_blob = "\n".join(names).encode("utf-8")
+    body = _NAMES.pack(len(names_blob)) + names_blob + pickle.dumps(list(events), protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(body), _PUBLISH) + body
+
+
+def _publish_names(body: bytes) -> FrozenSet[str]:
+    (length,) = _NAMES.unpack_from(body)
+    return frozenset(body[_NAMES.size : _NAMES.size + length].decode("utf-8").split("\n"))
+
+
+def _publish_events(body: bytes) -> List[DomainEvent]:
+    (length,) = _NAMES.unpack_from(body)
+    return pickle.loads(body[_NAMES.size + length :])
+
+
+def _encode_interest(names: AbstractSet[str]) -> bytes:
+    body = "\n".join(sorted(names)).encode("utf-8")
+    return _HEADER.pack(len(body), _INTEREST) + body
+
+
+def _decode_interest(body: bytes) -> FrozenSet[str]:
+    return frozenset(body.decode("utf-8").split("\n")) if body else frozenset()
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    length, kind = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return kind, await reader.readexactly(length)
+
+
+def _parse_address(address: str | Path) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    Return ``(host, port, path)`` for ``tcp://host:port`` or a Unix socket path.
+
+    Frames carry pickles, so TCP addresses are limited to loopback hosts.
+    """
+    text = str(address)
+    if text.startswith("tcp://"):
+        host, _, port = text[len("tcp://") :].rpartition(":")
+        host = host.strip("[]") or "127.0.0.1"
+        if not _is_loopback(host):
+            raise ValueError(f"Event broker address must be a loopback host, got {host!r}.")
+        return host, int(port), None
+    if text.startswith("unix://"):
+        text = text[len("unix://") :]
+    return None, None, text
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+@dataclass
+class BrokerStats:
+    connections: int = 0
+    frames_received: int = 0
+    frames_relayed: int = 0
+    bytes_relayed: int = 0
+
+
+@dataclass
+class _Peer:
+    writer: asyncio.StreamWriter
+    interest: FrozenSet[str] = frozenset()
+    # Combined interest of the other peers, as last pushed to this one.
+    pushed: FrozenSet[str] = frozenset()
+
+
+class EventBroker:
+    """
+    Local relay between ``SocketEventBus`` clients.
+
+    Clients announce the event types they subscribe to, and the broker pushes back to each
+    client the combined interest of the others, so clients only send events somebody wants.
+    Every published frame is forwarded unchanged to the other clients whose interest
+    intersects the event's class hierarchy, so the broker never unpickles events. Payloads
+    are pickled and therefore only suitable for trusted local peers.
+    """
+
+    def __init__(self, address: str | Path) -> None:
+        self.address = address
+        self.stats = BrokerStats()
+        self._peers: List[_Peer] = []
+        self._handlers: Set[asyncio.Task] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        host, port, path = _parse_address(self.address)
+        if path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                Path(path).unlink()
+            self._server = await asyncio.start_unix_server(self._serve, path=path)
+        else:
+            self._server = await asyncio.start_server(self._serve, host=host, port=port)
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for task in list(self._handlers):
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        _, _, path = _parse_address(self.address)
+        if path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                Path(path).unlink()
+
+    async def __aenter__(self) -> "EventBroker":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = _Peer(writer=writer)
+        handler = asyncio.current_task()
+        assert handler is not None
+        self._peers.append(peer)
+        self._handlers.add(handler)
+        self.stats.connections += 1
+        # Always answer with the current interest, so the client knows it once connected.
+        peer.pushed = self._others_interest(peer)
+        writer.write(_encode_interest(peer.pushed))
+        try:
+            while True:
+                kind, body = await _read_frame(reader)
+                if kind == _INTEREST:
+                    peer.interest = _decode_interest(body)
+                    self._push_interest()
+                elif kind == _PUBLISH:
+                    self.stats.frames_received += 1
+                    await self._relay(peer, body)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # The connection ends here either way; returning normally keeps the stream
+            # protocol from reporting a cancelled handler when the broker stops.
+            pass
+        finally:
+            self._peers.remove(peer)
+            self._handlers.discard(handler)
+            writer.close()
+            if peer.interest:
+                self._push_interest()
+
+    def _push_interest(self) -> None:
+        """Send every client the event types the other clients subscribe to, when that changed."""
+        for peer in self._peers:
+            wanted = self._others_interest(peer)
+            if wanted != peer.pushed and not peer.writer.is_closing():
+                peer.pushed = wanted
+                peer.writer.write(_encode_interest(wanted))
+
+    def _others_interest(self, peer: _Peer) -> FrozenSet[str]:
+        return frozenset().union(*(other.interest for other in self._peers if other is not peer))
+
+    async def _relay(self, sender: _Peer, body: bytes) -> None:
+        names = _publish_names(body)
+        targets = [peer for peer in self._peers if peer is not sender and not peer.interest.isdisjoint(names)]
+        if not targets:
+            return
+        frame = _HEADER.pack(len(body), _PUBLISH) + body
+        for peer in targets:
+            peer.writer.write(frame)
+            self.stats.frames_relayed += 1
+            self.stats.bytes_relayed += len(frame)
+        for peer in targets:
+            with contextlib.suppress(ConnectionError):
+                await peer.writer.drain()
+
+
+class SocketEventBus(IEventBus[TEvent]):
+    """
+    Event bus whose events also reach subscribers in other processes via an ``EventBroker``.
+
+    Local subscribers are served by an embedded ``InMemoryEventBus`` (with its queue bounds,
+    hierarchy-aware dispatch and filters). Published events are additionally buffered per
+    type and sent to the broker as one pickled frame per type once ``max_batch`` events are
+    pending or ``flush_interval`` seconds have passed. Events relayed by the broker are
+    published into the local bus. Only event types with a local subscriber are requested
+    from the broker, and only events of types another client subscribes to (as pushed
+    back by the broker) are buffered and sent; events published before a subscription
+    reached the broker are not replayed.
+
+    If the link to the broker fails, the events waiting to be sent are dropped and counted
+    in ``dropped_events``, and the bus keeps serving local subscribers only; ``publish``
+    never raises because of the remote link.
+    """
+
+    def __init__(
+        self,
+        address: str | Path,
+        *,
+        default_max_size: int = 0,
+        max_batch: int = 256,
+        flush_interval: float = 0.001,
+    ) -> None:
+        self.address = address
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.dropped_events = 0
+        self._local: InMemoryEventBus = InMemoryEventBus(default_max_size=default_max_size)
+        self._pending: Dict[type, List[DomainEvent]] = {}
+        self._pending_count = 0
+        self._interest: Dict[str, int] = {}
+        self._remote_interest: FrozenSet[str] = frozenset()
+        self._names: Dict[type, Tuple[str, ...]] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._flush_requested = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def connect(self) -> "SocketEventBus":
+        host, port, path = _parse_address(self.address)
+        if path is not None:
+            reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, self._writer = await asyncio.open_connection(host, port)
+        if self._interest:
+            self._writer.write(_encode_interest(set(self._interest)))
+        # The broker answers every connection with the interest of the other clients.
+        kind, body = await _read_frame(reader)
+        if kind == _INTEREST:
+            self._remote_interest = _decode_interest(body)
+        self._tasks = [
+            asyncio.create_task(self._receive(reader), name="socket-bus-receive"),
+            asyncio.create_task(self._flush_loop(), name="socket-bus-flush"),
+        ]
+        return self
+
+    async def close(self) -> None:
+        await self.flush()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if self._writer is None:
+            return
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
+        self._writer = None
+
+    async def __aenter__(self) -> "SocketEventBus":
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def publish(self, event: TEvent) -> None:
+        await self._local.publish(event)
+        if self._writer is None or self._remote_interest.isdisjoint(self._type_names(type(event))):
+            return
+        self._pending.setdefault(type(event), []).append(event)
+        self._pending_count += 1
+        if self._pending_count >= self.max_batch:
+            await self.flush()
+        else:
+            self._flush_requested.set()
+
+    async def flush(self) -> None:
+        """Send all buffered events to the broker."""
+        writer = self._writer
+        if not self._pending or writer is None:
+            return
+        pending, self._pending, self._pending_count = self._pending, {}, 0
+        try:
+            for event_type, events in pending.items():
+                writer.write(_encode_publish(self._type_names(event_type), events))
+            await writer.drain()
+        except (ConnectionError, OSError) as exc:
+            self._disconnect(sum(len(events) for events in pending.values()), exc)
+
+    def _disconnect(self, dropped: int, reason: object) -> None:
+        """Forget the broker after the link failed; local subscribers are still served."""
+        self.dropped_events += dropped
+        self._remote_interest = frozenset()
+        if self._writer is None:
+            return
+        logger.warning("Lost the event broker link (%s); dropped %d unsent events.", reason, dropped)
+        self._writer.close()
+        self._writer = None
+
+    async def subscribe(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[TEvent]:
+        self._add_interest(event_type)
+        try:
+            async for event in self._local.subscribe(
+                event_type,
+                max_size=max_size,
+                overflow=overflow,
+                case_id=case_id,
+                stage=stage,
+                session_prefix=session_prefix,
+                ready=ready,
+            ):
+                yield event
+        finally:
+            self._remove_interest(event_type)
+
+    async def subscribe_batch(
+        self,
+        event_type: Type[TEvent],
+        *,
+        max_items: int = 64,
+        max_wait: float = 0.05,
+        max_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+        session_prefix: Optional[str] = None,
+        until: Optional[asyncio.Event] = None,
+        ready: Optional[asyncio.Event] = None,
+    ) -> AsyncIterator[List[TEvent]]:
+        self._add_interest(event_type)
+        try:
+            async for events in self._local.subscribe_batch(
+                event_type,
+                max_items=max_items,
+                max_wait=max_wait,
+                max_size=max_size,
+                overflow=overflow,
+                case_id=case_id,
+                stage=stage,
+                session_prefix=session_prefix,
+                until=until,
+                ready=ready,
+            ):
+                yield events
+        finally:
+            self._remove_interest(event_type)
+
+    def subscription_stats(self) -> Sequence[SubscriptionStats]:
+        return self._local.subscription_stats()
+
+    def _type_names(self, event_type: type) -> Tuple[str, ...]:
+        names = self._names.get(event_type)
+        if names is None:
+            names = self._names[event_type] = _type_names(event_type)
+        return names
+
+    def _add_interest(self, event_type: type) -> None:
+        name = _type_names(event_type)[0]
+        self._interest[name] = self._interest.get(name, 0) + 1
+        if self._interest[name] == 1:
+            self._announce_interest()
+
+    def _remove_interest(self, event_type: type) -> None:
+        name = _type_names(event_type)[0]
+        self._interest[name] -= 1
+        if not self._interest[name]:
+            del self._interest[name]
+            self._announce_interest()
+
+    def _announce_interest(self) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(_encode_interest(set(self._interest)))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._flush_requested.wait()
+            await asyncio.sleep(self.flush_interval)
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def _receive(self, reader: asyncio.StreamReader) -> None:
+        with contextlib.suppress(asyncio.IncompleteReadError, ConnectionError):
+            while True:
+                kind, body = await _read_frame(reader)
+                if kind == _INTEREST:
+                    self._remote_interest = _decode_interest(body)
+                    continue
+                if kind != _PUBLISH:
+                    continue
+                for event in _publish_events(body):
+                    await self._local.publish(event)
+        dropped, self._pending, self._pending_count = self._pending_count, {}, 0
+        self._disconnect(dropped, "connection closed by the broker")
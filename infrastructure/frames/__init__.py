@@ -0,0 +1,5 @@
+"""Frame storage shared by handlers, events and predictors."""
+
+from infrastructure.frames.ring_store import FrameHandle, FrameStore, FrameStoreStats
+
+__all__ = ["FrameHandle", "FrameStore", "FrameStoreStats"]
@@ -0,0 +1,172 @@
+"""Preallocated ring of frame buffers addressed by reference-counted handles."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple
+
+import numpy as np
+
+# Slots start on cache-line boundaries so that any dtype view of a slot is aligned.
+_ALIGNMENT = 64
+
+
+@dataclass(frozen=True)
+class FrameStoreStats:
+    slots: int
+    slot_bytes: int
+    in_use: int
+    fallbacks: int
+
+
+class FrameHandle:
+    """
+    Lightweight reference to a frame held in a ``FrameStore`` slot.
+
+    ``np.asarray(handle)`` resolves to a read-only view of the slot without copying; the
+    view keeps the handle alive, so the slot cannot be reused while any array derived from
+    it exists. The slot is returned to the store once every handle to it has been released,
+    either explicitly through ``release()`` or when the handle is garbage collected.
+    Pickling a handle produces a plain array copy.
+    """
+
+    __slots__ = ("_store", "_slot", "_generation", "shape", "dtype")
+
+    def __init__(self, store: "FrameStore", slot: int, generation: int, shape: Tuple[int, ...], dtype: np.dtype) -> None:
+        self._store: Optional[FrameStore] = store
+        self._slot = slot
+        self._generation = generation
+        self.shape = shape
+        self.dtype = dtype
+
+    @property
+    def __array_interface__(self) -> dict:
+        if self._store is None:
+            raise ValueError("Frame handle has been released.")
+        address = self._store._address(self._slot, self._generation)
+        return {"version": 3, "shape": self.shape, "typestr": self.dtype.str, "data": (address, True)}
+
+    @property
+    def array(self) -> np.ndarray:
+        return np.asarray(self)
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) * self.dtype.itemsize
+
+    @property
+    def released(self) -> bool:
+        return self._store is None
+
+    def retain(self) -> "FrameHandle":
+        """Return another handle to the same frame; each one must be released separately."""
+        if self._store is None:
+            raise ValueError("Frame handle has been released.")
+        return self._store._retain(self._slot, self._generation, self.shape, self.dtype)
+
+    def release(self) -> None:
+        """Drop this handle's reference; arrays obtained from it must no longer be used."""
+        store, self._store = self._store, None
+        if store is not None:
+            store._release(self._slot, self._generation)
+
+    def __enter__(self) -> "FrameHandle":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def __del__(self) -> None:
+        if getattr(self, "_store", None) is not None:
+            self.release()
+
+    def __reduce__(self) -> Tuple[Any, Tuple[np.ndarray]]:
+        return np.asarray, (np.array(self),)
+
+    def __repr__(self) -> str:
+        state = "released" if self._store is None else f"slot={self._slot}"
+        return f"FrameHandle({state}, shape={self.shape}, dtype={self.dtype})"
+
+
+class FrameStore:
+    """
+    Fixed pool of ``slots`` frame buffers of ``slot_bytes`` each, allocated once up front.
+
+    Free slots are reused in FIFO order. ``put`` copies a frame into a free slot and returns
+    its handle; ``allocate`` hands out a writable view so a producer can decode straight into
+    the slot. Frames larger than a slot, object arrays, or a full pool yield ``None`` and are
+    counted as fallbacks, leaving the caller to keep the frame as a regular array. Handles
+    may be released from any thread.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int) -> None:
+        if slots < 1 or slot_bytes < 1:
+            raise ValueError("Frame store needs at least one slot of at least one byte.")
+        self.slots = slots
+        self.slot_bytes = -(-slot_bytes // _ALIGNMENT) * _ALIGNMENT
+        self._buffer = np.empty(self.slots * self.slot_bytes + _ALIGNMENT, dtype=np.uint8)
+        self._offset = -self._buffer.ctypes.data % _ALIGNMENT
+        self._base_address = self._buffer.ctypes.data + self._offset
+        self._free: Deque[int] = deque(range(slots))
+        self._refs: List[int] = [0] * slots
+        self._generations: List[int] = [0] * slots
+        self._lock = threading.Lock()
+        self._fallbacks = 0
+
+    def put(self, frame: Any) -> Optional[FrameHandle]:
+        """Copy ``frame`` into a free slot, or return ``None`` if it cannot be stored."""
+        array = np.asarray(frame)
+        allocated = self.allocate(array.shape, array.dtype)
+        if allocated is None:
+            return None
+        handle, view = allocated
+        np.copyto(view, array)
+        return handle
+
+    def allocate(self, shape: Tuple[int, ...], dtype: Any) -> Optional[Tuple[FrameHandle, np.ndarray]]:
+        """Reserve a slot for a frame of ``shape``/``dtype`` and return its handle and a writable view."""
+        dtype = np.dtype(dtype)
+        shape = tuple(int(size) for size in shape)
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        with self._lock:
+            if dtype.hasobject or nbytes > self.slot_bytes or not self._free:
+                self._fallbacks += 1
+                return None
+            slot = self._free.popleft()
+            self._refs[slot] = 1
+            generation = self._generations[slot]
+        start = self._offset + slot * self.slot_bytes
+        view = self._buffer[start : start + nbytes].view(dtype).reshape(shape)
+        return FrameHandle(self, slot, generation, shape, dtype), view
+
+    def stats(self) -> FrameStoreStats:
+        with self._lock:
+            return FrameStoreStats(
+                slots=self.slots,
+                slot_bytes=self.slot_bytes,
+                in_use=self.slots - len(self._free),
+                fallbacks=self._fallbacks,
+            )
+
+    def _address(self, slot: int, generation: int) -> int:
+        if self._generations[slot] != generation:
+            raise ValueError("Frame handle refers to a slot that has been reused.")
+        return self._base_address + slot * self.slot_bytes
+
+    def _retain(self, slot: int, generation: int, shape: Tuple[int, ...], dtype: np.dtype) -> FrameHandle:
+        with self._lock:
+            if self._generations[slot] != generation:
+                raise ValueError("Frame handle refers to a slot that has been reused.")
+            self._refs[slot] += 1
+        return FrameHandle(self, slot, generation, shape, dtype)
+
+    def _release(self, slot: int, generation: int) -> None:
+        with self._lock:
+            if self._generations[slot] != generation:
+                return
+            self._refs[slot] -= 1
+            if self._refs[slot] == 0:
+                self._generations[slot] += 1
+                self._free.append(slot)
@@ -1,6 +1,6 @@
 """Repository adapters."""
 
-from infrastructure.repositories.sqlite import SqliteRepository, SqliteUnitOfWork
+from infrastructure.repositories.sqlite import SqliteConnectionPool, SqliteRepository, SqliteUnitOfWork
 from infrastructure.repositories.sqlite.facade import SqliteRepositoryFacade
 
-__all__ = ["SqliteRepository", "SqliteUnitOfWork", "SqliteRepositoryFacade"]
+__all__ = ["SqliteConnectionPool", "SqliteRepository", "SqliteUnitOfWork", "SqliteRepositoryFacade"]
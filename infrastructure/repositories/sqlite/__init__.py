@@ -1,5 +1,6 @@
 """SQLite repository and unit of work."""
 
+from infrastructure.repositories.sqlite.pool import SqliteConnectionPool
 from infrastructure.repositories.sqlite.repository import SqliteRepository, SqliteUnitOfWork
 
-__all__ = ["SqliteRepository", "SqliteUnitOfWork"]
+__all__ = ["SqliteConnectionPool", "SqliteRepository", "SqliteUnitOfWork"]
@@ -1,21 +1,133 @@
-"""Facade providing IRepositoryDB access via SQLite unit-of-work."""
+"""Facade providing IRepositoryDB access over pooled SQLite connections."""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from core.domain import PredictionOutcome
+from typing import List, Optional, Sequence
+
+from core.domain import CaseId, PredictionOutcome, PredictionStage, StoredOutcome, StoredSession
 from core.domain.value_objects import PredictionId, SessionId
-from core.interfaces import IRepositoryDB
-from infrastructure.repositories.factory import create_sqlite_uow
+from core.interfaces import (
+    IRepositoryDB,
+    IResultCodec,
+    MeasurementRows,
+    MeasurementSchema,
+    OutcomeItem,
+    SessionRecord,
+)
+from infrastructure.codecs import BinaryResultCodec
+from infrastructure.repositories.sqlite.pool import SqliteConnectionPool
+from infrastructure.repositories.sqlite.repository import (
+    apply_retention,
+    ensure_measurement_tables,
+    ensure_schema,
+    insert_prediction_outcomes,
+    select_case_outcomes,
+    select_latest_outcomes,
+    select_session_outcomes,
+    select_session_record,
+)
 
 
 @dataclass
 class SqliteRepositoryFacade(IRepositoryDB):
-    """Wraps SqliteUnitOfWork to expose IRepositoryDB for consumers."""
+    """
+    Exposes IRepositoryDB over a ``SqliteConnectionPool`` owned by the runtime.
+
+    The pool is created on first use, so the schema is set up once per facade instead of
+    once per write; ``close`` releases its connections. Queries run on the reader connections.
+    ``vacuum_pages`` bounds the pages returned to the file system per ``apply_retention``.
+    Results are stored with ``codec``; rows written by any codec are decoded on read.
+    """
 
     db_path: Path
+    readers: int = 2
+    synchronous: str = "NORMAL"
+    vacuum_pages: int = 0
+    codec: IResultCodec = field(default_factory=BinaryResultCodec)
+    _pool: Optional[SqliteConnectionPool] = field(default=None, init=False, repr=False)
+
+    @property
+    def pool(self) -> SqliteConnectionPool:
+        if self._pool is None:
+            self._pool = SqliteConnectionPool(
+                self.db_path, readers=self.readers, synchronous=self.synchronous, setup=ensure_schema
+            )
+        return self._pool
+
+    async def save_prediction_outcome(
+        self,
+        session_id: SessionId,
+        outcome: PredictionOutcome,
+        *,
+        case_id: Optional[CaseId] = None,
+    ) -> PredictionId:
+        (prediction_id,) = await self.save_prediction_outcomes([(session_id, outcome, case_id)])
+        return prediction_id
+
+    async def save_prediction_outcomes(
+        self,
+        items: Sequence[OutcomeItem],
+        *,
+        measurements: Sequence[MeasurementRows] = (),
+        sessions: Sequence[SessionRecord] = (),
+    ) -> List[PredictionId]:
+        if not items and not sessions:
+            return []
+        return await self.pool.write(
+            partial(
+                insert_prediction_outcomes,
+                items=list(items),
+                measurements=list(measurements),
+                codec=self.codec,
+                sessions=list(sessions),
+            )
+        )
+
+    async def ensure_measurement_tables(self, schemas: Sequence[MeasurementSchema]) -> None:
+        if schemas:
+            await self.pool.write(partial(ensure_measurement_tables, schemas=list(schemas)))
+
+    async def apply_retention(self, before: datetime) -> int:
+        return await self.pool.write(partial(apply_retention, before=before, vacuum_pages=self.vacuum_pages))
+
+    async def get_session_record(self, session_id: SessionId) -> Optional[StoredSession]:
+        return await self.pool.read(partial(select_session_record, session_id=session_id))
+
+    async def get_session_outcomes(
+        self,
+        session_id: SessionId,
+        *,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        return await self.pool.read(partial(select_session_outcomes, session_id=session_id, stage=stage))
+
+    async def get_case_outcomes(
+        self,
+        case_id: CaseId,
+        *,
+        stage: Optional[PredictionStage] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredOutcome]:
+        return await self.pool.read(
+            partial(select_case_outcomes, case_id=case_id, stage=stage, since=since, until=until, limit=limit)
+        )
+
+    async def get_latest_outcomes(
+        self,
+        limit: int = 50,
+        *,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        return await self.pool.read(partial(select_latest_outcomes, limit=limit, case_id=case_id, stage=stage))
 
-    async def save_prediction_outcome(self, session_id: SessionId, outcome: PredictionOutcome) -> PredictionId:
-        async with create_sqlite_uow(self.db_path) as uow:
-            return await uow.repository.save_prediction_outcome(session_id, outcome)
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
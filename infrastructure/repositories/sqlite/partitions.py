@@ -0,0 +1,160 @@
+"""Per-day partitions of the prediction outcome table."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, datetime
+from typing import List, Optional, Sequence
+
+OUTCOMES_VIEW = "prediction_outcomes"
+LEGACY_PARTITION = "prediction_outcomes_legacy"
+
+_PARTITION_PREFIX = "prediction_outcomes_"
+_DAY_FORMAT = "%Y%m%d"
+_COLUMNS = "id, case_id, session_id, stage, success, result, artifacts, errors, metrics, duration_ms, created_at"
+# SQLite caps a compound SELECT at 500 terms by default; larger views are nested in chunks.
+_COMPOUND_CHUNK = 250
+
+_INDEXES = (
+    ("session", "session_id"),
+    ("case_stage_created", "case_id, stage, created_at"),
+    ("stage_created", "stage, created_at"),
+    ("created", "created_at"),
+)
+
+
+def partition_name(day: date) -> str:
+    return f"{_PARTITION_PREFIX}{day.strftime(_DAY_FORMAT)}"
+
+
+def partition_day(name: str) -> Optional[date]:
+    """Day stored in a partition, or ``None`` for the legacy table."""
+    if name == LEGACY_PARTITION:
+        return None
+    return datetime.strptime(name[len(_PARTITION_PREFIX) :], _DAY_FORMAT).date()
+
+
+def list_partitions(connection: sqlite3.Connection) -> List[str]:
+    """Partition tables from oldest to newest, the legacy table first."""
+    names = [
+        row[0]
+        for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ?",
+            (_PARTITION_PREFIX + "*",),
+        )
+    ]
+    days = sorted(name for name in names if _is_day_partition(name))
+    return ([LEGACY_PARTITION] if LEGACY_PARTITION in names else []) + days
+
+
+def ensure_partition(connection: sqlite3.Connection, day: date) -> str:
+    """Return the partition for ``day``, creating it (and refreshing the view) on first use."""
+    name = partition_name(day)
+    exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+    if exists is None:
+        with connection:
+            _create_partition(connection, name)
+            refresh_outcomes_view(connection)
+    return name
+
+
+def next_outcome_id(connection: sqlite3.Connection) -> int:
+    """
+    First free prediction id across all partitions.
+
+    Every partition records its highest id in ``sqlite_sequence`` (AUTOINCREMENT), so ids
+    stay unique even when a partition is dropped or an older one is written to again.
+    """
+    (last_id,) = connection.execute(
+        "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name GLOB ?", (_PARTITION_PREFIX + "*",)
+    ).fetchone()
+    return last_id + 1
+
+
+def migrate_legacy_table(connection: sqlite3.Connection) -> None:
+    """Turn an unpartitioned ``prediction_outcomes`` table from an older database into a partition."""
+    kind = connection.execute("SELECT type FROM sqlite_master WHERE name = ?", (OUTCOMES_VIEW,)).fetchone()
+    if kind is None or kind[0] != "table":
+        return
+    columns = {row[1] for row in connection.execute(f"PRAGMA table_info({OUTCOMES_VIEW})")}
+    with connection:
+        if "case_id" not in columns:
+            # Databases created before case_id was stored keep NULL for their existing rows.
+            connection.execute(f"ALTER TABLE {OUTCOMES_VIEW} ADD COLUMN case_id TEXT")
+        connection.execute(f"ALTER TABLE {OUTCOMES_VIEW} RENAME TO {LEGACY_PARTITION}")
+        # Indexes keep their names across the rename; reuse them instead of building copies.
+        _create_indexes(connection, LEGACY_PARTITION, prefix=OUTCOMES_VIEW)
+
+
+def refresh_outcomes_view(connection: sqlite3.Connection) -> None:
+    """Recreate the ``prediction_outcomes`` view over every partition unless it is up to date."""
+    partitions = list_partitions(connection)
+    chunks = [
+        " UNION ALL ".join(f"SELECT {_COLUMNS} FROM {name}" for name in partitions[start : start + _COMPOUND_CHUNK])
+        for start in range(0, len(partitions), _COMPOUND_CHUNK)
+    ]
+    body = chunks[0] if len(chunks) == 1 else " UNION ALL ".join(f"SELECT * FROM ({chunk})" for chunk in chunks)
+    statement = f"CREATE VIEW {OUTCOMES_VIEW} AS {body}" if partitions else None
+    current = connection.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = ?", (OUTCOMES_VIEW,))
+    if statement == next((row[0] for row in current), None):
+        return
+    connection.execute(f"DROP VIEW IF EXISTS {OUTCOMES_VIEW}")
+    if statement is not None:
+        connection.execute(statement)
+
+
+def drop_partitions_before(connection: sqlite3.Connection, day: date, cutoff: str) -> Sequence[str]:
+    """
+    Drop partitions holding only outcomes from before ``day``.
+
+    The legacy table is dropped once its newest row is older than ``cutoff`` (an SQL timestamp).
+    """
+    dropped = []
+    for name in list_partitions(connection):
+        partition = partition_day(name)
+        if partition is None:
+            (newest,) = connection.execute(f"SELECT MAX(created_at) FROM {name}").fetchone()
+            expired = newest is None or newest < cutoff
+        else:
+            expired = partition < day
+        if expired:
+            dropped.append(name)
+    if dropped:
+        with connection:
+            for name in dropped:
+                connection.execute(f"DROP TABLE {name}")
+            refresh_outcomes_view(connection)
+    return dropped
+
+
+def _is_day_partition(name: str) -> bool:
+    suffix = name[len(_PARTITION_PREFIX) :]
+    return len(suffix) == 8 and suffix.isdigit()
+
+
+def _create_partition(connection: sqlite3.Connection, name: str) -> None:
+    connection.execute(
+        f"""
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            case_id TEXT,
+            session_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            success INTEGER NOT NULL,
+            result TEXT,
+            artifacts TEXT,
+            errors TEXT,
+            metrics TEXT,
+            duration_ms REAL,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    _create_indexes(connection, name)
+    # Seed the new partition's sequence so the highest id survives dropping older partitions.
+    connection.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, next_outcome_id(connection) - 1))
+
+
+def _create_indexes(connection: sqlite3.Connection, name: str, prefix: Optional[str] = None) -> None:
+    for suffix, columns in _INDEXES:
+        connection.execute(f"CREATE INDEX IF NOT EXISTS idx_{prefix or name}_{suffix} ON {name} ({columns})")
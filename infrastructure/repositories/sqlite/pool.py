@@ -0,0 +1,130 @@
+"""Long-lived SQLite connections confined to dedicated worker threads."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+ConnectionSetup = Callable[[sqlite3.Connection], None]
+
+
+class _Worker:
+    """One connection and the single thread that creates, uses and closes it."""
+
+    def __init__(self, name: str, connect: Callable[[], sqlite3.Connection]) -> None:
+        self._connect = connect
+        self._connection: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+
+    async def run(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, operation)
+
+    def close(self) -> None:
+        self._executor.submit(self._close).result()
+        self._executor.shutdown()
+
+    def _call(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        if self._connection is None:
+            self._connection = self._connect()
+        return operation(self._connection)
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _noop(connection: sqlite3.Connection) -> None:
+    return None
+
+
+class SqliteConnectionPool:
+    """
+    One writer and ``readers`` reader connections to a WAL-mode SQLite database.
+
+    Every connection is opened lazily on its own single-thread executor and then used only
+    from that thread, so operations on one connection are serialized without locks and
+    the ``sqlite3`` statement cache reuses prepared statements across calls. Writes all go
+    through the writer, which avoids ``SQLITE_BUSY`` between pool members; reads are spread
+    round-robin over the readers, which WAL lets run alongside the writer. ``setup`` runs
+    once on the writer's connection when it is opened (schema creation, migrations).
+    An operation is a plain function of the connection and must finish its own
+    transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        readers: int = 2,
+        synchronous: str = "NORMAL",
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 256,
+        setup: Optional[ConnectionSetup] = None,
+    ) -> None:
+        if synchronous.upper() not in _SYNCHRONOUS_MODES:
+            raise ValueError(f"Unsupported SQLite synchronous mode {synchronous!r}.")
+        self.db_path = Path(db_path)
+        self.synchronous = synchronous.upper()
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._setup = setup
+        self._writer = _Worker("sqlite-writer", self._connect_writer)
+        self._readers: List[_Worker] = [
+            _Worker(f"sqlite-reader-{index}", self._connect_reader) for index in range(readers)
+        ]
+        self._next_reader: Iterator[_Worker] = itertools.cycle(self._readers or [self._writer])
+        self._writer_ready = False
+        self._closed = False
+
+    async def write(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        self._check_open()
+        result = await self._writer.run(operation)
+        self._writer_ready = True
+        return result
+
+    async def read(self, operation: Callable[[sqlite3.Connection], T]) -> T:
+        self._check_open()
+        if not self._writer_ready:
+            # Readers are query-only, so the writer must have run ``setup`` first.
+            await self.write(_noop)
+        return await next(self._next_reader).run(operation)
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for worker in (*self._readers, self._writer):
+            await asyncio.to_thread(worker.close)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("SQLite connection pool is closed.")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(str(self.db_path), cached_statements=self.cached_statements)
+        connection.row_factory = sqlite3.Row
+        connection.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        connection.execute(f"PRAGMA synchronous = {self.synchronous}")
+        connection.execute("PRAGMA temp_store = MEMORY")
+        return connection
+
+    def _connect_writer(self) -> sqlite3.Connection:
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode = WAL")
+        if self._setup is not None:
+            self._setup(connection)
+        return connection
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        connection = self._connect()
+        connection.execute("PRAGMA query_only = ON")
+        return connection
@@ -6,66 +6,423 @@ import asyncio
 import json
 import sqlite3
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
 
-from core.domain import PredictionOutcome, SessionId
+from core.domain import ArtifactRef, CaseId, PredictionOutcome, PredictionStage, SessionId, StoredOutcome, StoredSession
 from core.domain.value_objects import PredictionId
-from core.interfaces import IRepositoryDB, IUnitOfWork
-
-
-def _ensure_schema(connection: sqlite3.Connection) -> None:
-    cursor = connection.cursor()
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS prediction_outcomes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            session_id TEXT NOT NULL,
-            stage TEXT NOT NULL,
-            success INTEGER NOT NULL,
-            result TEXT,
-            artifacts TEXT,
-            errors TEXT,
-            metrics TEXT,
-            duration_ms REAL,
-            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+from core.interfaces import (
+    IRepositoryDB,
+    IResultCodec,
+    IUnitOfWork,
+    MeasurementRows,
+    MeasurementSchema,
+    OutcomeItem,
+    SessionRecord,
+)
+from infrastructure.codecs import BinaryResultCodec, decode_result
+from infrastructure.repositories.sqlite.partitions import (
+    drop_partitions_before,
+    ensure_partition,
+    migrate_legacy_table,
+    next_outcome_id,
+    refresh_outcomes_view,
+)
+
+T = TypeVar("T")
+
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_AUTO_VACUUM_INCREMENTAL = 2
+_DEFAULT_CODEC = BinaryResultCodec()
+
+_MEASUREMENT_CATALOG = "measurement_tables"
+_SESSION_TABLE = "session_records"
+
+
+def ensure_schema(connection: sqlite3.Connection) -> None:
+    """
+    Prepare the database: incremental auto-vacuum, today's outcome partition and the view over all of them.
+
+    Converting an existing database to incremental auto-vacuum needs one full ``VACUUM``.
+    """
+    (auto_vacuum,) = connection.execute("PRAGMA auto_vacuum").fetchone()
+    if auto_vacuum != _AUTO_VACUUM_INCREMENTAL:
+        connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        connection.execute("VACUUM")
+    migrate_legacy_table(connection)
+    connection.execute(f"CREATE TABLE IF NOT EXISTS {_MEASUREMENT_CATALOG} (name TEXT PRIMARY KEY)")
+    with connection:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {_SESSION_TABLE} ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, case_id TEXT, session_id TEXT NOT NULL, "
+            "complete INTEGER NOT NULL, completed TEXT NOT NULL, failed TEXT, missing TEXT, prediction_ids TEXT, "
+            "created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
         )
-        """
-    )
-    connection.commit()
+        for columns in ("session_id", "case_id, created_at"):
+            index = f"idx_{_SESSION_TABLE}_{columns.replace(', ', '_')}"
+            connection.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {_SESSION_TABLE} ({columns})")
+    ensure_partition(connection, _utc(datetime.now(timezone.utc)).date())
+    with connection:
+        refresh_outcomes_view(connection)
 
 
 class SqliteRepository(IRepositoryDB):
     """SQLite-backed repository implementation."""
 
-    def __init__(self, connection: sqlite3.Connection) -> None:
+    def __init__(self, connection: sqlite3.Connection, codec: Optional[IResultCodec] = None) -> None:
         self._connection = connection
         self._connection.row_factory = sqlite3.Row
+        self._codec = codec or _DEFAULT_CODEC
+
+    async def save_prediction_outcome(
+        self,
+        session_id: SessionId,
+        outcome: PredictionOutcome,
+        *,
+        case_id: Optional[CaseId] = None,
+    ) -> PredictionId:
+        (prediction_id,) = await self.save_prediction_outcomes([(session_id, outcome, case_id)])
+        return prediction_id
+
+    async def save_prediction_outcomes(
+        self,
+        items: Sequence[OutcomeItem],
+        *,
+        measurements: Sequence[MeasurementRows] = (),
+        sessions: Sequence[SessionRecord] = (),
+    ) -> List[PredictionId]:
+        """Insert all outcomes with their measurement rows and session records in a single transaction."""
+        if not items and not sessions:
+            return []
+        return await asyncio.to_thread(
+            insert_prediction_outcomes, self._connection, items, measurements, codec=self._codec, sessions=sessions
+        )
+
+    async def ensure_measurement_tables(self, schemas: Sequence[MeasurementSchema]) -> None:
+        if schemas:
+            await asyncio.to_thread(ensure_measurement_tables, self._connection, schemas)
+
+    async def apply_retention(self, before: datetime) -> int:
+        return await asyncio.to_thread(apply_retention, self._connection, before)
+
+    async def get_session_record(self, session_id: SessionId) -> Optional[StoredSession]:
+        return await self._read(partial(select_session_record, session_id=session_id))
+
+    async def get_session_outcomes(
+        self,
+        session_id: SessionId,
+        *,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        return await self._read(partial(select_session_outcomes, session_id=session_id, stage=stage))
+
+    async def get_case_outcomes(
+        self,
+        case_id: CaseId,
+        *,
+        stage: Optional[PredictionStage] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[StoredOutcome]:
+        return await self._read(
+            partial(select_case_outcomes, case_id=case_id, stage=stage, since=since, until=until, limit=limit)
+        )
+
+    async def get_latest_outcomes(
+        self,
+        limit: int = 50,
+        *,
+        case_id: Optional[CaseId] = None,
+        stage: Optional[PredictionStage] = None,
+    ) -> List[StoredOutcome]:
+        return await self._read(partial(select_latest_outcomes, limit=limit, case_id=case_id, stage=stage))
+
+    async def _read(self, query: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.to_thread(query, self._connection)
 
-    async def save_prediction_outcome(self, session_id: SessionId, outcome: PredictionOutcome) -> PredictionId:
-        def _insert() -> PredictionId:
-            cursor = self._connection.cursor()
-            cursor.execute(
-                """
-                INSERT INTO prediction_outcomes (
-                    session_id, stage, success, result, artifacts, errors, metrics, duration_ms
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    outcome.stage.value,
-                    1 if outcome.success else 0,
-                    json.dumps(outcome.result, default=str) if outcome.result is not None else None,
-                    json.dumps([artifact.uri for artifact in outcome.artifacts]) if outcome.artifacts else None,
-                    json.dumps(outcome.errors) if outcome.errors else None,
-                    json.dumps(outcome.metrics) if outcome.metrics else None,
-                    outcome.duration_ms,
-                ),
+
+_INSERT_OUTCOME = """
+    INSERT INTO {table} (
+        id, session_id, stage, success, result, artifacts, errors, metrics, duration_ms, case_id, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT_OUTCOMES = (
+    "SELECT id, case_id, session_id, stage, success, result, artifacts, errors, metrics, duration_ms, created_at"
+    " FROM prediction_outcomes"
+)
+
+
+def insert_prediction_outcomes(
+    connection: sqlite3.Connection,
+    items: Sequence[OutcomeItem],
+    measurements: Sequence[MeasurementRows] = (),
+    now: Optional[datetime] = None,
+    codec: Optional[IResultCodec] = None,
+    sessions: Sequence[SessionRecord] = (),
+) -> List[PredictionId]:
+    """
+    Insert outcomes into the current day's partition with one prepared statement and commit.
+
+    Results are stored as ``codec`` payloads (binary by default) unless the item already
+    carries its encoded result. Ids continue from the highest id of any partition and are consecutive within the
+    transaction. Measurement rows and session records are inserted in the same transaction,
+    linked to the ids of the outcomes at their item indexes.
+    """
+    moment = _utc(now or datetime.now(timezone.utc))
+    created_at = _sql_timestamp(moment)
+    table = ensure_partition(connection, moment.date())
+    with connection:
+        first_id = next_outcome_id(connection)
+        connection.executemany(
+            _INSERT_OUTCOME.format(table=table),
+            [
+                (first_id + index, *_outcome_row(codec or _DEFAULT_CODEC, *item), created_at)
+                for index, item in enumerate(items)
+            ],
+        )
+        for batch in measurements:
+            connection.executemany(
+                _measurement_insert(batch.schema),
+                [(first_id + index, *_item_keys(items[index]), created_at, *values) for index, values in batch.rows],
+            )
+        if sessions:
+            connection.executemany(
+                _INSERT_SESSION, [(*_session_row(record, first_id), created_at) for record in sessions]
             )
-            self._connection.commit()
-            return PredictionId(str(cursor.lastrowid))
+    return [PredictionId(str(row_id)) for row_id in range(first_id, first_id + len(items))]
+
+
+def apply_retention(connection: sqlite3.Connection, before: datetime, vacuum_pages: int = 0) -> int:
+    """
+    Drop outcome partitions of days before ``before`` and the measurement rows and session records of those days.
+
+    Freed pages are then returned to the file system by incremental vacuum, at most
+    ``vacuum_pages`` per call (all of them when 0). Returns the number of dropped partitions.
+    """
+    cutoff_day = _utc(before).date()
+    cutoff = _sql_timestamp(datetime.combine(cutoff_day, datetime.min.time()))
+    dropped = drop_partitions_before(connection, cutoff_day, cutoff)
+    tables = [row[0] for row in connection.execute(f"SELECT name FROM {_MEASUREMENT_CATALOG}")]
+    with connection:
+        for table in (*tables, _SESSION_TABLE):
+            connection.execute(f"DELETE FROM {_quote(table)} WHERE created_at < ?", (cutoff,))
+    # ``execute`` steps the pragma only once, which frees a single page.
+    connection.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+    return len(dropped)
+
+
+def ensure_measurement_tables(connection: sqlite3.Connection, schemas: Sequence[MeasurementSchema]) -> None:
+    """Create measurement tables; columns declared later are added to existing tables."""
+    with connection:
+        for schema in schemas:
+            table = _quote(schema.table)
+            columns = "".join(f", {_quote(name)} {sql_type}" for name, sql_type in schema.columns)
+            connection.execute(f"INSERT OR IGNORE INTO {_MEASUREMENT_CATALOG} (name) VALUES (?)", (schema.table,))
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, prediction_id INTEGER NOT NULL, case_id TEXT, "
+                f"session_id TEXT NOT NULL, created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP{columns})"
+            )
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            for name, sql_type in schema.columns:
+                if name not in existing:
+                    # SQLite cannot add a NOT NULL column without a default to a populated table.
+                    column_type = sql_type.replace(" NOT NULL", "")
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(name)} {column_type}")
+            for column in ("prediction_id", "created_at", *schema.indexed):
+                index = _quote(f"idx_{schema.table}_{column}")
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({_quote(column)})")
+
+
+def _measurement_insert(schema: MeasurementSchema) -> str:
+    names = ["prediction_id", "case_id", "session_id", "created_at", *(name for name, _ in schema.columns)]
+    return (
+        f"INSERT INTO {_quote(schema.table)} ({', '.join(map(_quote, names))})"
+        f" VALUES ({', '.join('?' * len(names))})"
+    )
+
 
-        return await asyncio.to_thread(_insert)
+def _item_keys(item: OutcomeItem) -> tuple:
+    session_id, _, *case_id = item
+    return (case_id[0] if case_id else None, session_id)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+_INSERT_SESSION = f"""
+    INSERT INTO {_SESSION_TABLE} (
+        case_id, session_id, complete, completed, failed, missing, prediction_ids, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _session_row(record: SessionRecord, first_id: int) -> tuple:
+    return (
+        record.case_id,
+        record.session_id,
+        0 if record.timed_out else 1,
+        json.dumps([stage.value for stage in record.completed]),
+        json.dumps([stage.value for stage in record.failed]) if record.failed else None,
+        json.dumps([stage.value for stage in record.missing]) if record.missing else None,
+        json.dumps([first_id + index for index in record.items]) if record.items else None,
+    )
+
+
+def select_session_record(connection: sqlite3.Connection, session_id: SessionId) -> Optional[StoredSession]:
+    row = connection.execute(
+        "SELECT id, case_id, session_id, complete, completed, failed, missing, prediction_ids, created_at"
+        f" FROM {_SESSION_TABLE} WHERE session_id = ? ORDER BY id DESC LIMIT 1",
+        (session_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return StoredSession(
+        record_id=row["id"],
+        case_id=CaseId(row["case_id"]) if row["case_id"] is not None else None,
+        session_id=SessionId(row["session_id"]),
+        created_at=datetime.strptime(row["created_at"], _TIMESTAMP_FORMAT),
+        completed=_stages(row["completed"]),
+        failed=_stages(row["failed"]),
+        missing=_stages(row["missing"]),
+        prediction_ids=tuple(PredictionId(str(value)) for value in _loads(row["prediction_ids"]) or ()),
+        timed_out=not row["complete"],
+    )
+
+
+def _stages(value: Optional[str]) -> tuple:
+    return tuple(PredictionStage(stage) for stage in _loads(value) or ())
+
+
+def select_session_outcomes(
+    connection: sqlite3.Connection,
+    session_id: SessionId,
+    stage: Optional[PredictionStage] = None,
+) -> List[StoredOutcome]:
+    clauses, params = ["session_id = ?"], [session_id]
+    _filter_stage(clauses, params, stage)
+    return _select(connection, clauses, params, "id")
+
+
+def select_case_outcomes(
+    connection: sqlite3.Connection,
+    case_id: CaseId,
+    stage: Optional[PredictionStage] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> List[StoredOutcome]:
+    clauses, params = ["case_id = ?"], [case_id]
+    _filter_stage(clauses, params, stage)
+    if since is not None:
+        clauses.append("created_at >= ?")
+        params.append(_sql_timestamp(since))
+    if until is not None:
+        clauses.append("created_at < ?")
+        params.append(_sql_timestamp(until))
+    return _select(connection, clauses, params, "created_at, id", limit)
+
+
+def select_latest_outcomes(
+    connection: sqlite3.Connection,
+    limit: int,
+    case_id: Optional[CaseId] = None,
+    stage: Optional[PredictionStage] = None,
+) -> List[StoredOutcome]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if case_id is not None:
+        clauses.append("case_id = ?")
+        params.append(case_id)
+    _filter_stage(clauses, params, stage)
+    return _select(connection, clauses, params, "created_at DESC, id DESC", limit)
+
+
+def _filter_stage(clauses: List[str], params: List[Any], stage: Optional[PredictionStage]) -> None:
+    if stage is not None:
+        clauses.append("stage = ?")
+        params.append(stage.value)
+
+
+def _select(
+    connection: sqlite3.Connection,
+    clauses: List[str],
+    params: List[Any],
+    order_by: str,
+    limit: Optional[int] = None,
+) -> List[StoredOutcome]:
+    sql = _SELECT_OUTCOMES
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += f" ORDER BY {order_by}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params = [*params, limit]
+    return [_stored_outcome(row) for row in connection.execute(sql, params)]
+
+
+def _utc(moment: datetime) -> datetime:
+    """Naive UTC time; naive inputs are taken to be UTC already, like SQLite's CURRENT_TIMESTAMP."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def _sql_timestamp(moment: datetime) -> str:
+    return _utc(moment).strftime(_TIMESTAMP_FORMAT)
+
+
+def _loads(value: Optional[str]) -> Any:
+    return json.loads(value) if value is not None else None
+
+
+def _stored_outcome(row: sqlite3.Row) -> StoredOutcome:
+    prediction_id = PredictionId(str(row["id"]))
+    errors = _loads(row["errors"])
+    outcome = PredictionOutcome(
+        prediction_id=prediction_id,
+        stage=PredictionStage(row["stage"]),
+        success=bool(row["success"]),
+        result=decode_result(row["result"]) if row["result"] is not None else None,
+        artifacts=tuple(ArtifactRef(uri=uri) for uri in _loads(row["artifacts"]) or ()),
+        errors=tuple(errors) if errors else None,
+        metrics=_loads(row["metrics"]) or {},
+        duration_ms=row["duration_ms"],
+    )
+    return StoredOutcome(
+        prediction_id=prediction_id,
+        case_id=CaseId(row["case_id"]) if row["case_id"] is not None else None,
+        session_id=SessionId(row["session_id"]),
+        created_at=datetime.strptime(row["created_at"], _TIMESTAMP_FORMAT),
+        outcome=outcome,
+    )
+
+
+def _outcome_row(
+    codec: IResultCodec,
+    session_id: SessionId,
+    outcome: PredictionOutcome,
+    case_id: Optional[CaseId] = None,
+    payload: Optional[bytes] = None,
+) -> tuple:
+    if payload is None and outcome.result is not None:
+        payload = codec.encode(outcome.result)
+    return (
+        session_id,
+        outcome.stage.value,
+        1 if outcome.success else 0,
+        payload,
+        json.dumps([artifact.uri for artifact in outcome.artifacts]) if outcome.artifacts else None,
+        json.dumps(outcome.errors) if outcome.errors else None,
+        json.dumps(outcome.metrics) if outcome.metrics else None,
+        outcome.duration_ms,
+        case_id,
+    )
 
 
 @dataclass
@@ -81,7 +438,7 @@ class SqliteUnitOfWork(IUnitOfWork):
             return sqlite3.connect(str(self.db_path), check_same_thread=False)
 
         self._connection = await asyncio.to_thread(_connect)
-        await asyncio.to_thread(_ensure_schema, self._connection)
+        await asyncio.to_thread(ensure_schema, self._connection)
         self.repository = SqliteRepository(self._connection)
         return self
 
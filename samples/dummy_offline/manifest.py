@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from application.cases.manifest import BaseCaseManifest
 from core.domain import CaseId
 from implementations.examples.dummy.config import DummyAnalyticsConfig, DummyHandlerConfig, DummyValidationConfig
 
@@ -16,7 +17,7 @@ class DummyPredictorsConfig(BaseModel):
     analytics: DummyAnalyticsConfig = Field(default_factory=DummyAnalyticsConfig)
 
 
-class DummyOfflineManifest(BaseModel):
+class DummyOfflineManifest(BaseCaseManifest):
     handler: DummyHandlerConfig = Field(default_factory=DummyHandlerConfig)
     predictors: DummyPredictorsConfig = Field(default_factory=DummyPredictorsConfig)
 
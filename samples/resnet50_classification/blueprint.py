@@ -27,9 +27,14 @@ def make_blueprint(context: "CaseBuildContext") -> CaseBlueprint:
 
         async def factory() -> CaseOrchestrator:
             collector = CollectorService(prepare_prediction_inputs)
-            predictor_service = PredictorService()
+            predictor_service = PredictorService(stages=manifest.stages)
             predictor_service.register(PredictionStage.ANALYTICS, ResNet50ClassifierPredictor(manifest.predictors.analytics))
-            stream_handler = DummyStreamHandler(descriptor=descriptor, config=manifest.handler, case_id=manifest.case_id)
+            stream_handler = DummyStreamHandler(
+                descriptor=descriptor,
+                config=manifest.handler,
+                case_id=manifest.case_id,
+                frame_store=context.frame_store,
+            )
 
             return CaseOrchestrator(
                 case_id=manifest.case_id,
@@ -37,6 +42,9 @@ def make_blueprint(context: "CaseBuildContext") -> CaseBlueprint:
                 predictor=predictor_service,
                 event_bus=context.event_bus,
                 stream_handler=stream_handler,
+                pipeline=manifest.pipeline,
+                backpressure=manifest.backpressure,
+                scheduling=manifest.scheduling,
             )
 
         return factory
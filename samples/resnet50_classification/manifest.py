@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from application.cases.manifest import BaseCaseManifest
 from core.domain import CaseId
 from implementations.examples.dummy.config import DummyHandlerConfig
 from implementations.examples.vision.config import ResNet50Config
@@ -16,7 +17,7 @@ class ResNetPredictorsConfig(BaseModel):
     analytics: ResNet50Config = Field(default_factory=ResNet50Config)
 
 
-class ResNet50Manifest(BaseModel):
+class ResNet50Manifest(BaseCaseManifest):
     handler: DummyHandlerConfig = Field(default_factory=DummyHandlerConfig)
     predictors: ResNetPredictorsConfig = Field(default_factory=ResNetPredictorsConfig)
 
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from application.cases.manifest import BaseCaseManifest
 from core.domain import CaseId
 from implementations.examples.dummy.config import DummyHandlerConfig
 from samples.threshold_alert.predictor import ThresholdConfig
@@ -16,7 +17,7 @@ class ThresholdPredictorsConfig(BaseModel):
     analytics: ThresholdConfig = Field(default_factory=ThresholdConfig)
 
 
-class ThresholdManifest(BaseModel):
+class ThresholdManifest(BaseCaseManifest):
     handler: DummyHandlerConfig = Field(default_factory=DummyHandlerConfig)
     predictors: ThresholdPredictorsConfig = Field(default_factory=ThresholdPredictorsConfig)
 
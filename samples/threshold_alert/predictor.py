@@ -24,7 +24,7 @@ class ThresholdPredictor(BaseAnalyticsPredictor):
     async def predict(self, request: PredictionInput) -> PredictionOutcome:
         data = request.data
         assert isinstance(data, BasePredictionData)
-        frame = np.array(next(iter(data.payloads.values())))
+        frame = np.asarray(next(iter(data.payloads.values())))
         mean_val = float(frame.mean())
         status = "alert" if mean_val > self.config.threshold else "ok"
         return PredictionOutcome.success_result(
@@ -9,7 +9,9 @@ from application.cases.bootstrap import CaseBlueprint
 from application.cases.registry import OrchestratorFactory
 from application.orchestrator import CaseOrchestrator
 from application.services import CollectorService, PredictorService
+from implementations.examples.dummy.config import DummyAnalyticsConfig
 from implementations.examples.dummy.handler import DummyStreamHandler, build_descriptor
+from implementations.examples.dummy.predictor import DummyAnalyticsPredictor
 from implementations.examples.vision.predictors import YoloV8DetectionPredictor
 
 from .collector import prepare_prediction_inputs
@@ -27,9 +29,17 @@ def make_blueprint(context: "CaseBuildContext") -> CaseBlueprint:
 
         async def factory() -> CaseOrchestrator:
             collector = CollectorService(prepare_prediction_inputs)
-            predictor_service = PredictorService()
+            predictor_service = PredictorService(stages=manifest.stages)
             predictor_service.register(PredictionStage.ANALYTICS, YoloV8DetectionPredictor(manifest.predictors.analytics))
-            stream_handler = DummyStreamHandler(descriptor=descriptor, config=manifest.handler, case_id=manifest.case_id)
+            predictor_service.register_fallback(
+                "mean_intensity", DummyAnalyticsPredictor(DummyAnalyticsConfig(emit_histogram=False))
+            )
+            stream_handler = DummyStreamHandler(
+                descriptor=descriptor,
+                config=manifest.handler,
+                case_id=manifest.case_id,
+                frame_store=context.frame_store,
+            )
 
             return CaseOrchestrator(
                 case_id=manifest.case_id,
@@ -37,6 +47,9 @@ def make_blueprint(context: "CaseBuildContext") -> CaseBlueprint:
                 predictor=predictor_service,
                 event_bus=context.event_bus,
                 stream_handler=stream_handler,
+                pipeline=manifest.pipeline,
+                backpressure=manifest.backpressure,
+                scheduling=manifest.scheduling,
             )
 
         return factory
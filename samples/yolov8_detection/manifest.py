@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pydantic import BaseModel, Field
 
+from application.cases.manifest import BaseCaseManifest
 from core.domain import CaseId
 from implementations.examples.dummy.config import DummyHandlerConfig
 from implementations.examples.vision.config import YoloV8DetectorConfig
@@ -16,7 +17,7 @@ class YoloV8PredictorsConfig(BaseModel):
     analytics: YoloV8DetectorConfig = Field(default_factory=YoloV8DetectorConfig)
 
 
-class YoloV8Manifest(BaseModel):
+class YoloV8Manifest(BaseCaseManifest):
     handler: DummyHandlerConfig = Field(default_factory=DummyHandlerConfig)
     predictors: YoloV8PredictorsConfig = Field(default_factory=YoloV8PredictorsConfig)
 
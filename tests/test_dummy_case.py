@@ -4,14 +4,14 @@ import asyncio
 
 from application.runtime import create_runtime
 from configs.settings import settings
-from core.domain import CaseId, PredictionCompleted, PredictionStage
+from core.domain import CaseId, PredictionCompleted, PredictionOutcome, PredictionStage, SessionId
 
 
 def test_dummy_case_produces_predictions(tmp_path, monkeypatch):
     asyncio.run(_run_dummy_case(tmp_path, monkeypatch))
 
 
-async def _run_dummy_case(tmp_path, monkeypatch):
+def _use_tmp_roots(tmp_path, monkeypatch):
     models_dir = tmp_path / "models"
     models_dir.mkdir()
     data_dir = tmp_path / "data"
@@ -29,6 +29,9 @@ async def _run_dummy_case(tmp_path, monkeypatch):
     settings.artifacts_root = artifacts_dir
     settings.database_path = tmp_path / "db.sqlite"
 
+
+async def _run_dummy_case(tmp_path, monkeypatch):
+    _use_tmp_roots(tmp_path, monkeypatch)
     overrides = {"dummy_offline": {"handler": {"max_batches": 1, "fps": 10}}}
     runtime = await create_runtime(overrides=overrides)
     events: list[PredictionCompleted] = []
@@ -53,3 +56,25 @@ async def _run_dummy_case(tmp_path, monkeypatch):
     stages = {event.outcome.stage for event in events}
     assert PredictionStage.VALIDATION in stages
     assert PredictionStage.ANALYTICS in stages
+
+
+def test_runtime_stop_stores_outcomes_published_just_before_it(tmp_path, monkeypatch):
+    asyncio.run(_run_stop_drains_outcomes(tmp_path, monkeypatch))
+
+
+async def _run_stop_drains_outcomes(tmp_path, monkeypatch):
+    _use_tmp_roots(tmp_path, monkeypatch)
+    runtime = await create_runtime()
+    case_id = CaseId("drain")
+    try:
+        for index in range(200):
+            outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result={"index": index})
+            await runtime.event_bus.publish(
+                PredictionCompleted(case_id=case_id, session_id=SessionId(f"s-{index}"), outcome=outcome)
+            )
+        await runtime.stop()
+        stored = await runtime.repository.get_case_outcomes(case_id)
+    finally:
+        await runtime.shutdown()
+
+    assert len(stored) == 200
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+import pytest
+
+from core.domain import (
+    CaseActivated,
+    CaseId,
+    DomainEvent,
+    OverflowPolicy,
+    PredictionCompleted,
+    PredictionOutcome,
+    PredictionStage,
+    SessionFailed,
+    SessionId,
+)
+from infrastructure.events import EventBroker, EventJournal, InMemoryEventBus, JournaledEventBus, SocketEventBus
+
+
+def activated(index: int) -> CaseActivated:
+    return CaseActivated(case_id=CaseId(f"case-{index}"))
+
+
+async def _publish_to_stalled_subscriber(policy: OverflowPolicy, produced: int):
+    bus = InMemoryEventBus()
+    stream = bus.subscribe(CaseActivated, max_size=2, overflow=policy)
+    first = asyncio.create_task(stream.__anext__())
+    await asyncio.sleep(0)
+    await bus.publish(activated(0))
+    received = [await first]
+
+    publisher = asyncio.create_task(_publish_range(bus, 1, produced))
+    await asyncio.sleep(0.01)
+    blocked = not publisher.done()
+    (stats,) = bus.subscription_stats()
+    while len(received) < produced - stats.dropped:
+        received.append(await stream.__anext__())
+    await publisher
+    await stream.aclose()
+    return [int(event.case_id.split("-")[1]) for event in received], stats, blocked
+
+
+async def _publish_range(bus: InMemoryEventBus, start: int, stop: int) -> None:
+    for index in range(start, stop):
+        await bus.publish(activated(index))
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected", "blocked"),
+    [
+        (OverflowPolicy.BLOCK, [0, 1, 2, 3, 4, 5], True),
+        (OverflowPolicy.DROP_OLDEST, [0, 4, 5], False),
+        (OverflowPolicy.DROP_NEWEST, [0, 1, 2], False),
+        (OverflowPolicy.KEEP_LATEST, [0, 5], False),
+    ],
+)
+def test_subscription_queue_is_bounded(policy, expected, blocked):
+    received, stats, publisher_blocked = asyncio.run(_publish_to_stalled_subscriber(policy, produced=6))
+
+    assert received == expected
+    assert publisher_blocked is blocked
+    assert stats.dropped == 6 - len(expected)
+    assert stats.depth <= stats.max_size
+
+
+def test_decimate_is_rejected_for_subscriptions():
+    async def subscribe():
+        await InMemoryEventBus().subscribe(CaseActivated, overflow=OverflowPolicy.DECIMATE).__anext__()
+
+    with pytest.raises(ValueError):
+        asyncio.run(subscribe())
+
+
+def test_unsubscribing_during_fan_out_keeps_publish_consistent():
+    async def scenario():
+        bus = InMemoryEventBus()
+        first = bus.subscribe(CaseActivated)
+        second = bus.subscribe(CaseActivated)
+        first_waiter = asyncio.ensure_future(first.__anext__())
+        second_waiter = asyncio.ensure_future(second.__anext__())
+        await asyncio.sleep(0)
+
+        await bus.publish(activated(0))
+        assert (await first_waiter).case_id == "case-0"
+        await first.aclose()
+        assert len(bus.subscription_stats()) == 1
+
+        await bus.publish(activated(1))
+        assert (await second_waiter).case_id == "case-0"
+        assert (await second.__anext__()).case_id == "case-1"
+        await second.aclose()
+        assert bus.subscription_stats() == []
+        await bus.publish(activated(2))
+
+    asyncio.run(scenario())
+
+
+def test_base_class_subscription_receives_subclass_events():
+    async def scenario():
+        bus = InMemoryEventBus()
+        everything = bus.subscribe(DomainEvent)
+        activations = bus.subscribe(CaseActivated)
+        waiters = [asyncio.ensure_future(everything.__anext__()), asyncio.ensure_future(activations.__anext__())]
+        await asyncio.sleep(0)
+
+        await bus.publish(activated(0))
+        await bus.publish(SessionFailed(case_id=CaseId("case-0"), session_id=SessionId("s"), reason="boom"))
+
+        assert [type(await waiter) for waiter in waiters] == [CaseActivated, CaseActivated]
+        assert isinstance(await everything.__anext__(), SessionFailed)
+        assert activations_pending(bus) == 0
+        await everything.aclose()
+        await activations.aclose()
+
+    asyncio.run(scenario())
+
+
+def activations_pending(bus: InMemoryEventBus) -> int:
+    return sum(stats.depth for stats in bus.subscription_stats() if stats.event_type == "CaseActivated")
+
+
+def test_subscribe_batch_drains_up_to_max_items_and_flushes_on_timeout():
+    async def scenario():
+        bus = InMemoryEventBus()
+        batches = bus.subscribe_batch(CaseActivated, max_items=3, max_wait=0.02)
+        first = asyncio.ensure_future(batches.__anext__())
+        await asyncio.sleep(0)
+        for index in range(5):
+            await bus.publish(activated(index))
+
+        full = await first
+        started = asyncio.get_running_loop().time()
+        partial = await batches.__anext__()
+        waited = asyncio.get_running_loop().time() - started
+        (stats,) = bus.subscription_stats()
+        await batches.aclose()
+        return full, partial, waited, stats
+
+    full, partial, waited, stats = asyncio.run(scenario())
+    assert [event.case_id for event in full] == ["case-0", "case-1", "case-2"]
+    assert [event.case_id for event in partial] == ["case-3", "case-4"]
+    assert waited >= 0.015
+    assert stats.delivered == 5
+
+
+def completed(case: str, session: str, stage: PredictionStage) -> PredictionCompleted:
+    outcome = PredictionOutcome.success_result(stage=stage, result={})
+    return PredictionCompleted(case_id=CaseId(case), session_id=SessionId(session), outcome=outcome)
+
+
+def test_filtered_subscriptions_only_receive_matching_events():
+    async def scenario():
+        bus = InMemoryEventBus()
+        streams = {
+            "case": bus.subscribe(PredictionCompleted, case_id=CaseId("a")),
+            "case_stage": bus.subscribe(PredictionCompleted, case_id=CaseId("a"), stage=PredictionStage.ANALYTICS),
+            "stage": bus.subscribe(PredictionCompleted, stage=PredictionStage.VALIDATION),
+            "prefix": bus.subscribe(DomainEvent, session_prefix="a-1"),
+        }
+        waiters = {name: asyncio.ensure_future(stream.__anext__()) for name, stream in streams.items()}
+        await asyncio.sleep(0)
+
+        events = [
+            completed("a", "a-1", PredictionStage.VALIDATION),
+            completed("a", "a-2", PredictionStage.ANALYTICS),
+            completed("b", "b-1", PredictionStage.VALIDATION),
+            completed("b", "a-10", PredictionStage.ANALYTICS),
+            activated(0),
+        ]
+        for event in events:
+            await bus.publish(event)
+
+        received = {name: [await waiter] for name, waiter in waiters.items()}
+        for name, stream in streams.items():
+            with contextlib.suppress(asyncio.TimeoutError):
+                while True:
+                    received[name].append(await asyncio.wait_for(stream.__anext__(), 0.01))
+            await stream.aclose()
+        return {name: [events.index(event) for event in items] for name, items in received.items()}
+
+    assert asyncio.run(scenario()) == {
+        "case": [0, 1],
+        "case_stage": [1],
+        "stage": [0, 2],
+        "prefix": [0, 3],
+    }
+
+
+def test_socket_bus_relays_batched_events_between_clients(tmp_path):
+    address = str(tmp_path / "broker.sock")
+
+    async def scenario():
+        async with EventBroker(address) as broker:
+            async with SocketEventBus(address) as publisher, SocketEventBus(address) as runtime:
+                batches = runtime.subscribe_batch(PredictionCompleted, case_id=CaseId("a"), max_items=10, max_wait=0.05)
+                first = asyncio.ensure_future(batches.__anext__())
+                await asyncio.sleep(0.05)
+
+                for index in range(4):
+                    await publisher.publish(completed("a" if index % 2 == 0 else "b", f"s-{index}", PredictionStage.ANALYTICS))
+                await publisher.publish(activated(0))
+                received = await asyncio.wait_for(first, timeout=2)
+                await batches.aclose()
+                return [event.session_id for event in received], broker.stats
+
+    sessions, stats = asyncio.run(scenario())
+    assert sessions == ["s-0", "s-2"]
+    # CaseActivated has no subscriber in another process, so it never leaves the publisher.
+    assert stats.frames_received == 1
+    assert stats.frames_relayed == 1
+
+
+def test_socket_bus_keeps_publishing_locally_after_the_broker_stops(tmp_path):
+    address = str(tmp_path / "broker.sock")
+
+    async def scenario():
+        broker = EventBroker(address)
+        await broker.start()
+        async with SocketEventBus(address, flush_interval=60) as publisher, SocketEventBus(address) as runtime:
+            remote = runtime.subscribe(PredictionCompleted)
+            pending_remote = asyncio.ensure_future(remote.__anext__())
+            local = publisher.subscribe_batch(PredictionCompleted, max_items=6, max_wait=1)
+            pending_local = asyncio.ensure_future(local.__anext__())
+            await asyncio.sleep(0.05)
+
+            for index in range(3):
+                await publisher.publish(completed("a", f"s-{index}", PredictionStage.ANALYTICS))
+            await broker.stop()
+            await asyncio.sleep(0.05)
+            for index in range(3, 6):
+                await publisher.publish(completed("a", f"s-{index}", PredictionStage.ANALYTICS))
+            await publisher.flush()
+
+            received = await asyncio.wait_for(pending_local, timeout=2)
+            await local.aclose()
+            pending_remote.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await pending_remote
+            return len(received), publisher.dropped_events
+
+    received, dropped = asyncio.run(scenario())
+    assert received == 6
+    assert dropped == 3
+
+
+def test_event_broker_refuses_non_loopback_tcp_hosts():
+    with pytest.raises(ValueError, match="loopback"):
+        asyncio.run(EventBroker("tcp://0.0.0.0:7000").start())
+    with pytest.raises(ValueError, match="loopback"):
+        asyncio.run(SocketEventBus("tcp://10.0.0.5:7000").connect())
+
+
+def test_journal_rolls_segments_replays_and_resumes_from_committed_offset(tmp_path):
+    async def scenario():
+        async with EventJournal(tmp_path, segment_bytes=256, fsync_interval=0.001) as journal:
+            bus = JournaledEventBus(InMemoryEventBus(), journal, journaled_types=(CaseActivated,))
+            for index in range(19):
+                await bus.publish(activated(index))
+            await journal.append(activated(19), wait=True)
+            segments = len(list(tmp_path.glob("*.seg")))
+            records = list(journal.replay())
+            journal.commit_offset("reader", records[11].next_offset)
+
+        # A torn tail left by a crash mid-append is dropped on reopen.
+        last_segment = sorted(tmp_path.glob("*.seg"))[-1]
+        with last_segment.open("ab") as handle:
+            handle.write(b"\x00\x00\x01\x00torn")
+        async with EventJournal(tmp_path, segment_bytes=256, fsync_interval=0.001) as journal:
+            tail = journal.tail(journal.committed_offset("reader"), max_records=100)
+            resumed = await tail.__anext__()
+            offset = await journal.append(activated(20), wait=True)
+            appended = await tail.__anext__()
+            await tail.aclose()
+        return segments, records, resumed, offset, appended
+
+    segments, records, resumed, offset, appended = asyncio.run(scenario())
+    assert segments > 1
+    assert [record.event.case_id for record in records] == [f"case-{index}" for index in range(20)]
+    assert [record.event.case_id for record in resumed] == [f"case-{index}" for index in range(12, 20)]
+    assert offset == resumed[-1].next_offset
+    assert [record.event.case_id for record in appended] == ["case-20"]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import gc
+import pickle
+
+import numpy as np
+import pytest
+
+from infrastructure.frames import FrameStore
+
+
+def test_handles_resolve_to_read_only_views_of_their_slot():
+    store = FrameStore(slots=2, slot_bytes=64)
+    frame = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    handle = store.put(frame)
+
+    view = np.asarray(handle)
+    assert np.array_equal(view, frame)
+    assert not view.flags.writeable
+    assert np.shares_memory(view, handle.array)
+    with pytest.raises(ValueError):
+        view[0, 0] = 1
+    restored = pickle.loads(pickle.dumps(handle))
+    assert isinstance(restored, np.ndarray) and np.array_equal(restored, frame)
+
+
+def test_slots_are_freed_when_the_last_reference_goes_away():
+    store = FrameStore(slots=2, slot_bytes=64)
+    first = store.put(np.zeros(8, dtype=np.float32))
+    second = first.retain()
+    other = store.put(np.ones(4, dtype=np.float64))
+    assert other is not None
+    assert store.put(np.ones(4)) is None
+    assert store.stats().in_use == 2 and store.stats().fallbacks == 1
+
+    first.release()
+    assert store.stats().in_use == 2
+    view = second.array
+    del second
+    gc.collect()
+    assert store.stats().in_use == 2, "a live view keeps its slot"
+    del view
+    assert store.stats().in_use == 1
+    other.release()
+    assert store.stats().in_use == 0
+    with pytest.raises(ValueError):
+        np.asarray(first)
+    assert store.put(np.zeros(100, dtype=np.uint8)) is None, "frames larger than a slot fall back"
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from application.metrics import MetricsRegistry, format_summary
+from application.tracing import Tracer
+
+
+def test_registry_returns_same_series_and_summarises_histograms():
+    registry = MetricsRegistry()
+    counter = registry.counter("outcomes_total", case="demo", stage="analytics")
+    assert registry.counter("outcomes_total", stage="analytics", case="demo") is counter
+    counter.inc()
+    counter.inc(2)
+
+    histogram = registry.histogram("duration_ms", buckets=(1, 10, 100), case="demo")
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"outcomes_total{case=demo,stage=analytics}": 3}
+    summary = snapshot["histograms"]["duration_ms{case=demo}"]
+    assert summary["count"] == 5
+    assert summary["buckets"] == {"1": 1, "10": 2, "100": 1, "+inf": 1}
+    assert summary["p50"] == 10
+    assert summary["p99"] == 500
+    assert "duration_ms{case=demo} count=5" in format_summary(snapshot)
+
+
+def test_tracer_groups_session_spans_into_chrome_trace_tracks():
+    tracer = Tracer(enabled=True)
+    tracer.begin_session("demo", "s-1", origin_ns=1_000_000)
+    tracer.record("collect", "demo", "s-1", 1_000_000, 3_000_000, inputs=2)
+    tracer.record("predict:analytics", "demo", "s-1", 3_000_000, 7_000_000)
+    tracer.record("collect", "demo", "s-2", 2_000_000, 2_500_000)
+
+    assert [span.name for span in tracer.spans("s-1")] == ["collect", "predict:analytics"]
+    assert tracer.frame_age_ns("s-1", now_ns=9_000_000) == 8_000_000
+    assert tracer.frame_age_ns("unknown") is None
+
+    events = tracer.to_chrome_trace()["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [(event["name"], event["ts"], event["dur"]) for event in complete] == [
+        ("collect", 0.0, 2000.0),
+        ("collect", 1000.0, 500.0),
+        ("predict:analytics", 2000.0, 4000.0),
+    ]
+    assert complete[0]["tid"] == complete[2]["tid"] != complete[1]["tid"]
+    assert complete[0]["args"] == {"inputs": 2}
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    tracer.begin_session("demo", "s-1", origin_ns=0)
+    tracer.record("collect", "demo", "s-1", 0, 1)
+    assert tracer.spans() == []
+    assert tracer.frame_age_ns("s-1") is None
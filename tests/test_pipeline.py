@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from application.backpressure import BackpressureConfig, FrameBuffer
+from application.orchestrator import CaseOrchestrator
+from application.pipeline import PipelineConfig, PipelineMode, StageWorkers, StageWorkersConfig
+from application.runtime import _commit_offsets, _persistence_workers, _prediction_completed_consumer
+from application.services import CollectorService, PredictorService, StageConfig
+from core.domain import (
+    BasePredictionData,
+    CaseId,
+    FrameBatch,
+    FramePayload,
+    OverflowPolicy,
+    PredictionCompleted,
+    PredictionInput,
+    PredictionOutcome,
+    PredictionStage,
+    SessionId,
+    SessionPredicted,
+)
+from core.domain.value_objects import ChannelKey
+from core.interfaces import BaseStreamHandler, StreamDescriptor
+from core.interfaces.predictors import BaseAnalyticsPredictor, BaseValidationPredictor
+from infrastructure.events import EventJournal
+from infrastructure.events.memory_bus import InMemoryEventBus
+
+CASE = CaseId("pipeline_test")
+
+
+class ListStreamHandler(BaseStreamHandler):
+    descriptor = StreamDescriptor(name="list", channels=())
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def __aiter__(self):
+        for index, session in enumerate(self.sessions):
+            frame = FramePayload(channel=ChannelKey("main"), content=index, timestamp=datetime.utcnow())
+            yield FrameBatch(session_id=SessionId(session), frames=(frame,))
+
+
+def prepare(case_id, batch):
+    data = BasePredictionData(session_id=batch.session_id, case_id=case_id, payloads=batch.by_channel())
+    return [
+        PredictionInput(stage=PredictionStage.VALIDATION, data=data),
+        PredictionInput(stage=PredictionStage.ANALYTICS, data=data),
+    ]
+
+
+class SlowValidation(BaseValidationPredictor):
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        await asyncio.sleep(0.01)
+        return PredictionOutcome.success_result(stage=self.stage, result={"frame": request.data.payloads["main"].content})
+
+
+class SlowAnalytics(BaseAnalyticsPredictor):
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        await asyncio.sleep(0.01)
+        return PredictionOutcome.success_result(stage=self.stage, result={"frame": request.data.payloads["main"].content})
+
+
+def test_pipelined_orchestrator_preserves_session_order():
+    asyncio.run(_run_pipelined())
+
+
+async def _run_pipelined():
+    bus = InMemoryEventBus()
+    sessions = ["a", "b", "a", "c", "b", "a"]
+    predictor = PredictorService(stages={PredictionStage.ANALYTICS: StageConfig(depends_on=(PredictionStage.VALIDATION,))})
+    predictor.register(PredictionStage.VALIDATION, SlowValidation())
+    predictor.register(PredictionStage.ANALYTICS, SlowAnalytics())
+    orchestrator = CaseOrchestrator(
+        case_id=CASE,
+        collector=CollectorService(prepare),
+        predictor=predictor,
+        event_bus=bus,
+        stream_handler=ListStreamHandler(sessions),
+        pipeline=PipelineConfig(
+            mode=PipelineMode.PIPELINED,
+            predict=StageWorkersConfig(concurrency=3, queue_size=2),
+            publish=StageWorkersConfig(concurrency=2, queue_size=2),
+        ),
+    )
+    events: list[PredictionCompleted] = []
+
+    async def consumer():
+        async for event in bus.subscribe(PredictionCompleted):
+            events.append(event)
+            if len(events) == len(sessions) * 2:
+                break
+
+    predicted: list[SessionPredicted] = []
+
+    async def predicted_consumer():
+        async for event in bus.subscribe(SessionPredicted):
+            predicted.append(event)
+            if len(predicted) == len(sessions):
+                break
+
+    consumer_task = asyncio.create_task(consumer())
+    predicted_task = asyncio.create_task(predicted_consumer())
+    await asyncio.sleep(0)
+    await orchestrator.start()
+    try:
+        await asyncio.wait_for(asyncio.gather(consumer_task, predicted_task), timeout=5)
+    finally:
+        await orchestrator.stop()
+
+    assert sorted(event.session_id for event in predicted) == sorted(sessions)
+    assert all(event.stages == (PredictionStage.VALIDATION, PredictionStage.ANALYTICS) for event in predicted)
+
+    by_session: dict[str, list[tuple[PredictionStage, int]]] = {}
+    for event in events:
+        by_session.setdefault(event.session_id, []).append((event.outcome.stage, event.outcome.result["frame"]))
+    for session, produced in by_session.items():
+        expected_frames = [index for index, name in enumerate(sessions) if name == session]
+        expected = [(stage, index) for index in expected_frames for stage in (PredictionStage.VALIDATION, PredictionStage.ANALYTICS)]
+        assert produced == expected
+
+
+async def _drain_slowly(config: BackpressureConfig, produced: int) -> list[tuple[int, dict]]:
+    async def burst():
+        for index in range(produced):
+            yield FrameBatch(session_id=SessionId(f"s-{index}"), frames=(), metadata={"index": index})
+            await asyncio.sleep(0)
+
+    consumed: list[tuple[int, dict]] = []
+    async with FrameBuffer(burst(), config) as buffer:
+        async for buffered in buffer:
+            consumed.append((buffered.batch.metadata["index"], buffered.metrics))
+            await asyncio.sleep(0.01)
+    return consumed
+
+
+@pytest.mark.parametrize(
+    ("config", "expected"),
+    [
+        (BackpressureConfig(policy=OverflowPolicy.BLOCK, capacity=2), list(range(6))),
+        (BackpressureConfig(policy=OverflowPolicy.KEEP_LATEST), [0, 5]),
+        (BackpressureConfig(policy=OverflowPolicy.DROP_NEWEST, capacity=2), [0, 1, 2]),
+        (BackpressureConfig(policy=OverflowPolicy.DROP_OLDEST, capacity=2), [0, 4, 5]),
+        (BackpressureConfig(policy=OverflowPolicy.DECIMATE, decimate_every=3, capacity=4), [0, 3]),
+    ],
+)
+def test_frame_buffer_overflow_policies(config, expected):
+    consumed = asyncio.run(_drain_slowly(config, produced=6))
+
+    assert [index for index, _ in consumed] == expected
+    last_metrics = consumed[-1][1]
+    assert last_metrics["batches_dropped"] + last_metrics["batches_decimated"] == 6 - len(expected)
+    assert all(metrics["queue_age_ms"] >= 0 for _, metrics in consumed)
+
+
+def test_stage_worker_survives_a_failing_error_handler():
+    async def scenario():
+        handled = []
+
+        async def handle(item):
+            if item == 0:
+                raise ValueError("bad item")
+            handled.append(item)
+
+        async def on_error(item, exc):
+            raise RuntimeError("error handler broke")
+
+        workers = StageWorkers("test", handle, StageWorkersConfig(concurrency=1, queue_size=4), on_error=on_error)
+        workers.start()
+        for item in range(3):
+            await workers.submit(str(item), item)
+        await asyncio.wait_for(workers.join(), timeout=2)
+        await workers.stop()
+        return handled
+
+    assert asyncio.run(scenario()) == [1, 2]
+
+
+class DelayedArtifacts:
+    """Artifact persistence stand-in that takes longer for the ``slow`` session."""
+
+    async def handle_and_encode(self, outcome: PredictionOutcome, *, case_id: str):
+        await asyncio.sleep(0.02 if outcome.result["session"] == "slow" else 0)
+        return outcome, None
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.items: list = []
+
+    async def submit(self, items):
+        self.items.extend(items)
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(list(range(len(items))))
+        return future
+
+
+def test_persistence_pool_keeps_session_order_and_commits_journal_offsets(tmp_path):
+    asyncio.run(_run_persistence_pool(tmp_path))
+
+
+async def _run_persistence_pool(tmp_path):
+    writer = RecordingWriter()
+    workers = _persistence_workers(DelayedArtifacts(), writer, StageWorkersConfig(concurrency=2, queue_size=2))
+    async with EventJournal(tmp_path, fsync_interval=0.001) as journal:
+        for index in range(12):
+            session = "slow" if index % 3 == 0 else f"fast-{index % 3}"
+            outcome = PredictionOutcome.success_result(
+                stage=PredictionStage.ANALYTICS, result={"session": session, "index": index}
+            )
+            event = PredictionCompleted(case_id=CASE, session_id=SessionId(session), outcome=outcome)
+            await journal.append(event, wait=index == 11)
+        end = list(journal.replay())[-1].next_offset
+        workers.start()
+        commits: asyncio.Queue = asyncio.Queue(maxsize=4)
+        committer = asyncio.create_task(_commit_offsets(journal, commits))
+        stopping = asyncio.Event()
+        consumer = asyncio.create_task(
+            _prediction_completed_consumer(
+                InMemoryEventBus(), workers, max_items=4, journal=journal, commits=commits, until=stopping
+            )
+        )
+        while journal.committed_offset("prediction_outcomes") != end:
+            await asyncio.sleep(0.005)
+        stopping.set()
+        await asyncio.wait_for(consumer, timeout=2)
+        await workers.join()
+        await workers.stop()
+        await commits.put(None)
+        await asyncio.wait_for(committer, timeout=2)
+
+    order = [outcome.result["session"] for _, outcome, *_ in writer.items]
+    for session in ("slow", "fast-1", "fast-2"):
+        indexes = [outcome.result["index"] for session_id, outcome, *_ in writer.items if session_id == session]
+        assert indexes == sorted(indexes) and len(indexes) == 4
+    # Fast sessions are not held up behind the slow one.
+    assert order[-1] == "slow" and order.index("slow") > 0
+
+
+class FailingSessionWriter(RecordingWriter):
+    """Writer whose commits fail for the ``bad`` session."""
+
+    async def submit(self, items):
+        if items[0][0] != "bad":
+            return await super().submit(items)
+        future = asyncio.get_running_loop().create_future()
+        future.set_exception(RuntimeError("database is locked"))
+        return future
+
+
+def test_journal_offsets_keep_committing_after_a_failed_store(tmp_path):
+    asyncio.run(_run_failed_store(tmp_path))
+
+
+async def _run_failed_store(tmp_path):
+    workers = _persistence_workers(
+        DelayedArtifacts(), FailingSessionWriter(), StageWorkersConfig(concurrency=1, queue_size=1)
+    )
+    async with EventJournal(tmp_path, fsync_interval=0.001) as journal:
+        for index in range(8):
+            session = "bad" if index == 0 else "fast"
+            outcome = PredictionOutcome.success_result(
+                stage=PredictionStage.ANALYTICS, result={"session": session, "index": index}
+            )
+            event = PredictionCompleted(case_id=CASE, session_id=SessionId(session), outcome=outcome)
+            await journal.append(event, wait=index == 7)
+        end = list(journal.replay())[-1].next_offset
+        workers.start()
+        # A single queue slot: a committer that stopped at the failure would block the consumer.
+        commits: asyncio.Queue = asyncio.Queue(maxsize=1)
+        committer = asyncio.create_task(_commit_offsets(journal, commits))
+        consumer = asyncio.create_task(
+            _prediction_completed_consumer(InMemoryEventBus(), workers, max_items=1, journal=journal, commits=commits)
+        )
+        try:
+            await asyncio.wait_for(_committed(journal, end), timeout=2)
+        finally:
+            consumer.cancel()
+            committer.cancel()
+            await workers.stop()
+
+
+async def _committed(journal, offset):
+    while journal.committed_offset("prediction_outcomes") != offset:
+        await asyncio.sleep(0.005)
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from application.services import PredictorService, StageConfig
+from application.services.config import BatchingConfig, ExecutorConfig, ExecutorKind, StagePolicyConfig
+from core.domain import (
+    BasePredictionData,
+    CaseConfigurationError,
+    CaseId,
+    FailureAction,
+    PredictionInput,
+    PredictionOutcome,
+    PredictionStage,
+    RetryStrategy,
+    SessionId,
+    StageDeadlineExceeded,
+)
+from core.interfaces.predictors import BaseAnalyticsPredictor, BaseValidationPredictor
+from implementations.examples.dummy.config import DummyAnalyticsConfig
+from implementations.examples.dummy.predictor import DummyAnalyticsPredictor
+
+
+class ScriptedValidation(BaseValidationPredictor):
+    def __init__(self, *, success: bool = True, delay: float = 0.0) -> None:
+        self.success = success
+        self.delay = delay
+        self.calls = 0
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.success:
+            return PredictionOutcome.success_result(stage=self.stage, result={"status": "ok"})
+        return PredictionOutcome.failure_result(stage=self.stage, errors=("invalid frame",))
+
+
+class ScriptedAnalytics(BaseAnalyticsPredictor):
+    def __init__(self, *, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return PredictionOutcome.success_result(stage=self.stage, result={"value": 1})
+
+
+def _inputs(*stages: PredictionStage) -> list[PredictionInput]:
+    data = BasePredictionData(session_id=SessionId("s-1"), case_id=CaseId("case"), payloads={})
+    return [PredictionInput(stage=stage, data=data) for stage in stages]
+
+
+async def _collect(service: PredictorService, inputs):
+    return [outcome async for _, outcome in service.run_graph(inputs)]
+
+
+def test_independent_stages_run_concurrently():
+    service = PredictorService()
+    service.register(PredictionStage.VALIDATION, ScriptedValidation(delay=0.2))
+    service.register(PredictionStage.ANALYTICS, ScriptedAnalytics(delay=0.2))
+
+    start = time.perf_counter()
+    outcomes = asyncio.run(_collect(service, _inputs(PredictionStage.VALIDATION, PredictionStage.ANALYTICS)))
+    elapsed = time.perf_counter() - start
+
+    assert {outcome.stage for outcome in outcomes} == {PredictionStage.VALIDATION, PredictionStage.ANALYTICS}
+    assert elapsed < 0.35
+
+
+def test_failed_gating_stage_skips_dependents():
+    analytics = ScriptedAnalytics()
+    service = PredictorService(stages={PredictionStage.ANALYTICS: StageConfig(depends_on=(PredictionStage.VALIDATION,))})
+    service.register(PredictionStage.VALIDATION, ScriptedValidation(success=False))
+    service.register(PredictionStage.ANALYTICS, analytics)
+
+    outcomes = asyncio.run(_collect(service, _inputs(PredictionStage.VALIDATION, PredictionStage.ANALYTICS)))
+
+    assert [outcome.stage for outcome in outcomes] == [PredictionStage.VALIDATION, PredictionStage.ANALYTICS]
+    assert not outcomes[1].success
+    assert outcomes[1].result == {"skipped": True, "blocked_by": "validation"}
+    assert analytics.calls == 0
+
+
+def test_dependency_cycle_is_rejected():
+    with pytest.raises(CaseConfigurationError):
+        PredictorService(
+            stages={
+                PredictionStage.VALIDATION: StageConfig(depends_on=(PredictionStage.ANALYTICS,)),
+                PredictionStage.ANALYTICS: StageConfig(depends_on=(PredictionStage.VALIDATION,)),
+            }
+        )
+
+
+class BatchingAnalytics(BaseAnalyticsPredictor):
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        raise AssertionError("batched stage must use predict_batch")
+
+    async def predict_batch(self, requests):
+        self.batch_sizes.append(len(requests))
+        return [
+            PredictionOutcome.success_result(stage=self.stage, result={"session": request.data.session_id})
+            for request in requests
+        ]
+
+
+def test_micro_batching_coalesces_sessions():
+    predictor = BatchingAnalytics()
+    service = PredictorService(
+        stages={PredictionStage.ANALYTICS: StageConfig(batching=BatchingConfig(max_batch_size=4, max_wait_ms=50))}
+    )
+    service.register(PredictionStage.ANALYTICS, predictor)
+
+    async def scenario():
+        requests = [
+            PredictionInput(
+                stage=PredictionStage.ANALYTICS,
+                data=BasePredictionData(session_id=SessionId(f"s-{index}"), case_id=CaseId("case"), payloads={}),
+            )
+            for index in range(6)
+        ]
+        try:
+            return await asyncio.gather(*(service.run(request) for request in requests))
+        finally:
+            await service.close()
+
+    outcomes = asyncio.run(scenario())
+
+    assert predictor.supports_batching
+    assert predictor.batch_sizes == [4, 2]
+    assert [outcome.result["session"] for outcome in outcomes] == [f"s-{index}" for index in range(6)]
+    assert [outcome.metrics["batch_size"] for outcome in outcomes] == [4, 4, 4, 4, 2, 2]
+    assert all(outcome.metrics["batch_wait_ms"] >= 0 for outcome in outcomes)
+
+
+@pytest.mark.parametrize("kind", [ExecutorKind.THREAD, ExecutorKind.PROCESS])
+def test_pooled_executors_match_inline_results(kind):
+    inline = PredictorService()
+    inline.register(PredictionStage.ANALYTICS, DummyAnalyticsPredictor(DummyAnalyticsConfig()))
+    pooled = PredictorService(stages={PredictionStage.ANALYTICS: StageConfig(executor=ExecutorConfig(kind=kind, workers=2))})
+    pooled.register(PredictionStage.ANALYTICS, DummyAnalyticsPredictor(DummyAnalyticsConfig()))
+    frame = np.arange(64, dtype=np.uint8).reshape(8, 8)
+    request = PredictionInput(
+        stage=PredictionStage.ANALYTICS,
+        data=BasePredictionData(session_id=SessionId("s-1"), case_id=CaseId("case"), payloads={"rgb": frame}),
+    )
+
+    async def scenario():
+        try:
+            expected = await inline.run(request)
+            actual = await asyncio.gather(*(pooled.run(request) for _ in range(4)))
+        finally:
+            await pooled.close()
+        return expected, actual
+
+    expected, actual = asyncio.run(scenario())
+
+    assert all(outcome.result["channels"] == expected.result["channels"] for outcome in actual)
+
+
+class FlakyAnalytics(BaseAnalyticsPredictor):
+    def __init__(self, delays: list[float]) -> None:
+        self.delays = delays
+        self.calls = 0
+
+    async def predict(self, request: PredictionInput) -> PredictionOutcome:
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        return PredictionOutcome.success_result(stage=self.stage, result={"source": "primary"})
+
+
+def _policy_service(predictor: BaseAnalyticsPredictor, **policy) -> PredictorService:
+    service = PredictorService(stages={PredictionStage.ANALYTICS: StageConfig(policy=StagePolicyConfig(**policy))})
+    service.register(PredictionStage.ANALYTICS, predictor)
+    return service
+
+
+def test_policy_retries_after_missed_deadline():
+    predictor = FlakyAnalytics([1.0, 0.0])
+    service = _policy_service(predictor, timeout_s=0.05, retry_strategy=RetryStrategy.LIMITED, max_attempts=3)
+
+    outcome = asyncio.run(service.run(_inputs(PredictionStage.ANALYTICS)[0]))
+
+    assert outcome.success
+    assert predictor.calls == 2
+    assert outcome.metrics["attempts"] == 2
+
+
+def test_policy_falls_back_to_registered_predictor():
+    service = _policy_service(
+        FlakyAnalytics([1.0]),
+        timeout_s=0.05,
+        failure_action=FailureAction.FALLBACK,
+        fallback_predictor="cheap",
+    )
+    service.register_fallback("cheap", ScriptedAnalytics())
+
+    outcome = asyncio.run(service.run(_inputs(PredictionStage.ANALYTICS)[0]))
+
+    assert outcome.result == {"value": 1, "stage_duration_ms": outcome.duration_ms}
+    assert outcome.metrics["fallback_predictor"] == "cheap"
+
+
+def test_policy_aborts_when_deadline_missed_without_fallback():
+    service = _policy_service(FlakyAnalytics([1.0]), timeout_s=0.05)
+
+    with pytest.raises(StageDeadlineExceeded):
+        asyncio.run(service.run(_inputs(PredictionStage.ANALYTICS)[0]))
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+
+import numpy as np
+
+from application.artifacts import ArtifactPersistence
+from core.domain import PredictionOutcome, PredictionStage, SessionId
+from infrastructure.codecs import BinaryResultCodec, JsonResultCodec, decode_result
+from infrastructure.repositories.sqlite.facade import SqliteRepositoryFacade
+from infrastructure.storage.local_fs import LocalArtifactStorage, LocalFileStorage
+
+
+def test_binary_codec_round_trips_numpy_values_compactly():
+    codec = BinaryResultCodec()
+    result = {
+        "boxes": np.arange(400, dtype=np.float32).reshape(100, 4)[:, ::2],
+        "score": np.float32(0.75),
+        "labels": ["cat", "dog"],
+        "histogram": [float(value) for value in range(16)],
+        "counts": list(range(16)),
+        "meta": {"ok": True, "missing": None, "big": 2**80, (1, 2): "tuple key"},
+        "raw": b"\x00\x01",
+    }
+
+    payload = codec.encode(result)
+    decoded = codec.decode(payload)
+
+    assert decoded["boxes"].dtype == np.float32 and np.array_equal(decoded["boxes"], result["boxes"])
+    assert decoded["boxes"].flags.writeable
+    assert type(decoded["score"]) is np.float32 and decoded["score"] == result["score"]
+    assert {key: decoded[key] for key in ("labels", "histogram", "counts", "meta", "raw")} == {
+        key: result[key] for key in ("labels", "histogram", "counts", "meta", "raw")
+    }
+    assert decode_result(payload)["labels"] == ["cat", "dog"]
+    assert len(payload) < len(JsonResultCodec().encode(result)) / 2
+
+
+def test_outcomes_are_encoded_once_and_legacy_json_rows_still_decode(tmp_path):
+    db_path = tmp_path / "db.sqlite"
+    with sqlite3.connect(db_path) as connection:
+        # Databases from before result codecs hold JSON text results.
+        connection.execute(
+            "CREATE TABLE prediction_outcomes (id INTEGER PRIMARY KEY AUTOINCREMENT, case_id TEXT,"
+            " session_id TEXT NOT NULL, stage TEXT NOT NULL, success INTEGER NOT NULL, result TEXT, artifacts TEXT,"
+            " errors TEXT, metrics TEXT, duration_ms REAL, created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+        connection.execute(
+            "INSERT INTO prediction_outcomes (session_id, stage, success, result) VALUES ('s', 'analytics', 1, ?)",
+            (json.dumps({"legacy": 1}),),
+        )
+    codec = BinaryResultCodec()
+    encoded = []
+    encode = codec.encode
+    codec.encode = lambda value: encoded.append(value) or encode(value)  # type: ignore[method-assign]
+    persistence = ArtifactPersistence(
+        file_storage=LocalFileStorage(tmp_path / "data"),
+        artifact_storage=LocalArtifactStorage(tmp_path / "artifacts"),
+        codec=codec,
+    )
+    scores = np.linspace(0, 1, 5, dtype=np.float32)
+    outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result={"scores": scores})
+
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=db_path, codec=codec)
+        handled, payload = await persistence.handle_and_encode(outcome, case_id="c")
+        await repository.save_prediction_outcomes([(SessionId("s"), handled, None, payload)])
+        stored = await repository.get_session_outcomes(SessionId("s"))
+        await repository.close()
+        return handled, stored
+
+    handled, stored = asyncio.run(scenario())
+
+    assert len(encoded) == 1
+    (result_artifact,) = handled.artifacts
+    assert result_artifact.uri.endswith(".mrc") and result_artifact.kind == codec.media_type
+    assert stored[0].outcome.result == {"legacy": 1}
+    restored = stored[1].outcome.result["scores"]
+    assert restored.dtype == np.float32 and np.array_equal(restored, scores)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+
+from application.scheduling import FairScheduler, PriorityClass, SchedulingConfig
+from core.domain import CaseId
+
+HEAVY = CaseId("heavy")
+LIGHT = CaseId("light")
+
+
+async def _backlog(scheduler: FairScheduler, requests: dict[CaseId, int]) -> list[CaseId]:
+    order: list[CaseId] = []
+
+    async def request(case_id: CaseId) -> None:
+        async with scheduler.slot(case_id):
+            order.append(case_id)
+            await asyncio.sleep(0.001)
+
+    blocker = scheduler.slot(CaseId("warmup"))
+    await blocker.__aenter__()
+    tasks = [asyncio.create_task(request(case_id)) for case_id, count in requests.items() for _ in range(count)]
+    await asyncio.sleep(0)
+    await blocker.__aexit__(None, None, None)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_weighted_cases_share_slots_proportionally():
+    scheduler = FairScheduler(slots=1)
+    scheduler.register(HEAVY, SchedulingConfig(weight=3.0))
+    scheduler.register(LIGHT, SchedulingConfig(weight=1.0))
+
+    order = asyncio.run(_backlog(scheduler, {HEAVY: 12, LIGHT: 12}))
+
+    assert order[:8].count(HEAVY) == 6
+    stats = scheduler.snapshot()
+    assert stats[HEAVY].granted == 12 and stats[LIGHT].granted == 12
+    assert stats[LIGHT].max_wait_ms > 0
+
+
+def test_priority_class_is_served_first():
+    scheduler = FairScheduler(slots=1)
+    scheduler.register(HEAVY, SchedulingConfig(weight=10.0))
+    scheduler.register(LIGHT, SchedulingConfig(priority=PriorityClass.HIGH))
+
+    order = asyncio.run(_backlog(scheduler, {HEAVY: 3, LIGHT: 3}))
+
+    assert order == [LIGHT, LIGHT, LIGHT, HEAVY, HEAVY, HEAVY]
+
+
+def test_max_in_flight_caps_a_case():
+    scheduler = FairScheduler(slots=4)
+    scheduler.register(HEAVY, SchedulingConfig(max_in_flight=2))
+    peak = 0
+
+    async def request() -> None:
+        nonlocal peak
+        async with scheduler.slot(HEAVY):
+            peak = max(peak, scheduler.snapshot()[HEAVY].in_flight)
+            await asyncio.sleep(0.005)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(scenario())
+
+    assert peak == 2
@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+import pytest
+
+from application.persistence import (
+    BulkOutcomeWriter,
+    MeasurementRegistry,
+    MeasurementTableModel,
+    SessionAggregator,
+    register_measurements,
+)
+from core.domain import CaseConfigurationError, CaseId, PredictionOutcome, PredictionStage, SessionCompleted, SessionId
+from infrastructure.codecs import decode_result
+from infrastructure.events import InMemoryEventBus
+from infrastructure.repositories.sqlite.facade import SqliteRepositoryFacade
+from infrastructure.repositories.sqlite.partitions import list_partitions, partition_name
+from infrastructure.repositories.sqlite.repository import insert_prediction_outcomes
+
+
+def test_bulk_save_writes_all_outcomes_in_order(tmp_path):
+    db_path = tmp_path / "db.sqlite"
+    repository = SqliteRepositoryFacade(db_path=db_path)
+    items = [
+        (SessionId(f"s-{index}"), PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result={"i": index}))
+        for index in range(5)
+    ]
+
+    ids = asyncio.run(repository.save_prediction_outcomes(items))
+    single = asyncio.run(repository.save_prediction_outcome(SessionId("s-5"), items[0][1]))
+    asyncio.run(repository.close())
+
+    assert [int(value) for value in ids] == [1, 2, 3, 4, 5]
+    assert int(single) == 6
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute("SELECT session_id, result FROM prediction_outcomes ORDER BY id").fetchall()
+    assert [row[0] for row in rows] == [f"s-{index}" for index in range(6)]
+    assert decode_result(rows[4][1]) == {"i": 4}
+
+
+def test_pool_keeps_one_wal_writer_connection_and_reads_alongside_it(tmp_path):
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite", readers=1)
+        outcome = PredictionOutcome.success_result(stage=PredictionStage.VALIDATION, result=None)
+        connections = set()
+        for index in range(3):
+            await repository.save_prediction_outcome(SessionId(f"s-{index}"), outcome)
+            connections.add(await repository.pool.write(id))
+        mode = await repository.pool.read(lambda connection: connection.execute("PRAGMA journal_mode").fetchone()[0])
+        count = await repository.pool.read(
+            lambda connection: connection.execute("SELECT COUNT(*) FROM prediction_outcomes").fetchone()[0]
+        )
+        with pytest.raises(sqlite3.OperationalError):
+            await repository.pool.read(lambda connection: connection.execute("DELETE FROM prediction_outcomes"))
+        await repository.close()
+        return connections, mode, count
+
+    connections, mode, count = asyncio.run(scenario())
+    assert len(connections) == 1
+    assert mode == "wal"
+    assert count == 3
+
+
+def test_bulk_writer_groups_submissions_and_flushes_on_stop(tmp_path):
+    class CountingFacade(SqliteRepositoryFacade):
+        transactions = 0
+
+        async def save_prediction_outcomes(self, items):
+            CountingFacade.transactions += 1
+            return await super().save_prediction_outcomes(items)
+
+    async def scenario():
+        repository = CountingFacade(db_path=tmp_path / "db.sqlite")
+        writer = BulkOutcomeWriter(repository, max_batch=4, flush_interval=60.0, max_pending=8)
+        await writer.start()
+        outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result=None)
+        futures = [await writer.submit([(SessionId(f"s-{index}"), outcome)]) for index in range(4)]
+        await futures[3]
+        flushed_by_size = CountingFacade.transactions
+        futures += [await writer.submit([(SessionId(f"s-{index}"), outcome)]) for index in range(4, 6)]
+        await writer.stop()
+        await repository.close()
+        return flushed_by_size, [await future for future in futures]
+
+    flushed_by_size, ids = asyncio.run(scenario())
+    assert flushed_by_size == 1
+    assert CountingFacade.transactions == 2
+    assert [int(value) for (value,) in ids] == [1, 2, 3, 4, 5, 6]
+
+
+def test_bulk_writer_retries_a_failed_commit(tmp_path):
+    class LockedOnceFacade(SqliteRepositoryFacade):
+        calls = 0
+
+        async def save_prediction_outcomes(self, items):
+            LockedOnceFacade.calls += 1
+            if LockedOnceFacade.calls == 1:
+                raise sqlite3.OperationalError("database is locked")
+            return await super().save_prediction_outcomes(items)
+
+    async def scenario():
+        repository = LockedOnceFacade(db_path=tmp_path / "db.sqlite")
+        writer = BulkOutcomeWriter(repository, flush_interval=0.01, backoff_s=0.0)
+        await writer.start()
+        outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result=None)
+        ids = await (await writer.submit([(SessionId("s-1"), outcome)]))
+        await writer.stop()
+        stored = await repository.get_session_outcomes(SessionId("s-1"))
+        await repository.close()
+        return ids, stored
+
+    ids, stored = asyncio.run(scenario())
+    assert LockedOnceFacade.calls == 2
+    assert len(ids) == 1 and len(stored) == 1
+
+
+def test_bulk_writer_fails_only_the_batch_whose_measurements_cannot_be_extracted(tmp_path):
+    class BrokenOnceRegistry(MeasurementRegistry):
+        calls = 0
+
+        def __bool__(self) -> bool:
+            return True
+
+        def extract(self, rows):
+            BrokenOnceRegistry.calls += 1
+            if BrokenOnceRegistry.calls == 1:
+                raise ValueError("unexpected result shape")
+            return []
+
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite")
+        writer = BulkOutcomeWriter(repository, flush_interval=0.01, measurements=BrokenOnceRegistry())
+        await writer.start()
+        outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result=None)
+        first = await writer.submit([(SessionId("s-1"), outcome)])
+        with pytest.raises(ValueError):
+            await first
+        second = await (await writer.submit([(SessionId("s-2"), outcome)]))
+        await writer.stop()
+        await repository.close()
+        return second
+
+    assert len(asyncio.run(scenario())) == 1
+
+
+def test_measurement_tables_drop_non_finite_values_and_reject_conflicting_schemas():
+    def table(peak_type):
+        return MeasurementTableModel.model_validate(
+            {
+                "name": "channel_stats",
+                "stage": "analytics",
+                "each": "channels",
+                "key": "channel",
+                "columns": [
+                    {"name": "mean", "type": "real"},
+                    {"name": "peak", "type": peak_type, "source": "max", "nullable": False},
+                ],
+            }
+        )
+
+    registry = MeasurementRegistry()
+    register_measurements(registry, CaseId("a"), [table("real")])
+    (stats,) = registry.get(CaseId("a"))
+    rows = stats.rows({"channels": {"x": {"mean": float("nan"), "max": 1.0}, "y": {"mean": 1.0, "max": float("inf")}}})
+    # NaN in a nullable column becomes NULL; the entry with an infinite NOT NULL value is skipped.
+    assert rows == [("x", None, 1.0)]
+
+    register_measurements(registry, CaseId("b"), [table("real")])
+    assert len(registry.schemas()) == 1
+    register_measurements(registry, CaseId("c"), [table("integer")])
+    with pytest.raises(CaseConfigurationError, match="channel_stats"):
+        registry.schemas()
+
+
+def test_queries_filter_by_session_case_stage_and_time_using_indexes(tmp_path):
+    db_path = tmp_path / "db.sqlite"
+    with sqlite3.connect(db_path) as connection:
+        # A table from before case_id was stored is migrated in place.
+        connection.execute(
+            "CREATE TABLE prediction_outcomes (id INTEGER PRIMARY KEY AUTOINCREMENT, session_id TEXT NOT NULL,"
+            " stage TEXT NOT NULL, success INTEGER NOT NULL, result TEXT, artifacts TEXT, errors TEXT, metrics TEXT,"
+            " duration_ms REAL, created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+        )
+        connection.execute("INSERT INTO prediction_outcomes (session_id, stage, success) VALUES ('old', 'analytics', 1)")
+
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=db_path)
+        validation = PredictionOutcome.success_result(stage=PredictionStage.VALIDATION, result={"ok": True})
+        failed = PredictionOutcome.failure_result(stage=PredictionStage.ANALYTICS, errors=["boom"])
+        await repository.save_prediction_outcomes(
+            [
+                (SessionId("a-1"), validation, CaseId("a")),
+                (SessionId("a-1"), failed, CaseId("a")),
+                (SessionId("b-1"), validation, CaseId("b")),
+            ]
+        )
+        session = await repository.get_session_outcomes(SessionId("a-1"))
+        case_stage = await repository.get_case_outcomes(
+            CaseId("a"), stage=PredictionStage.ANALYTICS, since=datetime.utcnow() - timedelta(minutes=1)
+        )
+        future = await repository.get_case_outcomes(CaseId("a"), since=datetime.utcnow() + timedelta(minutes=1))
+        latest = await repository.get_latest_outcomes(2)
+        plans = [
+            await repository.pool.read(lambda connection, sql=sql: " ".join(row[3] for row in connection.execute(sql)))
+            for sql in (
+                "EXPLAIN QUERY PLAN SELECT * FROM prediction_outcomes WHERE session_id = 'a-1'",
+                "EXPLAIN QUERY PLAN SELECT * FROM prediction_outcomes WHERE case_id = 'a' AND stage = 'analytics'"
+                " AND created_at >= '2020-01-01'",
+            )
+        ]
+        await repository.close()
+        return session, case_stage, future, latest, plans
+
+    session, case_stage, future, latest, plans = asyncio.run(scenario())
+    assert [(item.case_id, item.outcome.stage) for item in session] == [
+        ("a", PredictionStage.VALIDATION),
+        ("a", PredictionStage.ANALYTICS),
+    ]
+    assert session[0].outcome.result == {"ok": True}
+    assert [item.outcome.errors for item in case_stage] == [("boom",)]
+    assert future == []
+    assert [item.session_id for item in latest] == ["b-1", "a-1"]
+    assert "idx_prediction_outcomes_session" in plans[0]
+    assert "idx_prediction_outcomes_case_stage_created" in plans[1]
+
+
+def test_bulk_writer_fills_case_measurement_tables_in_the_same_transaction(tmp_path):
+    registry = MeasurementRegistry()
+    table = MeasurementTableModel.model_validate(
+        {
+            "name": "channel_stats",
+            "stage": "analytics",
+            "each": "channels",
+            "key": "channel",
+            "columns": [
+                {"name": "mean", "type": "real"},
+                {"name": "peak", "type": "integer", "source": "max", "nullable": False, "index": True},
+            ],
+        }
+    )
+    register_measurements(registry, CaseId("dummy"), [table])
+
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite")
+        await repository.ensure_measurement_tables(registry.schemas())
+        writer = BulkOutcomeWriter(repository, measurements=registry)
+        await writer.start()
+        analytics = PredictionOutcome.success_result(
+            stage=PredictionStage.ANALYTICS,
+            # rgb:c has no value for the non-nullable "peak" column and is skipped.
+            result={"channels": {"rgb:a": {"mean": 1.5, "max": 9.0}, "rgb:b": {"mean": 2.0, "max": 4}, "rgb:c": {}}},
+        )
+        validation = PredictionOutcome.success_result(stage=PredictionStage.VALIDATION, result={"channels": {}})
+        items = [(SessionId("s"), validation, CaseId("dummy")), (SessionId("s"), analytics, CaseId("dummy"))]
+        ids = await (await writer.submit(items))
+        await writer.stop()
+        rows = await repository.pool.read(
+            lambda connection: connection.execute(
+                "SELECT prediction_id, case_id, session_id, channel, mean, peak"
+                " FROM channel_stats ORDER BY id"
+            ).fetchall()
+        )
+        sql = "EXPLAIN QUERY PLAN SELECT * FROM channel_stats WHERE peak > 5"
+        plan = await repository.pool.read(lambda connection: " ".join(row[3] for row in connection.execute(sql)))
+        await repository.close()
+        return ids, [tuple(row) for row in rows], plan
+
+    ids, rows, plan = asyncio.run(scenario())
+    assert rows == [
+        (int(ids[1]), "dummy", "s", "rgb:a", 1.5, 9),
+        (int(ids[1]), "dummy", "s", "rgb:b", 2.0, 4),
+    ]
+    assert "idx_channel_stats_peak" in plan
+
+
+def test_outcomes_are_partitioned_per_day_and_retention_drops_whole_partitions(tmp_path):
+    registry = MeasurementRegistry()
+    table = MeasurementTableModel.model_validate(
+        {"name": "scores", "stage": "analytics", "columns": [{"name": "score", "type": "real"}]}
+    )
+    register_measurements(registry, CaseId("c"), [table])
+    now = datetime.now(timezone.utc)
+    PRAGMAS = ("auto_vacuum", "freelist_count")
+    outcome = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result={"score": 0.5})
+
+    async def scenario():
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite")
+        await repository.ensure_measurement_tables(registry.schemas())
+        ids = []
+        for days_ago in (3, 1, 0):
+            items = [(SessionId(f"s-{days_ago}"), outcome, CaseId("c"))] * 50
+            ids += await repository.pool.write(
+                partial(
+                    insert_prediction_outcomes,
+                    items=items,
+                    measurements=registry.extract(items),
+                    now=now - timedelta(days=days_ago),
+                )
+            )
+        dropped = await repository.apply_retention(now - timedelta(days=2))
+        sessions = await repository.pool.read(
+            lambda connection: connection.execute(
+                "SELECT session_id, COUNT(*) FROM prediction_outcomes GROUP BY session_id ORDER BY session_id"
+            ).fetchall()
+        )
+        scores = await repository.pool.read(
+            lambda connection: connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        )
+        tables = await repository.pool.read(lambda connection: list_partitions(connection))
+        pragmas = await repository.pool.read(
+            lambda connection: [connection.execute(f"PRAGMA {name}").fetchone()[0] for name in PRAGMAS]
+        )
+        await repository.close()
+        return ids, dropped, [tuple(row) for row in sessions], scores, tables, pragmas
+
+    ids, dropped, sessions, scores, tables, pragmas = asyncio.run(scenario())
+    assert [int(value) for value in ids] == list(range(1, 151))
+    assert dropped == 1
+    assert sessions == [("s-0", 50), ("s-1", 50)]
+    assert scores == 100
+    assert tables == [partition_name((now - timedelta(days=1)).date()), partition_name(now.date())]
+    assert pragmas == [2, 0]
+
+
+def test_session_aggregator_writes_each_session_with_one_record_and_event(tmp_path):
+    case = CaseId("case")
+    validation = PredictionOutcome.success_result(stage=PredictionStage.VALIDATION, result={"ok": True})
+    analytics = PredictionOutcome.success_result(stage=PredictionStage.ANALYTICS, result={"mean": 1.0})
+
+    async def scenario():
+        bus = InMemoryEventBus()
+        events = []
+
+        async def collect():
+            async for event in bus.subscribe(SessionCompleted):
+                events.append(event)
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite")
+        writer = BulkOutcomeWriter(repository, flush_interval=0.01)
+        aggregator = SessionAggregator(writer, bus, timeout=0.05)
+        await writer.start()
+        await aggregator.start()
+        await aggregator.expect(case, (PredictionStage.VALIDATION, PredictionStage.ANALYTICS))
+        # An unrelated session first, so the session records below do not start at id 1.
+        await aggregator.submit([(SessionId("late"), analytics, case)])
+        first = await aggregator.submit([(SessionId("done"), validation, case)])
+        held = first.done()
+        second = await aggregator.submit([(SessionId("done"), analytics, case)])
+        await aggregator.submit([(SessionId("failed"), validation, case)])
+        await aggregator.fail(case, SessionId("failed"), PredictionStage.ANALYTICS)
+        while len(events) < 3:  # "late" times out.
+            await asyncio.sleep(0.01)
+        collector.cancel()
+        after_close = await aggregator.submit([(SessionId("done"), analytics, case)])
+        await after_close
+        await aggregator.stop()
+        await writer.stop()
+        records = {name: await repository.get_session_record(SessionId(name)) for name in ("done", "failed", "late")}
+        outcomes = await repository.get_session_outcomes(SessionId("done"))
+        await repository.close()
+        return held, await first + await second, events, records, outcomes
+
+    held, ids, events, records, outcomes = asyncio.run(scenario())
+
+    assert not held
+    assert [event.session_id for event in events] == ["done", "failed", "late"]
+    assert events[0].prediction_ids == tuple(ids)
+    done = records["done"]
+    assert done.complete and done.completed == (PredictionStage.VALIDATION, PredictionStage.ANALYTICS)
+    assert done.prediction_ids == tuple(ids)
+    # Outcomes arriving after the record are stored on their own.
+    assert len(outcomes) == 3
+    assert records["failed"].complete and records["failed"].failed == (PredictionStage.ANALYTICS,)
+    assert records["late"].missing == (PredictionStage.VALIDATION,) and not records["late"].complete
+    assert [event.timed_out for event in events] == [False, False, True]
+
+
+def test_session_aggregator_closes_predicted_and_failed_sessions_per_case(tmp_path):
+    first_case, second_case = CaseId("case-a"), CaseId("case-b")
+    validation = PredictionOutcome.success_result(stage=PredictionStage.VALIDATION, result={"ok": True})
+
+    async def scenario():
+        bus = InMemoryEventBus()
+        events = []
+
+        async def collect():
+            async for event in bus.subscribe(SessionCompleted):
+                events.append(event)
+
+        collector = asyncio.create_task(collect())
+        await asyncio.sleep(0)
+        repository = SqliteRepositoryFacade(db_path=tmp_path / "db.sqlite")
+        writer = BulkOutcomeWriter(repository, flush_interval=0.01)
+        # Nothing below may wait for the timeout.
+        aggregator = SessionAggregator(writer, bus, timeout=60)
+        await writer.start()
+        await aggregator.start()
+        for case in (first_case, second_case):
+            await aggregator.expect(case, (PredictionStage.VALIDATION, PredictionStage.ANALYTICS))
+        # The same session id in two cases, with two validation inputs and a skipped analytics stage.
+        await aggregator.submit([(SessionId("s"), validation, first_case)])
+        await aggregator.submit([(SessionId("s"), validation, second_case)])
+        await aggregator.predicted(
+            first_case, SessionId("s"), (PredictionStage.VALIDATION, PredictionStage.VALIDATION, PredictionStage.ANALYTICS)
+        )
+        await aggregator.fail(first_case, SessionId("s"), PredictionStage.ANALYTICS)
+        held = aggregator.open_sessions
+        await aggregator.submit([(SessionId("s"), validation, first_case)])
+        # A session without analytics input completes once its outcomes are in.
+        await aggregator.predicted(second_case, SessionId("s"), (PredictionStage.VALIDATION,))
+        # A failed pipeline closes its session with what arrived.
+        await aggregator.submit([(SessionId("broken"), validation, first_case)])
+        await aggregator.abort(first_case, SessionId("broken"))
+        while len(events) < 3:
+            await asyncio.sleep(0.01)
+        collector.cancel()
+        remaining = aggregator.open_sessions
+        await aggregator.stop()
+        await writer.stop()
+        await repository.close()
+        return held, remaining, events
+
+    held, remaining, events = asyncio.run(scenario())
+
+    assert held == 2 and remaining == 0
+    by_key = {(event.case_id, event.session_id): event for event in events}
+    assert by_key[(first_case, "s")].completed == (PredictionStage.VALIDATION, PredictionStage.VALIDATION)
+    assert by_key[(first_case, "s")].failed == (PredictionStage.ANALYTICS,)
+    assert by_key[(second_case, "s")].completed == (PredictionStage.VALIDATION,)
+    assert by_key[(second_case, "s")].missing == ()
+    assert by_key[(first_case, "broken")].missing == (PredictionStage.ANALYTICS,)
+    assert not any(event.timed_out for event in events)